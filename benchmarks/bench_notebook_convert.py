@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fast native notebook converter vs nbconvert's PythonExporter
+
+Run on a directory of downloaded notebooks:
+    python benchmarks/bench_notebook_convert.py kaggle_notebooks_downloaded/
+
+Or generate a synthetic corpus first (no network needed):
+    python benchmarks/bench_notebook_convert.py corpus/ --generate 200
+"""
+
+import argparse
+import random
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nbformat
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_raw_cell
+
+from kaggle_discussion_extractor.notebook_converter import (
+    FastConversionUnsupported, convert_notebook_source, fast_convert_notebook_source
+)
+
+# Cell sources typical of competition notebooks
+CODE_CELLS = [
+    "import numpy as np\nimport pandas as pd\nimport matplotlib.pyplot as plt\n%matplotlib inline",
+    "!pip install -q lightgbm==4.1.0",
+    "train = pd.read_csv('/kaggle/input/train.csv')\ntest = pd.read_csv('/kaggle/input/test.csv')\ntrain.head()",
+    "%%time\nmodel = lgb.LGBMRegressor(n_estimators=1000, learning_rate=0.05)\n"
+    "model.fit(X_train, y_train, eval_set=[(X_valid, y_valid)])",
+    "def rmse(y_true, y_pred):\n    \"\"\"Root mean squared error\"\"\"\n    return np.sqrt(np.mean((y_true - y_pred) ** 2))",
+    "for fold, (trn_idx, val_idx) in enumerate(kf.split(X, y)):\n    print(f'Fold {fold}')\n"
+    "    X_trn, X_val = X.iloc[trn_idx], X.iloc[val_idx]\n    scores.append(rmse(y[val_idx], preds))",
+    "files = !ls /kaggle/input\nprint(files)",
+    "fig, ax = plt.subplots(figsize=(12, 6))\nax.hist(train['target'], bins=50)\nplt.show()",
+    "df.describe()?",
+]
+MARKDOWN_CELLS = [
+    "# Exploratory Data Analysis\n\nLet's look at the **target** distribution first.",
+    "## Feature engineering\n\n- lag features\n- rolling means\n- target encoding\n",
+    "Model trained with 5-fold CV. Scores:\n\n| fold | rmse |\n|---|---|\n| 0 | 0.71 |",
+]
+
+
+def generate_corpus(output_dir: Path, count: int, seed: int = 0):
+    """Write `count` notebooks mixing code, markdown, magics and the odd unusual cell"""
+    rng = random.Random(seed)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        cells = []
+        for n in range(rng.randint(15, 60)):
+            kind = rng.random()
+            if kind < 0.6:
+                # Help syntax (df?) is rare and forces the nbconvert fallback
+                source = rng.choice(CODE_CELLS if rng.random() < 0.05 else CODE_CELLS[:-1])
+                cells.append(new_code_cell(source, execution_count=n + 1))
+            elif kind < 0.98:
+                cells.append(new_markdown_cell(rng.choice(MARKDOWN_CELLS)))
+            else:
+                cells.append(new_raw_cell("raw cell"))
+        nbformat.write(new_notebook(cells=cells), str(output_dir / f"notebook_{i:04d}.ipynb"))
+    print(f"Generated {count} notebooks in {output_dir}")
+
+
+def run_nbconvert(sources):
+    start = time.perf_counter()
+    results = [convert_notebook_source(source)[0] for source in sources]
+    return time.perf_counter() - start, results
+
+
+def run_fast(sources):
+    fallbacks = 0
+    results = []
+    start = time.perf_counter()
+    for source in sources:
+        try:
+            results.append(fast_convert_notebook_source(source)[0])
+        except FastConversionUnsupported:
+            fallbacks += 1
+            results.append(convert_notebook_source(source)[0])
+    return time.perf_counter() - start, results, fallbacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('notebooks_dir', type=Path, help='Directory searched recursively for *.ipynb')
+    parser.add_argument('--generate', type=int, metavar='N', help='Write N synthetic notebooks into notebooks_dir first')
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_corpus(args.notebooks_dir, args.generate)
+
+    paths = sorted(args.notebooks_dir.rglob("*.ipynb"))
+    if not paths:
+        print(f"No *.ipynb files found in {args.notebooks_dir}")
+        sys.exit(1)
+    sources = [path.read_text(encoding='utf-8') for path in paths]
+    size_mb = sum(len(source) for source in sources) / 1024 / 1024
+
+    warnings.filterwarnings("ignore")
+    # Warm up both paths so template loading is not billed to the first notebook
+    convert_notebook_source(sources[0])
+    nbconvert_time, nbconvert_results = run_nbconvert(sources)
+    fast_time, fast_results, fallbacks = run_fast(sources)
+
+    identical = sum(1 for a, b in zip(nbconvert_results, fast_results) if a == b)
+
+    print("=" * 60)
+    print(f"Notebooks: {len(sources)} ({size_mb:.1f} MB)")
+    print(f"nbconvert: {nbconvert_time:.3f}s total, {nbconvert_time / len(sources) * 1000:.1f} ms/notebook")
+    print(f"fast:      {fast_time:.3f}s total, {fast_time / len(sources) * 1000:.1f} ms/notebook "
+          f"({fallbacks} fell back to nbconvert)")
+    if fast_time > 0:
+        print(f"Speed-up:  {nbconvert_time / fast_time:.1f}x")
+    print(f"Identical output: {identical}/{len(sources)}")
+    for path, a, b in zip(paths, nbconvert_results, fast_results):
+        if a != b:
+            print(f"  differs: {path}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: offline HTML parsing vs live-DOM extraction on saved pages
+
+Capture some pages once (needs network):
+    python benchmarks/bench_parse_modes.py --capture pages/ URL [URL ...]
+
+Then compare both engines on the saved pages (no network):
+    python benchmarks/bench_parse_modes.py pages/
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kaggle_discussion_extractor import KaggleDiscussionExtractor, BrowserPool
+from kaggle_discussion_extractor.html_parser import OfflineDiscussionParser
+
+
+async def capture(output_dir: Path, urls):
+    """Save rendered HTML of each URL together with its source URL"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    extractor = KaggleDiscussionExtractor()
+
+    async with BrowserPool(max_pages=1) as pool:
+        async with pool.page() as page:
+            for url in urls:
+                html = await extractor.fetch_page_html(page, url)
+                stem = KaggleDiscussionExtractor._discussion_id(url)
+                (output_dir / f"{stem}.html").write_text(html, encoding='utf-8')
+                (output_dir / f"{stem}.url").write_text(url, encoding='utf-8')
+                print(f"Saved {stem}.html ({len(html) / 1024:.0f} KB)")
+
+
+def load_pages(pages_dir: Path):
+    pages = []
+    for html_file in sorted(pages_dir.glob("*.html")):
+        url_file = html_file.with_suffix(".url")
+        url = url_file.read_text(encoding='utf-8').strip() if url_file.exists() else \
+            f"https://www.kaggle.com/competitions/unknown/discussion/{html_file.stem}"
+        pages.append((url, html_file.read_text(encoding='utf-8')))
+    return pages
+
+
+def summarize(discussion):
+    return {
+        'title': discussion.title,
+        'author': discussion.main_author.username,
+        'total_replies': discussion.total_replies,
+    }
+
+
+async def run_live(pages, repeat):
+    """Live-DOM path: load the saved HTML into a page, then query the DOM"""
+    extractor = KaggleDiscussionExtractor()
+    results = {}
+    elapsed = 0.0
+
+    async with BrowserPool(max_pages=1) as pool:
+        async with pool.page() as page:
+            # Keep the saved snapshot static: no network for scripts or assets
+            await page.route("**/*", lambda route: route.abort())
+            for url, html in pages:
+                await page.set_content(html, wait_until="domcontentloaded")
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    discussion = await extractor.extract_loaded_discussion(page, url)
+                elapsed += time.perf_counter() - start
+                results[url] = summarize(discussion)
+
+    return elapsed, results
+
+
+def run_offline(pages, repeat):
+    """Offline path: parse the HTML string in Python"""
+    parser = OfflineDiscussionParser()
+    results = {}
+    start = time.perf_counter()
+    for url, html in pages:
+        for _ in range(repeat):
+            discussion = parser.parse(html, url)
+        results[url] = summarize(discussion)
+    return time.perf_counter() - start, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages_dir', type=Path, help='Directory of saved *.html pages')
+    parser.add_argument('urls', nargs='*', help='URLs to capture (with --capture)')
+    parser.add_argument('--capture', action='store_true', help='Capture URLs into pages_dir instead of benchmarking')
+    parser.add_argument('--repeat', type=int, default=3, help='Extractions per page (default: 3)')
+    args = parser.parse_args()
+
+    if args.capture:
+        await capture(args.pages_dir, args.urls)
+        return
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        print(f"No *.html pages found in {args.pages_dir}")
+        sys.exit(1)
+
+    count = len(pages) * args.repeat
+    live_time, live_results = await run_live(pages, args.repeat)
+    offline_time, offline_results = run_offline(pages, args.repeat)
+
+    matching = sum(1 for url in live_results if live_results[url] == offline_results.get(url))
+
+    print("=" * 60)
+    print(f"Pages: {len(pages)} x {args.repeat} runs")
+    print(f"Live DOM:     {live_time:.3f}s total, {live_time / count * 1000:.1f} ms/page")
+    print(f"Offline HTML: {offline_time:.3f}s total, {offline_time / count * 1000:.1f} ms/page")
+    if offline_time > 0:
+        print(f"Speed-up:     {live_time / offline_time:.1f}x")
+    print(f"Same title/author/reply count: {matching}/{len(pages)}")
+    for url in live_results:
+        if live_results[url] != offline_results.get(url):
+            print(f"  differs: {url}")
+            print(f"    live:    {json.dumps(live_results[url])}")
+            print(f"    offline: {json.dumps(offline_results.get(url))}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
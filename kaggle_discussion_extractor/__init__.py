@@ -7,6 +7,12 @@ Features hierarchical reply extraction, pagination support, and clean output for
 
 from .core import KaggleDiscussionExtractor, Discussion, Reply, Author
 from .notebook_downloader import KaggleNotebookDownloader, NotebookInfo
+from .browser_pool import BrowserPool
+from .readiness import ReadinessEngine, PageReadiness
+from .resource_blocking import ResourceBlockingPolicy
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker
+from .scheduler import FairScheduler
 from .cli import main as cli_main
 
 __version__ = "1.0.0"
@@ -18,5 +24,13 @@ __all__ = [
     "Discussion", 
     "Reply",
     "Author",
+    "BrowserPool",
+    "ReadinessEngine",
+    "PageReadiness",
+    "ResourceBlockingPolicy",
+    "RateLimiter",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "FairScheduler",
     "cli_main"
 ]
\ No newline at end of file
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Shared Browser Pool
+Keeps a single Chromium instance alive and hands out pages from a pool of contexts
+"""
+
+import sys
+import time
+import asyncio
+import logging
+from pathlib import Path
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Union
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Check for playwright
+try:
+    from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+except ImportError:
+    logger.error("playwright not installed. Please run: pip install playwright && playwright install chromium")
+    sys.exit(1)
+
+from .resource_blocking import ResourceBlockingPolicy
+
+
+class BrowserPool:
+    """
+    Reusable browser session shared by the extractor and the notebook downloader.
+
+    Chromium is launched once on first use and stays alive until close() is called,
+    so any number of competitions can be processed without paying browser startup
+    and teardown each time. Pages are handed out through page(); each page lives in
+    its own context and is returned to the pool for reuse instead of being closed.
+
+    Example:
+        async with BrowserPool(max_pages=4) as pool:
+            extractor = KaggleDiscussionExtractor(browser_pool=pool)
+            downloader = KaggleNotebookDownloader(browser_pool=pool)
+            await extractor.extract_competition_discussions(url_a)
+            await extractor.extract_competition_discussions(url_b)
+            await downloader.download_competition_notebooks(url_a)
+
+    With record_har_dir every context records its traffic to a HAR archive; with
+    replay_har_dir every request is answered from previously recorded archives
+    and anything that was not recorded is aborted, so a crawl can be rerun
+    offline at local-disk speed.
+    """
+
+    def __init__(self, headless: bool = True, max_pages: int = 4, dev_mode: bool = False,
+                 resource_policy: Optional[ResourceBlockingPolicy] = None,
+                 record_har_dir: Optional[Union[str, Path]] = None,
+                 replay_har_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize the pool (Chromium is launched lazily)
+
+        Args:
+            headless: Run browser in headless mode
+            max_pages: Maximum number of pages handed out at the same time
+            dev_mode: Enable development mode with detailed logging
+            resource_policy: Request blocking policy installed on every pooled context
+            record_har_dir: Directory to record one HAR archive per context into
+            replay_har_dir: Directory of recorded HAR archives to serve requests from
+        """
+        if record_har_dir and replay_har_dir:
+            raise ValueError("record_har_dir and replay_har_dir cannot be used together")
+
+        self.headless = headless
+        self.max_pages = max(1, max_pages)
+        self.dev_mode = dev_mode
+        self.resource_policy = resource_policy
+        self.record_har_dir = Path(record_har_dir) if record_har_dir else None
+        self.replay_har_dir = Path(replay_har_dir) if replay_har_dir else None
+
+        # Recordings of one pool share a prefix so reruns into the same directory never collide
+        self._har_session = time.strftime("%Y%m%d-%H%M%S")
+        self._har_count = 0
+        self._replay_files: Optional[List[Path]] = None
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._idle_pages: List[Page] = []
+        self._all_pages: List[Page] = []
+        # Created on first use, inside the running loop (before Python 3.10 asyncio primitives
+        # bind to the loop that is current when they are created)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether Chromium is currently running"""
+        return self._browser is not None and self._browser.is_connected()
+
+    def _init_primitives(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+            self._start_lock = asyncio.Lock()
+
+    async def start(self) -> "BrowserPool":
+        """Launch Chromium if it is not already running"""
+        self._init_primitives()
+        async with self._start_lock:
+            if self.is_running:
+                return self
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._idle_pages = []
+            self._all_pages = []
+
+            if self.dev_mode:
+                logger.debug(f"Browser pool started (max_pages={self.max_pages})")
+
+        return self
+
+    async def close(self):
+        """Close every pooled page and shut Chromium down"""
+        for page in self._all_pages:
+            try:
+                await page.context.close()
+            except Exception:
+                pass
+        self._idle_pages = []
+        self._all_pages = []
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+        if self.dev_mode:
+            logger.debug("Browser pool closed")
+
+    async def __aenter__(self) -> "BrowserPool":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _new_context(self) -> BrowserContext:
+        """Create a new browser context for a pooled page"""
+        options = {}
+        if self.record_har_dir is not None:
+            self.record_har_dir.mkdir(parents=True, exist_ok=True)
+            self._har_count += 1
+            # The archive is written when the context closes (page discarded or pool closed)
+            options['record_har_path'] = str(self.record_har_dir / f"{self._har_session}-{self._har_count}.har.zip")
+
+        context = await self._browser.new_context(**options)
+
+        # Routes registered later run first: blocking policy, then recordings, then abort
+        if self.replay_har_dir is not None:
+            await self._install_har_replay(context)
+        if self.resource_policy is not None:
+            await self.resource_policy.install(context)
+        return context
+
+    def har_archives(self) -> List[Path]:
+        """Recorded HAR archives in replay_har_dir, oldest first"""
+        if self._replay_files is None:
+            files = [p for p in self.replay_har_dir.glob("*") if p.name.endswith(('.har', '.har.zip'))]
+            if not files:
+                raise FileNotFoundError(f"No HAR archives found in {self.replay_har_dir}")
+            self._replay_files = sorted(files, key=lambda p: (p.stat().st_mtime, p.name))
+        return self._replay_files
+
+    async def _install_har_replay(self, context: BrowserContext):
+        """Serve requests of a context from the recorded archives only"""
+        archives = self.har_archives()
+
+        # Anything missing from every archive must not silently go to the network
+        await context.route("**/*", lambda route: route.abort())
+        # Newest recording registered last so it wins for URLs recorded more than once
+        for archive in archives:
+            await context.route_from_har(archive, not_found="fallback")
+
+        if self.dev_mode:
+            logger.debug(f"Replaying from {len(archives)} HAR archive(s) in {self.replay_har_dir}")
+
+    async def acquire_page(self) -> Page:
+        """
+        Take a page from the pool, creating one if none is idle.
+
+        Waits while max_pages pages are already checked out. Every acquired page
+        must be handed back with release_page().
+        """
+        self._init_primitives()
+        await self._semaphore.acquire()
+        try:
+            await self.start()
+
+            while self._idle_pages:
+                page = self._idle_pages.pop()
+                if not page.is_closed():
+                    return page
+                self._forget(page)
+
+            context = await self._new_context()
+            page = await context.new_page()
+            self._all_pages.append(page)
+
+            if self.dev_mode:
+                logger.debug(f"Browser pool opened page {len(self._all_pages)}/{self.max_pages}")
+
+            return page
+
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    async def release_page(self, page: Page, discard: bool = False):
+        """
+        Return a page to the pool
+
+        Args:
+            page: Page previously obtained from acquire_page()
+            discard: Close the page instead of reusing it (e.g. after a crash)
+        """
+        try:
+            if discard or page.is_closed() or not self.is_running:
+                self._forget(page)
+                try:
+                    await page.context.close()
+                except Exception:
+                    pass
+            else:
+                self._idle_pages.append(page)
+        finally:
+            self._semaphore.release()
+
+    def _forget(self, page: Page):
+        """Drop a page from the pool bookkeeping"""
+        if page in self._all_pages:
+            self._all_pages.remove(page)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a page for the duration of an async with block"""
+        page = await self.acquire_page()
+        discard = False
+        try:
+            yield page
+        except BaseException:
+            # A page that failed mid-navigation may be in a bad state
+            discard = True
+            raise
+        finally:
+            await self.release_page(page, discard=discard)
+
+
+@asynccontextmanager
+async def browser_session(pool: Optional[BrowserPool], headless: bool = True,
+                          dev_mode: bool = False, max_pages: int = 1,
+                          resource_policy: Optional[ResourceBlockingPolicy] = None,
+                          record_har_dir: Optional[Union[str, Path]] = None,
+                          replay_har_dir: Optional[Union[str, Path]] = None) -> AsyncIterator[BrowserPool]:
+    """
+    Yield the shared pool if one was given, otherwise a temporary pool
+    that is closed when the block exits
+
+    Args:
+        pool: Shared BrowserPool or None
+        headless: Headless setting for a temporary pool
+        dev_mode: Development mode for a temporary pool
+        max_pages: Page limit for a temporary pool
+        resource_policy: Request blocking policy for a temporary pool
+        record_har_dir: HAR recording directory for a temporary pool
+        replay_har_dir: HAR replay directory for a temporary pool
+    """
+    if pool is not None:
+        yield pool
+        return
+
+    temporary_pool = BrowserPool(headless=headless, max_pages=max_pages, dev_mode=dev_mode,
+                                 resource_policy=resource_policy, record_har_dir=record_har_dir,
+                                 replay_har_dir=replay_har_dir)
+    try:
+        yield await temporary_pool.start()
+    finally:
+        await temporary_pool.close()
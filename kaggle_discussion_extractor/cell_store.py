@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Cell Store
+Content-addressed SQLite store that keeps each unique notebook cell once
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from .notebook_converter import FastConversionUnsupported, convert_notebook_source, fast_convert_notebook
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cells (
+    hash TEXT PRIMARY KEY,
+    cell_type TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notebooks (
+    ref TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    version TEXT NOT NULL DEFAULT '',
+    header TEXT NOT NULL DEFAULT '',
+    stored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notebook_cells (
+    ref TEXT NOT NULL REFERENCES notebooks(ref) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL REFERENCES cells(hash),
+    execution_count INTEGER,
+    PRIMARY KEY (ref, position)
+);
+CREATE INDEX IF NOT EXISTS notebook_cells_by_hash ON notebook_cells(hash);
+"""
+
+# Raw cells with these mimetypes appear in the Python output; others are dropped on the way in
+_PYTHON_RAW_MIMETYPES = ('', 'text/x-python')
+
+
+def cell_hash(source: str, cell_type: str = "code") -> str:
+    """Content address of a cell: SHA-256 of its type and source (prompt numbers and outputs excluded)"""
+    return hashlib.sha256(f"{cell_type}\0{source}".encode('utf-8')).hexdigest()
+
+
+def _cell_source(cell: Dict[str, Any]) -> str:
+    source = cell.get('source', '')
+    return ''.join(source) if isinstance(source, list) else source
+
+
+@dataclass
+class CellStoreStats:
+    """Size of the store, as returned by CellStore.stats()"""
+    notebooks: int = 0
+    cell_references: int = 0
+    unique_cells: int = 0
+    stored_bytes: int = 0
+    referenced_bytes: int = 0
+
+    def summary(self) -> str:
+        saved = 1 - self.stored_bytes / self.referenced_bytes if self.referenced_bytes else 0.0
+        return (f"{self.notebooks} notebooks, {self.unique_cells}/{self.cell_references} unique cells, "
+                f"{self.stored_bytes / 1024 / 1024:.1f} MB stored for "
+                f"{self.referenced_bytes / 1024 / 1024:.1f} MB of cell source (-{saved:.0%})")
+
+
+class CellStore:
+    """
+    Stores notebooks as lists of cell hashes, each unique cell once.
+
+    Competition notebooks are heavily forked, so most cells of a corpus are
+    copies. Every code, markdown and raw cell is stored under cell_hash() of its
+    type and source; a notebook is the ordered list of its cell hashes plus the
+    per-notebook execution counts and header, enough to rebuild its .py output
+    byte for byte. Outputs are not stored.
+
+    Calls are serialized by a lock, so one store can be shared by threads
+    (e.g. run_in_executor from the downloader).
+
+    Example:
+        store = CellStore("notebooks.sqlite")
+        store.add_notebook("alice/eda", notebook_json, header="# EDA\n")
+        print(store.get_python("alice/eda"))
+        print(store.find_notebooks(cell_hash("import pandas as pd")))
+        store.close()
+    """
+
+    def __init__(self, path: Union[str, Path], dev_mode: bool = False):
+        """
+        Open (or create) a store
+
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.path = str(path)
+        self.dev_mode = dev_mode
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def add_notebook(self, ref: str, notebook: Union[str, Dict[str, Any]], header: str = "", title: str = "",
+                     url: str = "", version: str = "") -> int:
+        """
+        Store a notebook, replacing an earlier version of the same ref
+
+        Args:
+            ref: Kernel ref ("<owner>/<kernel>")
+            notebook: Notebook JSON text or the parsed notebook
+            header: Text written before the converted code in the .py output
+            title: Notebook title
+            url: Notebook URL
+            version: Kernel version (see NotebookCache)
+
+        Returns:
+            Number of cells that were not in the store yet
+        """
+        nb = json.loads(notebook) if isinstance(notebook, str) else notebook
+        if not isinstance(nb.get('cells'), list):
+            raise ValueError(f"{ref}: not an nbformat 4 notebook")
+
+        rows = []
+        cells = {}
+        for cell in nb['cells']:
+            metadata = cell.get('metadata') or {}
+            cell_type = cell.get('cell_type', '')
+            if (metadata.get('transient') or {}).get('remove_source'):
+                continue
+            if cell_type == 'raw' and str(metadata.get('raw_mimetype', '')).lower() not in _PYTHON_RAW_MIMETYPES:
+                continue
+            source = _cell_source(cell)
+            digest = cell_hash(source, cell_type)
+            cells[digest] = (digest, cell_type, source)
+            execution_count = cell.get('execution_count') if cell_type == 'code' else None
+            rows.append((ref, len(rows), digest, execution_count))
+
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO cells (hash, cell_type, source) VALUES (?, ?, ?)",
+                                 list(cells.values()))
+            new_cells = self._db.total_changes - before
+            self._db.execute("DELETE FROM notebooks WHERE ref = ?", (ref,))
+            self._db.execute("INSERT INTO notebooks (ref, title, url, version, header, stored_at) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", (ref, title, url, version, header, time.time()))
+            self._db.executemany("INSERT INTO notebook_cells (ref, position, hash, execution_count) "
+                                 "VALUES (?, ?, ?, ?)", rows)
+
+        if self.dev_mode:
+            logger.debug(f"Stored {ref}: {len(rows)} cells, {new_cells} new")
+        return new_cells
+
+    def has_notebook(self, ref: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM notebooks WHERE ref = ?", (ref,)).fetchone() is not None
+
+    def get_notebook(self, ref: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a stored notebook (sources only, no outputs)
+
+        Returns:
+            nbformat 4 notebook dict, or None if the ref is not stored
+        """
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM notebooks WHERE ref = ?", (ref,)).fetchone() is None:
+                return None
+            rows = self._db.execute(
+                "SELECT c.cell_type, c.source, nc.execution_count FROM notebook_cells nc "
+                "JOIN cells c ON c.hash = nc.hash WHERE nc.ref = ? ORDER BY nc.position", (ref,)
+            ).fetchall()
+
+        cells = []
+        for cell_type, source, execution_count in rows:
+            cell = {'cell_type': cell_type, 'metadata': {}, 'source': source}
+            if cell_type == 'code':
+                cell.update(execution_count=execution_count, outputs=[])
+            cells.append(cell)
+        return {'cells': cells, 'metadata': {}, 'nbformat': 4, 'nbformat_minor': 4}
+
+    def get_python(self, ref: str) -> Optional[str]:
+        """
+        Rebuild the .py output of a stored notebook (same text the downloader wrote)
+
+        Returns:
+            Header plus converted code, or None if the ref is not stored
+        """
+        nb = self.get_notebook(ref)
+        if nb is None:
+            return None
+        with self._lock:
+            (header,) = self._db.execute("SELECT header FROM notebooks WHERE ref = ?", (ref,)).fetchone()
+        try:
+            python_code, _ = fast_convert_notebook(nb)
+        except FastConversionUnsupported:
+            python_code, _ = convert_notebook_source(json.dumps(nb))
+        return header + python_code
+
+    def export_python(self, ref: str, python_path: Union[str, Path]) -> bool:
+        """Write the rebuilt .py output of a stored notebook; False if the ref is not stored"""
+        python_code = self.get_python(ref)
+        if python_code is None:
+            return False
+        Path(python_path).write_text(python_code, encoding='utf-8')
+        return True
+
+    def find_notebooks(self, digest: str) -> List[str]:
+        """
+        Every notebook containing a cell
+
+        Args:
+            digest: cell_hash() of the cell, e.g. cell_hash(source) for a code cell
+
+        Returns:
+            Sorted kernel refs
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT ref FROM notebook_cells WHERE hash = ? ORDER BY ref",
+                                    (digest,)).fetchall()
+        return [ref for (ref,) in rows]
+
+    def most_shared_cells(self, limit: int = 10, cell_type: str = "code") -> List[Dict[str, Any]]:
+        """
+        The cells that appear in the most notebooks
+
+        Returns:
+            Dicts with hash, notebooks (count) and source, most shared first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT c.hash, COUNT(DISTINCT nc.ref) AS notebooks, c.source FROM cells c "
+                "JOIN notebook_cells nc ON nc.hash = c.hash WHERE c.cell_type = ? "
+                "GROUP BY c.hash ORDER BY notebooks DESC, c.hash LIMIT ?", (cell_type, limit)
+            ).fetchall()
+        return [{'hash': digest, 'notebooks': count, 'source': source} for digest, count, source in rows]
+
+    def prune(self) -> int:
+        """Delete cells no stored notebook refers to any more (left behind by replaced versions)"""
+        with self._lock, self._db:
+            deleted = self._db.execute(
+                "DELETE FROM cells WHERE hash NOT IN (SELECT DISTINCT hash FROM notebook_cells)"
+            ).rowcount
+        if self.dev_mode:
+            logger.debug(f"Pruned {deleted} unreferenced cells from {self.path}")
+        return deleted
+
+    def stats(self) -> CellStoreStats:
+        with self._lock:
+            notebooks, = self._db.execute("SELECT COUNT(*) FROM notebooks").fetchone()
+            references, referenced = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(c.source AS BLOB))), 0) FROM notebook_cells nc "
+                "JOIN cells c ON c.hash = nc.hash"
+            ).fetchone()
+            unique, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(CAST(source AS BLOB))), 0) FROM cells"
+            ).fetchone()
+        return CellStoreStats(notebooks=notebooks, cell_references=references, unique_cells=unique,
+                              stored_bytes=stored, referenced_bytes=referenced)
+
+    def log_summary(self):
+        """Log how much the store deduplicates"""
+        logger.info(f"Cell store {self.path}: {self.stats().summary()}")
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoint
+Persists crawl progress so an interrupted extraction can be resumed
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import AsyncIterator, Dict, List
+
+from .discovery import ListingEntry
+from .manifest import ExtractionManifest
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+class CrawlCheckpoint:
+    """
+    Progress of one competition crawl, saved after every completed item.
+
+    Stored as .checkpoint-<content type>-<competition>.json inside the output
+    directory. It holds the discovered links in listing order, whether discovery
+    ran to the end, the IDs that were completed and the URLs that failed (with
+    the error), which is everything needed to continue where a run stopped.
+    """
+
+    def __init__(self, output_dir: Path, competition_url: str, content_type: str = "discussion",
+                 dev_mode: bool = False):
+        """
+        Initialize an empty checkpoint (call load() to continue a previous run)
+
+        Args:
+            output_dir: Directory holding the extracted files
+            competition_url: Competition being crawled
+            content_type: "discussion" or "writeup"
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.output_dir = Path(output_dir)
+        self.competition_url = competition_url
+        self.content_type = content_type
+        self.dev_mode = dev_mode
+        slug = ExtractionManifest.competition_slug(competition_url)
+        self.path = self.output_dir / f".checkpoint-{content_type}-{slug}.json"
+
+        self.links: List[ListingEntry] = []
+        self.discovery_complete = False
+        self.completed: Dict[str, str] = {}
+        self.failures: Dict[str, str] = {}
+        self._known_urls = set()
+
+    def load(self) -> "CrawlCheckpoint":
+        """Read the checkpoint of a previous run, if there is one"""
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.links = [ListingEntry(url=link['url'], comment_count=link.get('comment_count'),
+                                       last_activity=link.get('last_activity'))
+                          for link in data.get('links', [])]
+            self._known_urls = {link.url for link in self.links}
+            self.discovery_complete = bool(data.get('discovery_complete'))
+            self.completed = dict(data.get('completed', {}))
+            self.failures = dict(data.get('failures', {}))
+            if self.dev_mode:
+                logger.debug(f"Loaded checkpoint: {len(self.completed)}/{len(self.links)} completed, "
+                             f"{len(self.failures)} failed")
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+        return self
+
+    def save(self):
+        """Write the checkpoint atomically (temp file + rename)"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'competition_url': self.competition_url,
+            'content_type': self.content_type,
+            'saved_at': datetime.now().isoformat(),
+            'discovery_complete': self.discovery_complete,
+            'links': [{'url': link.url, 'comment_count': link.comment_count, 'last_activity': link.last_activity}
+                      for link in self.links],
+            'completed': self.completed,
+            'failures': self.failures,
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint file after a run that finished cleanly"""
+        if self.path.exists():
+            self.path.unlink()
+
+    @property
+    def has_progress(self) -> bool:
+        return bool(self.links)
+
+    def add_link(self, entry: ListingEntry):
+        if entry.url not in self._known_urls:
+            self._known_urls.add(entry.url)
+            self.links.append(entry)
+
+    def is_completed(self, discussion_id: str) -> bool:
+        return discussion_id in self.completed
+
+    def mark_completed(self, discussion_id: str, url: str):
+        self.completed[discussion_id] = url
+        self.failures.pop(url, None)
+
+    def mark_failed(self, url: str, error: str):
+        self.failures[url] = error
+
+    async def entries(self) -> AsyncIterator[ListingEntry]:
+        """Replay the recorded links in listing order (source for a resumed pipeline)"""
+        for entry in list(self.links):
+            yield entry
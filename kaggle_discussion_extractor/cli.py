@@ -7,8 +7,16 @@ import argparse
 import asyncio
 import sys
 from pathlib import Path
+from typing import List
+from .browser_pool import browser_session
 from .core import KaggleDiscussionExtractor
-from .notebook_downloader import KaggleNotebookDownloader
+from .notebook_downloader import KaggleNotebookDownloader, NOTEBOOK_SORT_OPTIONS
+from .notebook_converter import CONVERTER_MODES, NotebookConverter
+from .notebook_outputs import OUTPUT_MODES
+from .cell_store import CellStore
+from .resource_blocking import ResourceBlockingPolicy
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
 
 
 def create_parser():
@@ -29,12 +37,31 @@ Examples:
   
   # Run with visible browser (non-headless)
   %(prog)s https://www.kaggle.com/competitions/neurips-2025 --no-headless
+  
+  # Extract discussions on 4 pages in parallel
+  %(prog)s https://www.kaggle.com/competitions/neurips-2025 --concurrency 4
+  
+  # Extract several competitions in one process (one browser, fair scheduling)
+  %(prog)s https://www.kaggle.com/competitions/a https://www.kaggle.com/competitions/b -c 4
+  %(prog)s --competitions-file competitions.txt -c 4
+  
+  # Record a crawl once, then re-run extraction offline from the recording
+  %(prog)s https://www.kaggle.com/competitions/neurips-2025 --record-har har/
+  %(prog)s https://www.kaggle.com/competitions/neurips-2025 --replay-har har/
         """
     )
     
     parser.add_argument(
-        'competition_url',
-        help='URL of the Kaggle competition to extract discussions from'
+        'competition_urls',
+        nargs='*',
+        metavar='competition_url',
+        help='URL(s) of the Kaggle competition(s) to extract discussions from'
+    )
+
+    parser.add_argument(
+        '--competitions-file', '-f',
+        default=None,
+        help='File with one competition URL per line (blank lines and # comments ignored)'
     )
     
     parser.add_argument(
@@ -56,12 +83,165 @@ Examples:
         help='Run browser in visible mode (not headless)'
     )
 
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=1,
+        help='Number of discussions to extract in parallel (default: 1)'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=1.0,
+        help='Maximum requests per second to Kaggle, shared by all pages and kaggle CLI calls (default: 1.0)'
+    )
+
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=4,
+        help='Requests allowed back to back before --rate applies (default: 4)'
+    )
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=2,
+        help='Retries (with backoff and jitter) for a discussion that fails to load (default: 2)'
+    )
+
+    parser.add_argument(
+        '--block-resources',
+        action='store_true',
+        help='Block images, fonts, media and third-party trackers to save bandwidth'
+    )
+
+    parser.add_argument(
+        '--legacy-comments',
+        action='store_true',
+        help='Use the slower per-element comment extraction (to compare output)'
+    )
+
+    parser.add_argument(
+        '--parse-mode',
+        choices=['live', 'offline'],
+        default='live',
+        help='live: query the DOM in the browser; offline: parse rendered HTML in Python (requires lxml)'
+    )
+
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=0,
+        help='Worker processes for --parse-mode offline (default: 0, parse in a thread)'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Keep previous output and only re-extract threads that changed since the last run'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted run from its saved checkpoint'
+    )
+
+    har_group = parser.add_mutually_exclusive_group()
+    har_group.add_argument(
+        '--record-har',
+        metavar='DIR',
+        default=None,
+        help='Record all browser traffic into HAR archives in DIR'
+    )
+    har_group.add_argument(
+        '--replay-har',
+        metavar='DIR',
+        default=None,
+        help='Replay a crawl from HAR archives in DIR without touching the network'
+    )
+
     parser.add_argument(
         '--notebooks', '-n',
         action='store_true',
         help='Download and convert competition notebooks to Python files'
     )
     
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=4,
+        help='Notebooks downloaded and converted in parallel with --notebooks (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--notebook-sort',
+        choices=list(NOTEBOOK_SORT_OPTIONS),
+        default=None,
+        help='Order notebooks are listed in with --notebooks; with --limit N this picks the top N '
+             '(default: Kaggle\'s default order)'
+    )
+    
+    parser.add_argument(
+        '--convert-workers',
+        type=int,
+        default=None,
+        help='Processes converting notebooks to Python (default: one per CPU, 0 = in a thread)'
+    )
+    
+    parser.add_argument(
+        '--converter',
+        choices=list(CONVERTER_MODES),
+        default='fast',
+        help='Notebook to Python conversion: fast native converter (nbconvert as fallback) '
+             'or nbconvert only (default: fast)'
+    )
+    
+    parser.add_argument(
+        '--no-ipynb',
+        action='store_true',
+        help='With --notebooks, write only the converted .py files, not the original .ipynb'
+    )
+    
+    parser.add_argument(
+        '--strip-outputs',
+        choices=list(OUTPUT_MODES),
+        default='keep',
+        help='With --notebooks or --convert-dir, strip cell outputs while reading: drop images, '
+             'truncate long text (and images), or remove all outputs (default: keep)'
+    )
+    
+    parser.add_argument(
+        '--cell-store',
+        metavar='DB',
+        default=None,
+        help='With --notebooks, also add every downloaded notebook to this SQLite store, '
+             'which keeps each unique cell once'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='With --notebooks, download every notebook even if the same version is already on disk'
+    )
+    
+    parser.add_argument(
+        '--convert-dir',
+        metavar='DIR',
+        default=None,
+        help='Only convert the .ipynb files under DIR to Python (no competition URL needed)'
+    )
+    
+    parser.add_argument(
+        '--kaggle-backend',
+        choices=['auto', 'api', 'cli'],
+        default='auto',
+        help='How --notebooks talks to Kaggle: in-process API client, kaggle CLI subprocesses, '
+             'or auto (API when credentials are found, CLI as fallback; default)'
+    )
+    
     parser.add_argument(
         '--version', '-v',
         action='version',
@@ -71,27 +251,80 @@ Examples:
     return parser
 
 
+def read_competition_urls(args) -> List[str]:
+    """Competition URLs from the command line and --competitions-file, in order"""
+    urls = list(args.competition_urls)
+    if args.competitions_file:
+        with open(args.competitions_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    urls.append(line)
+    return urls
+
+
 async def main():
     """Main CLI function"""
     parser = create_parser()
     args = parser.parse_args()
 
-    # Validate competition URL
-    if not args.competition_url.startswith('https://www.kaggle.com/competitions/'):
-        print("Error: Please provide a valid Kaggle competition URL")
+    if args.convert_dir:
+        converter = NotebookConverter(workers=args.convert_workers, mode=args.converter,
+                                      strip_outputs=args.strip_outputs, dev_mode=args.dev_mode)
+        try:
+            stats = await converter.convert_directory(Path(args.convert_dir))
+        finally:
+            converter.close()
+        print(f"Notebook conversion: {stats.summary()}")
+        sys.exit(0 if stats.converted and not stats.failed else 1)
+
+    try:
+        competition_urls = read_competition_urls(args)
+    except OSError as e:
+        print(f"Error: Cannot read competitions file: {e}")
+        sys.exit(1)
+
+    if not competition_urls:
+        print("Error: Please provide at least one Kaggle competition URL")
         print("Example: https://www.kaggle.com/competitions/neurips-2025")
         sys.exit(1)
 
+    # Validate competition URLs
+    for competition_url in competition_urls:
+        if not competition_url.startswith('https://www.kaggle.com/competitions/'):
+            print(f"Error: Please provide a valid Kaggle competition URL (got: {competition_url})")
+            print("Example: https://www.kaggle.com/competitions/neurips-2025")
+            sys.exit(1)
+    batch = len(competition_urls) > 1
+
+    resource_policy = ResourceBlockingPolicy(dev_mode=args.dev_mode) if args.block_resources else None
+    # Replayed traffic never reaches Kaggle, so it is not rate limited
+    rate_limiter = RateLimiter(rate=None if args.replay_har else args.rate, burst=args.burst, dev_mode=args.dev_mode)
+
     # Initialize extractor
     extractor = KaggleDiscussionExtractor(
         dev_mode=args.dev_mode,
-        headless=not args.no_headless
+        headless=not args.no_headless,
+        concurrency=args.concurrency,
+        resource_policy=resource_policy,
+        batch_comments=not args.legacy_comments,
+        parse_mode=args.parse_mode,
+        parse_workers=args.parse_workers,
+        record_har=args.record_har,
+        replay_har=args.replay_har,
+        incremental=args.incremental,
+        resume=args.resume,
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(max_attempts=args.retries + 1)
     )
 
     print("=" * 60)
     print("Kaggle Discussion Extractor")
     print("=" * 60)
-    print(f"Competition: {args.competition_url}")
+    if batch:
+        print(f"Competitions: {len(competition_urls)}")
+    else:
+        print(f"Competition: {competition_urls[0]}")
     print("Features:")
     print("  - Hierarchical reply extraction (1, 1.1, 1.2, etc.)")
     print("  - No content duplication between parent/child replies")
@@ -103,6 +336,22 @@ async def main():
         print("  - Development mode: ENABLED")
     if args.no_headless:
         print("  - Browser mode: VISIBLE")
+    if args.concurrency > 1:
+        print(f"  - Concurrency: {args.concurrency} pages")
+    if args.block_resources:
+        print("  - Resource blocking: ENABLED")
+    if args.notebooks:
+        print(f"  - Notebook downloads: {args.download_workers} in parallel")
+    if not args.replay_har:
+        print(f"  - Rate limit: {args.rate:g} requests/s (burst {args.burst}, backs off on 429/5xx)")
+    if args.incremental:
+        print("  - Incremental mode: only changed threads are re-extracted")
+    if args.resume:
+        print("  - Resuming from the last checkpoint")
+    if args.record_har:
+        print(f"  - Recording HAR archives to: {args.record_har}")
+    if args.replay_har:
+        print(f"  - Replaying HAR archives from: {args.replay_har}")
 
     print()
 
@@ -113,15 +362,38 @@ async def main():
         if args.notebooks:
             # Extract notebooks
             print("Starting notebook extraction...")
-            notebook_downloader = KaggleNotebookDownloader(
-                dev_mode=args.dev_mode,
-                headless=not args.no_headless
-            )
+            cell_store = CellStore(args.cell_store, dev_mode=args.dev_mode) if args.cell_store else None
+            # One browser for every competition
+            async with browser_session(None, not args.no_headless, args.dev_mode, args.concurrency,
+                                       resource_policy, args.record_har, args.replay_har) as pool:
+                notebook_downloader = KaggleNotebookDownloader(
+                    dev_mode=args.dev_mode,
+                    headless=not args.no_headless,
+                    browser_pool=pool,
+                    rate_limiter=rate_limiter,
+                    download_workers=args.download_workers,
+                    kaggle_backend=args.kaggle_backend,
+                    convert_workers=args.convert_workers,
+                    converter_mode=args.converter,
+                    keep_ipynb=not args.no_ipynb,
+                    use_cache=not args.no_cache,
+                    strip_outputs=args.strip_outputs,
+                    cell_store=cell_store
+                )
 
-            success = await notebook_downloader.download_competition_notebooks(
-                competition_url=args.competition_url,
-                limit=args.limit
-            )
+                try:
+                    results = []
+                    for competition_url in competition_urls:
+                        results.append(await notebook_downloader.download_competition_notebooks(
+                            competition_url=competition_url,
+                            limit=args.limit,
+                            sort_by=args.notebook_sort
+                        ))
+                    success = all(results)
+                finally:
+                    notebook_downloader.close()
+                    if cell_store is not None:
+                        cell_store.close()
 
             if success:
                 print("\n" + "=" * 60)
@@ -135,10 +407,16 @@ async def main():
                 print("=" * 60)
         else:
             # Extract discussions (default)
-            success = await extractor.extract_competition_discussions(
-                competition_url=args.competition_url,
-                limit=args.limit
-            )
+            if batch:
+                results = await extractor.extract_multiple_competitions(competition_urls, limit=args.limit)
+                success = all(results.values())
+                for competition_url, competition_success in results.items():
+                    print(f"  {'OK    ' if competition_success else 'FAILED'} {competition_url}")
+            else:
+                success = await extractor.extract_competition_discussions(
+                    competition_url=competition_urls[0],
+                    limit=args.limit
+                )
 
             if success:
                 print("\n" + "=" * 60)
@@ -154,7 +432,7 @@ async def main():
         return success
 
     except KeyboardInterrupt:
-        print("\nExtraction cancelled by user")
+        print("\nExtraction cancelled by user (progress is checkpointed; rerun with --resume)")
         return False
     except Exception as e:
         print(f"\nUnexpected error: {e}")
@@ -179,7 +457,7 @@ def cli_main():
         result = asyncio.run(main())
         sys.exit(0 if result else 1)
     except KeyboardInterrupt:
-        print("\nExtraction cancelled by user")
+        print("\nExtraction cancelled by user (progress is checkpointed; rerun with --resume)")
         sys.exit(0)
     except Exception as e:
         print(f"Error: {e}")
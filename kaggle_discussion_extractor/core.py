@@ -6,24 +6,35 @@ Based on the working neurips_extractor_final.py with all functionality preserved
 
 import sys
 import asyncio
-import json
 import re
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 # Check for playwright
 try:
-    from playwright.async_api import async_playwright, Page, ElementHandle
+    from playwright.async_api import Page
 except ImportError:
     logger.error("playwright not installed. Please run: pip install playwright && playwright install chromium")
     sys.exit(1)
 
+from .browser_pool import BrowserPool, browser_session
+from .readiness import ReadinessEngine
+from .resource_blocking import ResourceBlockingPolicy
+from .discovery import ListingDiscovery
+from .pipeline import ExtractionPipeline
+from .manifest import ExtractionManifest
+from .checkpoint import CrawlCheckpoint
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy, CircuitBreaker, DeadLetterQueue
+from .scheduler import FairScheduler
+
 
 @dataclass
 class Author:
@@ -68,19 +79,358 @@ class Discussion:
     extraction_time: str
 
 
+# Where each kind of competition content is listed and saved
+CONTENT_TYPES = {
+    'discussion': {
+        'output_dir': 'kaggle_discussions_extracted',
+        'listing': 'discussion',
+        'link_fragment': '/discussion/',
+        'page_type': 'discussion_listing',
+        'paginate': True,
+    },
+    'writeup': {
+        'output_dir': 'kaggle_writeups_extracted',
+        'listing': 'writeups',
+        'link_fragment': '/writeups/',
+        'page_type': 'writeup_listing',
+        'paginate': False,  # Single listing page
+    },
+}
+
+COMMENT_SELECTOR = 'div[data-testid="discussions-comment"]'
+
+RANK_PATTERNS = [
+    r'(\d+)(?:st|nd|rd|th)\s+in\s+this\s+Competition',
+    r'(\d+)(?:st|nd|rd|th)\s+in\s+Competition',
+    r'(\d+)(?:st|nd|rd|th)\s+place',
+    r'Rank\s*[:#]?\s*(\d+)',
+    r'#(\d+)\s+in\s+competition'
+]
+
+BADGE_KEYWORDS = ['Host', 'Expert', 'Master', 'Grandmaster', 'Contributor', 'Novice']
+
+AUTHOR_SKIP_PATHS = ['/competitions/', '/discussion/', '/code/', '/datasets/']
+
+
+def _format_rank(rank_num: int) -> str:
+    """Format a competition placement as e.g. '21st in this Competition'"""
+    # Add proper ordinal suffix
+    if rank_num % 10 == 1 and rank_num % 100 != 11:
+        suffix = "st"
+    elif rank_num % 10 == 2 and rank_num % 100 != 12:
+        suffix = "nd"
+    elif rank_num % 10 == 3 and rank_num % 100 != 13:
+        suffix = "rd"
+    else:
+        suffix = "th"
+    return f"{rank_num}{suffix} in this Competition"
+
+
+def _content_from_html(outer_html: str) -> Optional[str]:
+    """
+    Extract comment paragraphs from a comment's outer HTML
+
+    Returns None when no content container with paragraphs is found,
+    in which case callers fall back to _content_from_text().
+    """
+    # Find the content container
+    content_match = re.search(r'<div[^>]*class="[^"]*(?:eTCgfj|jMpVQY)[^"]*"[^>]*>(.*?)</div>', outer_html, re.DOTALL)
+    if not content_match:
+        return None
+
+    return _content_from_fragment(content_match.group(1))
+
+
+def _content_from_fragment(content_html: str) -> Optional[str]:
+    """Extract paragraphs from the inner HTML of a comment content container"""
+    # Remove any nested comment divs
+    content_html = re.sub(r'<div[^>]*data-testid="discussions-comment"[^>]*>.*?</div>', '', content_html, flags=re.DOTALL)
+
+    # Extract text from paragraphs
+    paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', content_html, re.DOTALL)
+    if not paragraphs:
+        return None
+
+    content_parts = []
+    for p_content in paragraphs:
+        # Clean HTML tags
+        text = re.sub(r'<[^>]+>', '', p_content)
+        text = text.strip()
+        if text and len(text) > 10:
+            content_parts.append(text)
+
+    return '\n'.join(content_parts)
+
+
+def _content_from_text(all_text: str, author_username: str) -> str:
+    """Fallback content extraction from a comment's plain text, skipping metadata lines"""
+    if not all_text:
+        return ""
+
+    lines = all_text.split('\n')
+    content_lines = []
+    skip_next = False
+
+    for line in lines:
+        line = line.strip()
+
+        # Skip metadata lines
+        if any(skip in line.lower() for skip in [
+            'posted', 'edited', 'reply', 'vote',
+            f'{author_username.lower()}',
+            'in this competition', '·'
+        ]):
+            skip_next = True
+            continue
+
+        if skip_next:
+            skip_next = False
+            continue
+
+        if len(line) > 20:
+            content_lines.append(line)
+
+    return '\n'.join(content_lines[:3])  # Limit to avoid capturing child content
+
+
+def _writeup_content_from_text(all_text: str) -> str:
+    """Extract writeup content from the full page text when no content element matched"""
+    if not all_text or len(all_text.strip()) <= 100:
+        return ""
+
+    # Find the main writeup content by looking for the start pattern
+    # From our debug, writeups start with "First, thanks to the organizers..."
+
+    # Clean the text
+    clean_text = re.sub(r'[^\x00-\x7F]+', ' ', all_text)  # Remove non-ASCII
+    lines = clean_text.split('\n')
+
+    # Find where the actual writeup content starts
+    content_start_idx = None
+    content_lines = []
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+
+        # Look for writeup start indicators
+        if any(start_phrase in line.lower() for start_phrase in [
+            'first, thanks to the organizers',
+            'overview',
+            'if you watched the leaderboard',
+            'thanks to the organizers'
+        ]):
+            content_start_idx = i
+            break
+
+    # If we found the start, extract from there
+    if content_start_idx is not None:
+        for line in lines[content_start_idx:]:
+            line = line.strip()
+            if len(line) > 10 and not any(skip in line.lower() for skip in [
+                'kaggle', 'navigation', 'menu', 'search', 'sign in', 'register',
+                'skip to content', 'home', 'competitions', 'datasets', 'models'
+            ]):
+                content_lines.append(line)
+
+            # Stop when we reach the comments section
+            if 'comments' in line.lower() or 'discussion' in line.lower():
+                if len(content_lines) > 10:  # Only stop if we have substantial content
+                    break
+
+    else:
+        # Fallback: extract meaningful content from anywhere
+        for line in lines:
+            line = line.strip()
+            if len(line) > 20 and not any(skip in line.lower() for skip in [
+                'kaggle', 'navigation', 'menu', 'search', 'sign in', 'register',
+                'skip to content', 'home', 'competitions', 'datasets', 'models'
+            ]):
+                content_lines.append(line)
+
+    # Take substantial amount of content for writeups
+    return '\n'.join(content_lines[:50])  # More content for writeups
+
+
+# Collects every comment of a thread in a single round trip. Mirrors the per-element
+# path: hierarchy heuristics, author link, rank, badges, upvotes, content container
+# and timestamp, plus the index of the closest enclosing comment.
+_COMMENT_TREE_JS = r"""
+    ([selector, rankPatterns, badgeKeywords, skipPaths]) => {
+        const rankRegexes = rankPatterns.map(p => new RegExp(p, 'i'));
+        const keywords = badgeKeywords.map(k => k.toLowerCase());
+        const contentRegex = /<div[^>]*class="[^"]*(?:eTCgfj|jMpVQY)[^"]*"[^>]*>([\s\S]*?)<\/div>/;
+        const nestedRegex = /<div[^>]*data-testid="discussions-comment"[^>]*>[\s\S]*?<\/div>/g;
+        const paragraphRegex = /<p[^>]*>[\s\S]*?<\/p>/;
+
+        const comments = Array.from(document.querySelectorAll(selector));
+        const indexOf = new Map(comments.map((el, i) => [el, i]));
+
+        return comments.map((element) => {
+            // Hierarchy: nesting containers and visual indentation
+            let depth = 0;
+            let current = element;
+            const computedStyle = window.getComputedStyle(element);
+            const totalIndent = (parseInt(computedStyle.marginLeft) || 0) + (parseInt(computedStyle.paddingLeft) || 0);
+            while (current && current.parentElement) {
+                current = current.parentElement;
+                const classes = typeof current.className === 'string' ? current.className : '';
+                if (classes.includes('reply') || classes.includes('nested') || classes.includes('thread') ||
+                    current.getAttribute('data-testid') === 'discussions-comment') {
+                    depth++;
+                }
+                if (depth > 5) break;
+            }
+            const isNested = depth > 0 || totalIndent > 40;
+            if (totalIndent > 40 && depth === 0) depth = Math.max(1, Math.floor(totalIndent / 40));
+
+            const parent = element.parentElement ? element.parentElement.closest(selector) : null;
+
+            // Author: first profile link
+            let username = null;
+            let displayName = null;
+            for (const link of element.querySelectorAll('a[href^="/"]')) {
+                const href = link.getAttribute('href');
+                if (href && href.startsWith('/') && !skipPaths.some(skip => href.includes(skip))) {
+                    const match = href.match(/^\/([^/]+)$/);
+                    if (match) {
+                        username = match[1];
+                        const linkText = (link.textContent || '').trim();
+                        displayName = linkText || username;
+                        break;
+                    }
+                }
+            }
+
+            const text = element.textContent || '';
+
+            let rankNumber = null;
+            let html = null;
+            for (const regex of rankRegexes) {
+                let match = text.match(regex);
+                if (!match) {
+                    if (html === null) html = element.innerHTML;
+                    match = html.match(regex);
+                }
+                if (match) {
+                    rankNumber = parseInt(match[1]);
+                    break;
+                }
+            }
+
+            const badges = [];
+            for (const elem of element.querySelectorAll('span, div')) {
+                const badgeText = (elem.textContent || '').trim();
+                if (!badgeText || badgeText.length >= 30) continue;
+                const lower = badgeText.toLowerCase();
+                if (keywords.some(k => lower.includes(k)) && !badges.includes(badgeText)) {
+                    badges.push(badgeText);
+                }
+            }
+
+            let upvotes = null;
+            for (const button of element.querySelectorAll('button[aria-label*="vote"]')) {
+                const match = (button.getAttribute('aria-label') || '').match(/(-?\d+)\s+votes?/);
+                if (match) {
+                    upvotes = parseInt(match[1]);
+                    break;
+                }
+            }
+            if (upvotes === null) {
+                for (const button of element.querySelectorAll('button')) {
+                    const buttonText = (button.textContent || '').trim();
+                    if (/^-?\d+$/.test(buttonText)) {
+                        upvotes = parseInt(buttonText);
+                        break;
+                    }
+                }
+            }
+
+            const contentMatch = element.outerHTML.match(contentRegex);
+            const contentHtml = contentMatch ? contentMatch[1] : null;
+            const hasParagraphs = contentHtml !== null && paragraphRegex.test(contentHtml.replace(nestedRegex, ''));
+
+            const timeElem = element.querySelector('span[title]');
+
+            return {
+                username: username,
+                displayName: displayName,
+                rankNumber: rankNumber,
+                badges: badges,
+                upvotes: upvotes || 0,
+                timestamp: timeElem ? (timeElem.getAttribute('title') || '') : '',
+                contentHtml: hasParagraphs ? contentHtml : null,
+                text: hasParagraphs ? null : text,
+                depth: Math.max(0, depth),
+                isNested: isNested,
+                visualIndent: totalIndent,
+                parentIndex: parent ? indexOf.get(parent) : null
+            };
+        });
+    }
+"""
+
+
 class KaggleDiscussionExtractor:
     """Main extractor class with all functionality from neurips_extractor_final.py"""
     
-    def __init__(self, dev_mode: bool = False, headless: bool = True):
+    def __init__(self, dev_mode: bool = False, headless: bool = True,
+                 browser_pool: Optional[BrowserPool] = None, concurrency: int = 1,
+                 readiness: Optional[ReadinessEngine] = None,
+                 resource_policy: Optional[ResourceBlockingPolicy] = None,
+                 batch_comments: bool = True, parse_mode: str = "live", parse_workers: int = 0,
+                 record_har: Optional[str] = None, replay_har: Optional[str] = None,
+                 incremental: bool = False, resume: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         """
         Initialize the extractor
         
         Args:
             dev_mode: Enable development mode with detailed logging
             headless: Run browser in headless mode
+            browser_pool: Shared BrowserPool to reuse across calls (default: one browser per call)
+            concurrency: Number of discussions extracted in parallel, each on its own page
+            readiness: ReadinessEngine deciding when a loaded page is ready (default predicates)
+            resource_policy: Opt-in request blocking policy (ignored when browser_pool has its own)
+            batch_comments: Extract the whole comment tree in one page.evaluate call;
+                False uses the legacy per-element path (for comparing output)
+            parse_mode: "live" queries the DOM through the browser; "offline" only renders
+                the page, frees the tab and parses page.content() in Python (requires lxml)
+            parse_workers: Worker processes for offline parsing (0 = parse in a thread)
+            record_har: Directory to record all browser traffic into as HAR archives
+            replay_har: Directory of recorded HAR archives to replay instead of using the network
+                (both ignored when browser_pool is given)
+            incremental: Keep the output directory and only re-extract threads that changed
+                since the last run (tracked in a per-competition manifest)
+            resume: Continue an interrupted run from its checkpoint instead of starting over
+            rate_limiter: Limiter every navigation goes through; share one instance with the
+                notebook downloader to apply a single budget (default: 1 request/s, burst 4;
+                unlimited when replaying HAR archives)
+            retry_policy: Retries with jitter for failed navigations/extractions (default: 3 attempts)
+            circuit_breaker: Pauses the crawl when the error rate spikes (default: 50% of the last 20)
         """
+        if parse_mode not in ("live", "offline"):
+            raise ValueError(f"Unknown parse_mode: {parse_mode} (expected 'live' or 'offline')")
+        if record_har and replay_har:
+            raise ValueError("record_har and replay_har cannot be used together")
+
         self.dev_mode = dev_mode
         self.headless = headless
+        self.browser_pool = browser_pool
+        self.concurrency = max(1, concurrency)
+        self.readiness = readiness or ReadinessEngine(dev_mode=dev_mode)
+        self.resource_policy = resource_policy
+        self.batch_comments = batch_comments
+        self.parse_mode = parse_mode
+        self.parse_workers = max(0, parse_workers)
+        self.record_har = record_har
+        self.replay_har = replay_har
+        self.incremental = incremental
+        self.resume = resume
+        # Replayed responses come from local archives, so there is nothing to throttle
+        self.rate_limiter = rate_limiter or RateLimiter(rate=None if replay_har else 1.0, dev_mode=dev_mode)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(dev_mode=dev_mode)
         
         # Setup logging based on mode
         log_level = logging.DEBUG if dev_mode else logging.INFO
@@ -102,7 +452,7 @@ class KaggleDiscussionExtractor:
 
             for link in author_links:
                 href = await link.get_attribute('href')
-                if href and href.startswith('/') and not any(skip in href for skip in ['/competitions/', '/discussion/', '/code/', '/datasets/']):
+                if href and href.startswith('/') and not any(skip in href for skip in AUTHOR_SKIP_PATHS):
                     username_match = re.match(r'^/([^/]+)$', href)
                     if username_match:
                         author_link = link
@@ -126,44 +476,16 @@ class KaggleDiscussionExtractor:
                 element_html = await element.inner_html()
 
                 # Strategy 1: Look for "Xth in this Competition" pattern
-                rank_patterns = [
-                    r'(\d+)(?:st|nd|rd|th)\s+in\s+this\s+Competition',
-                    r'(\d+)(?:st|nd|rd|th)\s+in\s+Competition',
-                    r'(\d+)(?:st|nd|rd|th)\s+place',
-                    r'Rank\s*[:#]?\s*(\d+)',
-                    r'#(\d+)\s+in\s+competition'
-                ]
-
-                for pattern in rank_patterns:
+                for pattern in RANK_PATTERNS:
                     match = re.search(pattern, full_text, re.IGNORECASE)
                     if match:
-                        rank_num = int(match.group(1))
-                        # Add proper ordinal suffix
-                        if rank_num % 10 == 1 and rank_num % 100 != 11:
-                            suffix = "st"
-                        elif rank_num % 10 == 2 and rank_num % 100 != 12:
-                            suffix = "nd"
-                        elif rank_num % 10 == 3 and rank_num % 100 != 13:
-                            suffix = "rd"
-                        else:
-                            suffix = "th"
-                        rank = f"{rank_num}{suffix} in this Competition"
+                        rank = _format_rank(int(match.group(1)))
                         break
 
                     # Also check HTML content
                     match = re.search(pattern, element_html, re.IGNORECASE)
                     if match:
-                        rank_num = int(match.group(1))
-                        # Add proper ordinal suffix
-                        if rank_num % 10 == 1 and rank_num % 100 != 11:
-                            suffix = "st"
-                        elif rank_num % 10 == 2 and rank_num % 100 != 12:
-                            suffix = "nd"
-                        elif rank_num % 10 == 3 and rank_num % 100 != 13:
-                            suffix = "rd"
-                        else:
-                            suffix = "th"
-                        rank = f"{rank_num}{suffix} in this Competition"
+                        rank = _format_rank(int(match.group(1)))
                         break
 
             except Exception as rank_err:
@@ -179,8 +501,7 @@ class KaggleDiscussionExtractor:
                     if text:
                         text = text.strip()
                         # Look for Kaggle tier badges
-                        badge_keywords = ['Host', 'Expert', 'Master', 'Grandmaster', 'Contributor', 'Novice']
-                        for badge_word in badge_keywords:
+                        for badge_word in BADGE_KEYWORDS:
                             if badge_word.lower() in text.lower() and len(text) < 30:  # Avoid long content
                                 if text not in badges:
                                     badges.append(text)
@@ -228,58 +549,13 @@ class KaggleDiscussionExtractor:
             # Get the element's outer HTML
             outer_html = await element.evaluate('el => el.outerHTML')
             
-            # Find the content container
-            content_match = re.search(r'<div[^>]*class="[^"]*(?:eTCgfj|jMpVQY)[^"]*"[^>]*>(.*?)</div>', outer_html, re.DOTALL)
-            
-            if content_match:
-                content_html = content_match.group(1)
-                
-                # Remove any nested comment divs
-                content_html = re.sub(r'<div[^>]*data-testid="discussions-comment"[^>]*>.*?</div>', '', content_html, flags=re.DOTALL)
-                
-                # Extract text from paragraphs
-                paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', content_html, re.DOTALL)
-                
-                if paragraphs:
-                    content_parts = []
-                    for p_content in paragraphs:
-                        # Clean HTML tags
-                        text = re.sub(r'<[^>]+>', '', p_content)
-                        text = text.strip()
-                        if text and len(text) > 10:
-                            content_parts.append(text)
-                    
-                    return '\n'.join(content_parts)
+            content = _content_from_html(outer_html)
+            if content is not None:
+                return content
             
             # Fallback: get all text and filter
             all_text = await element.text_content()
-            if all_text:
-                lines = all_text.split('\n')
-                content_lines = []
-                skip_next = False
-                
-                for line in lines:
-                    line = line.strip()
-                    
-                    # Skip metadata lines
-                    if any(skip in line.lower() for skip in [
-                        'posted', 'edited', 'reply', 'vote', 
-                        f'{author_username.lower()}',
-                        'in this competition', '·'
-                    ]):
-                        skip_next = True
-                        continue
-                    
-                    if skip_next:
-                        skip_next = False
-                        continue
-                    
-                    if len(line) > 20:
-                        content_lines.append(line)
-                
-                return '\n'.join(content_lines[:3])  # Limit to avoid capturing child content
-            
-            return ""
+            return _content_from_text(all_text, author_username)
             
         except Exception as e:
             if self.dev_mode:
@@ -288,16 +564,93 @@ class KaggleDiscussionExtractor:
 
     async def extract_hierarchical_replies(self, page: Page) -> List[Reply]:
         """Extract replies with proper hierarchical numbering and content separation"""
-        replies = []
+        try:
+            if self.batch_comments:
+                processed_comments = await self.extract_comment_tree(page)
+            else:
+                processed_comments = await self._extract_comments_per_element(page)
 
+            if self.dev_mode:
+                logger.debug(f"Processed {len(processed_comments)} valid comments")
+                # Debug: Show hierarchy detection results
+                for i, comment in enumerate(processed_comments):
+                    logger.debug(f"Comment {i}: depth={comment['depth']}, nested={comment['is_nested']}, indent={comment.get('visual_indent', 0)}, author={comment['author'].name}")
+
+            # Build hierarchical structure with proper numbering
+            return self._build_reply_hierarchy(processed_comments)
+
+        except Exception as e:
+            logger.error(f"Error extracting replies: {e}")
+            return []
+
+    async def extract_comment_tree(self, page: Page) -> List[Dict]:
+        """
+        Extract every comment of the loaded thread with a single page.evaluate call
+
+        Returns:
+            List of comment dicts (author, content, upvotes, timestamp, depth,
+            parent_idx, ...) in document order, ready for _build_reply_hierarchy
+        """
+        raw_comments = await page.evaluate(
+            _COMMENT_TREE_JS,
+            [COMMENT_SELECTOR, RANK_PATTERNS, BADGE_KEYWORDS, AUTHOR_SKIP_PATHS]
+        )
+
+        if self.dev_mode:
+            logger.debug(f"Found {len(raw_comments)} total comment elements")
+
+        return self._process_raw_comments(raw_comments)
+
+    def _process_raw_comments(self, raw_comments: List[Dict]) -> List[Dict]:
+        """Turn raw comment records from _COMMENT_TREE_JS into processed comment dicts"""
+        processed_comments = []
+
+        for i, raw in enumerate(raw_comments):
+            username = raw.get('username')
+            if not username:
+                continue
+
+            author = Author(
+                name=raw.get('displayName') or username,
+                username=username,
+                rank=_format_rank(raw['rankNumber']) if raw.get('rankNumber') is not None else None,
+                badges=raw.get('badges') or None,
+                profile_url=f"https://www.kaggle.com/{username}"
+            )
+
+            content = None
+            if raw.get('contentHtml') is not None:
+                content = _content_from_fragment(raw['contentHtml'])
+            if content is None:
+                content = _content_from_text(raw.get('text') or "", username)
+
+            if not content or len(content.strip()) < 5:
+                continue
+
+            processed_comments.append({
+                'author': author,
+                'content': content,
+                'upvotes': raw.get('upvotes') or 0,
+                'timestamp': raw.get('timestamp') or "",
+                'depth': raw.get('depth', 0),
+                'is_nested': raw.get('isNested', False),
+                'visual_indent': raw.get('visualIndent', 0),
+                'parent_idx': raw.get('parentIndex'),
+                'original_idx': i
+            })
+
+        return processed_comments
+
+    async def _extract_comments_per_element(self, page: Page) -> List[Dict]:
+        """Legacy comment extraction: several browser round trips per comment element"""
         try:
             # Get ALL comment elements
-            all_comments = await page.query_selector_all('div[data-testid="discussions-comment"]')
+            all_comments = await page.query_selector_all(COMMENT_SELECTOR)
 
             if not all_comments:
                 if self.dev_mode:
                     logger.debug("No comment elements found")
-                return replies
+                return []
 
             if self.dev_mode:
                 logger.debug(f"Found {len(all_comments)} total comment elements")
@@ -404,26 +757,29 @@ class KaggleDiscussionExtractor:
                         logger.warning(f"Error processing comment {i}: {e}")
                     continue
 
-            if self.dev_mode:
-                logger.debug(f"Processed {len(processed_comments)} valid comments")
-                # Debug: Show hierarchy detection results
-                for i, comment in enumerate(processed_comments):
-                    logger.debug(f"Comment {i}: depth={comment['depth']}, nested={comment['is_nested']}, indent={comment.get('visual_indent', 0)}, author={comment['author'].name}")
-
-            # Build hierarchical structure with proper numbering
-            return self._build_reply_hierarchy(processed_comments)
+            return processed_comments
 
         except Exception as e:
             logger.error(f"Error extracting replies: {e}")
             return []
 
     def _build_reply_hierarchy(self, processed_comments: List[Dict]) -> List[Reply]:
-        """Build proper hierarchical reply structure with correct numbering - FIXED VERSION"""
+        """
+        Build the reply tree and number it ("1", "1.1", "1.2", "2", ...)
+
+        Each comment goes under its parent comment from the DOM (parent_idx, the
+        original_idx of the enclosing comment). When there is no usable parent link
+        (no enclosing comment element, the parent was dropped as empty, or records
+        from the legacy extractor), the depth stack decides as before.
+        """
         if not processed_comments:
             return []
 
-        # Create reply objects
-        reply_objects = []
+        top_level_replies = []
+        kept: Dict[int, Reply] = {}  # original_idx -> reply
+        chains: Dict[int, List[Reply]] = {}  # id(reply) -> replies from its top-level ancestor down to it
+        reply_stack: List[Reply] = []  # chain of the previous reply, for the depth fallback
+
         for data in processed_comments:
             reply = Reply(
                 reply_number="",
@@ -433,63 +789,31 @@ class KaggleDiscussionExtractor:
                 timestamp=data['timestamp'],
                 depth=data['depth']
             )
-            reply_objects.append(reply)
 
-        # Build hierarchy using a stack-based approach with FIXED numbering
-        reply_stack = []  # Stack to track parent chain
-        top_level_replies = []
-        depth_counters = {}  # Track counters for each depth level
+            parent_idx = data.get('parent_idx')
+            parent = kept.get(parent_idx) if parent_idx is not None else None
+            if parent is None:
+                # Fallback: depth stack (a reply needs its parent at exactly one level up)
+                current_depth = data['depth']
+                del reply_stack[current_depth:]
+                if current_depth > 0 and len(reply_stack) == current_depth:
+                    parent = reply_stack[-1]
 
-        for i, reply in enumerate(reply_objects):
-            current_depth = processed_comments[i]['depth']
-
-            # Adjust stack to current depth
-            while len(reply_stack) > current_depth:
-                popped = reply_stack.pop()
-                # Reset deeper counters when going back up
-                for d in list(depth_counters.keys()):
-                    if d > len(reply_stack):
-                        del depth_counters[d]
-
-            if current_depth == 0:
-                # Top-level reply
+            if parent is None:
                 top_level_replies.append(reply)
-                reply_stack = [reply]
                 reply.reply_number = str(len(top_level_replies))
-                depth_counters[0] = len(top_level_replies)
-
+                chain = [reply]
             else:
-                # Nested reply
-                if reply_stack and len(reply_stack) >= current_depth:
-                    parent_reply = reply_stack[-1]
-
-                    # Add to parent's sub_replies
-                    parent_reply.sub_replies.append(reply)
-                    reply_stack.append(reply)
-
-                    # FIXED: Generate hierarchical number correctly
-                    number_parts = []
-
-                    # Build number from the stack path
-                    for depth_level in range(current_depth + 1):
-                        if depth_level == 0:
-                            # Top-level number
-                            number_parts.append(str(depth_counters.get(0, 1)))
-                        else:
-                            # Count position in parent's sub_replies
-                            if depth_level <= len(reply_stack) - 1:
-                                parent_at_level = reply_stack[depth_level - 1]
-                                position = len(parent_at_level.sub_replies)
-                                number_parts.append(str(position))
-
-                    reply.reply_number = ".".join(number_parts)
+                parent.sub_replies.append(reply)
+                reply.reply_number = f"{parent.reply_number}.{len(parent.sub_replies)}"
+                chain = chains[id(parent)] + [reply]
 
-                else:
-                    # Fallback: treat as top-level if stack is inconsistent
-                    top_level_replies.append(reply)
-                    reply_stack = [reply]
-                    reply.reply_number = str(len(top_level_replies))
-                    depth_counters[0] = len(top_level_replies)
+            # Depth follows the tree, whatever indentation the page showed
+            reply.depth = len(chain) - 1
+            chains[id(reply)] = chain
+            reply_stack = list(chain)
+            if data.get('original_idx') is not None:
+                kept[data['original_idx']] = reply
 
         if self.dev_mode:
             total_nested = sum(self._count_all_replies([r]) - 1 for r in top_level_replies)
@@ -497,18 +821,162 @@ class KaggleDiscussionExtractor:
 
         return top_level_replies
 
+    @staticmethod
+    def _writeup_target_placement(title: str) -> Optional[List[str]]:
+        """Placement words a writeup title refers to (e.g. ["2nd", "second"])"""
+        if "1st" in title.lower() or "first" in title.lower():
+            return ["1st", "first"]
+        elif "2nd" in title.lower() or "second" in title.lower():
+            return ["2nd", "second"]
+        elif "3rd" in title.lower() or "third" in title.lower():
+            return ["3rd", "third"]
+        return None
+
+    def _resolve_writeup_author(self, title: str, comment_authors: List[Author],
+                                main_author: Author, main_content: str) -> Tuple[Author, str]:
+        """
+        INNOVATIVE Multi-User Writeup Author Detection System
+
+        Picks the writeup author (or a composite team author) from the authors of the
+        thread's comments, based on the placement mentioned in the title.
+
+        Returns:
+            Tuple of (main author, main content with team composition prepended)
+        """
+        # Advanced multi-author detection for team writeups
+        target_placement = self._writeup_target_placement(title)
+
+        if self.dev_mode:
+            logger.debug(f"INNOVATIVE: Multi-user writeup detection for placement: {target_placement}")
+
+        # STEP 1: Collect all potential team members with target ranking
+        team_candidates = []
+        all_authors = []
+
+        if target_placement:
+            for author in comment_authors:
+                if author.name != "Unknown":
+                    all_authors.append(author)
+
+                    if author.rank:
+                        # Check for exact placement match
+                        for placement in target_placement:
+                            exact_pattern = f"{placement} in this competition"
+                            if exact_pattern in author.rank.lower():
+                                team_candidates.append(author)
+                                if self.dev_mode:
+                                    logger.debug(f"TEAM MEMBER: {author.name} ({author.rank})")
+                                break
+
+        # STEP 2: Multi-author writeup handling
+        if len(team_candidates) > 1:
+            # Multiple team members found - create composite author
+            primary_author = team_candidates[0]  # Use first found as primary
+            team_names = [author.name for author in team_candidates]
+            team_ranks = [author.rank for author in team_candidates if author.rank]
+
+            # Create composite author representation
+            composite_name = " & ".join(team_names[:3])  # Show up to 3 names
+            if len(team_names) > 3:
+                composite_name += f" + {len(team_names) - 3} others"
+
+            primary_author.name = composite_name
+            primary_author.rank = f"Team: {', '.join(team_ranks[:2])}" if len(team_ranks) > 1 else team_ranks[0] if team_ranks else None
+
+            main_author = primary_author
+
+            if self.dev_mode:
+                logger.debug(f"MULTI-USER WRITEUP: {composite_name}")
+
+        elif len(team_candidates) == 1:
+            # Single author with exact match
+            main_author = team_candidates[0]
+            if self.dev_mode:
+                logger.debug(f"SINGLE AUTHOR: {main_author.name} ({main_author.rank})")
+
+        # STEP 3: Fallback strategies for complex cases
+        if main_author.name == "Unknown" and all_authors:
+            # Strategy A: Look for authors with target placement in broader context
+            for author in all_authors:
+                if author.rank and target_placement:
+                    for placement in target_placement:
+                        if placement in author.rank.lower():
+                            main_author = author
+                            if self.dev_mode:
+                                logger.debug(f"FALLBACK A: {author.name} ({author.rank})")
+                            break
+                    if main_author.name != "Unknown":
+                        break
+
+            # Strategy B: Use highest-ranked person as proxy
+            if main_author.name == "Unknown":
+                best_author = None
+                best_rank_num = float('inf')
+
+                for author in all_authors:
+                    if author.rank:
+                        rank_match = re.search(r'(\d+)(?:st|nd|rd|th)', author.rank)
+                        if rank_match:
+                            rank_num = int(rank_match.group(1))
+                            if rank_num < best_rank_num:
+                                best_rank_num = rank_num
+                                best_author = author
+
+                if best_author:
+                    main_author = best_author
+                    if self.dev_mode:
+                        logger.debug(f"FALLBACK B: Highest ranked {best_author.name} ({best_author.rank})")
+
+        # STEP 4: Multi-author content attribution
+        if main_author.name != "Unknown" and len(team_candidates) > 1:
+            # Add team composition to content for transparency
+            team_info = f"\n\n**Team Composition:**\n"
+            for i, member in enumerate(team_candidates, 1):
+                team_info += f"- {member.name} ({member.rank})\n"
+
+            if main_content:
+                main_content = team_info + "\n" + main_content
+            else:
+                main_content = team_info
+
+        return main_author, main_content
+
+    async def _load_discussion_page(self, page: Page, url: str):
+        """Navigate to a discussion or writeup and wait until it is ready"""
+        is_writeup = '/writeups/' in url
+
+        if self.dev_mode:
+            content_type = "writeup" if is_writeup else "discussion"
+            logger.debug(f"Loading {content_type}: {url.split('/')[-1]}")
+
+        # An error page must fail the fetch, not be parsed; 429/5xx are retried, other 4xx are final
+        await self.rate_limiter.goto(page, url, raise_for_status=True, wait_until="domcontentloaded", timeout=30000)
+        await self.readiness.wait(page, 'writeup' if is_writeup else 'discussion', url)
+
+    async def fetch_page_html(self, page: Page, url: str) -> str:
+        """Load a discussion or writeup and return the rendered HTML (offline parse mode)"""
+        await self._load_discussion_page(page, url)
+        return await page.content()
+
+    async def fetch_discussion(self, page: Page, url: str) -> Optional[Discussion]:
+        """Load and extract a discussion or writeup (live DOM); navigation errors are raised"""
+        await self._load_discussion_page(page, url)
+        return await self.extract_loaded_discussion(page, url)
+
     async def extract_single_discussion(self, page: Page, url: str) -> Optional[Discussion]:
         """Extract a single discussion or writeup with all replies"""
         try:
-            # Detect if this is a writeup URL
-            is_writeup = '/writeups/' in url
+            return await self.fetch_discussion(page, url)
 
-            if self.dev_mode:
-                content_type = "writeup" if is_writeup else "discussion"
-                logger.debug(f"Loading {content_type}: {url.split('/')[-1]}")
+        except Exception as e:
+            logger.error(f"Error extracting discussion: {e}")
+            return None
 
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(5)  # Give writeups more time to load
+    async def extract_loaded_discussion(self, page: Page, url: str) -> Optional[Discussion]:
+        """Extract a discussion or writeup from a page that already shows it (live DOM)"""
+        try:
+            # Detect if this is a writeup URL
+            is_writeup = '/writeups/' in url
             
             # Get title with improved extraction for both discussions and writeups
             title = "Unknown Title"
@@ -647,168 +1115,20 @@ class KaggleDiscussionExtractor:
 
                 # INNOVATIVE Multi-User Writeup Author Detection System
                 if main_author.name == "Unknown":
-                    # Advanced multi-author detection for team writeups
-                    target_placement = None
-                    if "1st" in title.lower() or "first" in title.lower():
-                        target_placement = ["1st", "first"]
-                    elif "2nd" in title.lower() or "second" in title.lower():
-                        target_placement = ["2nd", "second"]
-                    elif "3rd" in title.lower() or "third" in title.lower():
-                        target_placement = ["3rd", "third"]
-
-                    if self.dev_mode:
-                        logger.debug(f"INNOVATIVE: Multi-user writeup detection for placement: {target_placement}")
-
-                    comment_elements = await page.query_selector_all('div[data-testid="discussions-comment"]')
+                    comment_authors = []
+                    if self._writeup_target_placement(title):
+                        for comment in await page.query_selector_all(COMMENT_SELECTOR):
+                            comment_authors.append(await self.extract_author_info(comment))
 
-                    # STEP 1: Collect all potential team members with target ranking
-                    team_candidates = []
-                    all_authors = []
-
-                    if comment_elements and target_placement:
-                        for comment in comment_elements:
-                            author = await self.extract_author_info(comment)
-                            if author.name != "Unknown":
-                                all_authors.append(author)
-
-                                if author.rank:
-                                    # Check for exact placement match
-                                    for placement in target_placement:
-                                        exact_pattern = f"{placement} in this competition"
-                                        if exact_pattern in author.rank.lower():
-                                            team_candidates.append(author)
-                                            if self.dev_mode:
-                                                logger.debug(f"TEAM MEMBER: {author.name} ({author.rank})")
-                                            break
-
-                    # STEP 2: Multi-author writeup handling
-                    if len(team_candidates) > 1:
-                        # Multiple team members found - create composite author
-                        primary_author = team_candidates[0]  # Use first found as primary
-                        team_names = [author.name for author in team_candidates]
-                        team_ranks = [author.rank for author in team_candidates if author.rank]
-
-                        # Create composite author representation
-                        composite_name = " & ".join(team_names[:3])  # Show up to 3 names
-                        if len(team_names) > 3:
-                            composite_name += f" + {len(team_names) - 3} others"
-
-                        primary_author.name = composite_name
-                        primary_author.rank = f"Team: {', '.join(team_ranks[:2])}" if len(team_ranks) > 1 else team_ranks[0] if team_ranks else None
-
-                        main_author = primary_author
-
-                        if self.dev_mode:
-                            logger.debug(f"MULTI-USER WRITEUP: {composite_name}")
-
-                    elif len(team_candidates) == 1:
-                        # Single author with exact match
-                        main_author = team_candidates[0]
-                        if self.dev_mode:
-                            logger.debug(f"SINGLE AUTHOR: {main_author.name} ({main_author.rank})")
-
-                    # STEP 3: Fallback strategies for complex cases
-                    if main_author.name == "Unknown" and all_authors:
-                        # Strategy A: Look for authors with target placement in broader context
-                        for author in all_authors:
-                            if author.rank and target_placement:
-                                for placement in target_placement:
-                                    if placement in author.rank.lower():
-                                        main_author = author
-                                        if self.dev_mode:
-                                            logger.debug(f"FALLBACK A: {author.name} ({author.rank})")
-                                        break
-                                if main_author.name != "Unknown":
-                                    break
-
-                        # Strategy B: Use highest-ranked person as proxy
-                        if main_author.name == "Unknown":
-                            best_author = None
-                            best_rank_num = float('inf')
-
-                            for author in all_authors:
-                                if author.rank:
-                                    rank_match = re.search(r'(\d+)(?:st|nd|rd|th)', author.rank)
-                                    if rank_match:
-                                        rank_num = int(rank_match.group(1))
-                                        if rank_num < best_rank_num:
-                                            best_rank_num = rank_num
-                                            best_author = author
-
-                            if best_author:
-                                main_author = best_author
-                                if self.dev_mode:
-                                    logger.debug(f"FALLBACK B: Highest ranked {best_author.name} ({best_author.rank})")
-
-                    # STEP 4: Multi-author content attribution
-                    if main_author.name != "Unknown" and len(team_candidates) > 1:
-                        # Add team composition to content for transparency
-                        team_info = f"\n\n**Team Composition:**\n"
-                        for i, member in enumerate(team_candidates, 1):
-                            team_info += f"- {member.name} ({member.rank})\n"
-
-                        if main_content:
-                            main_content = team_info + "\n" + main_content
-                        else:
-                            main_content = team_info
+                    main_author, main_content = self._resolve_writeup_author(
+                        title, comment_authors, main_author, main_content
+                    )
 
                 # Enhanced content extraction for writeups
                 if not main_content:
                     # Look for writeup content more systematically
                     all_text = await page.evaluate('document.body.textContent')
-                    if all_text and len(all_text.strip()) > 100:
-                        # Find the main writeup content by looking for the start pattern
-                        # From our debug, writeups start with "First, thanks to the organizers..."
-
-                        # Clean the text
-                        clean_text = re.sub(r'[^\x00-\x7F]+', ' ', all_text)  # Remove non-ASCII
-                        lines = clean_text.split('\n')
-
-                        # Find where the actual writeup content starts
-                        content_start_idx = None
-                        content_lines = []
-
-                        for i, line in enumerate(lines):
-                            line = line.strip()
-
-                            # Look for writeup start indicators
-                            if any(start_phrase in line.lower() for start_phrase in [
-                                'first, thanks to the organizers',
-                                'overview',
-                                'if you watched the leaderboard',
-                                'thanks to the organizers'
-                            ]):
-                                content_start_idx = i
-                                break
-
-                        # If we found the start, extract from there
-                        if content_start_idx is not None:
-                            for line in lines[content_start_idx:]:
-                                line = line.strip()
-                                if len(line) > 10 and not any(skip in line.lower() for skip in [
-                                    'kaggle', 'navigation', 'menu', 'search', 'sign in', 'register',
-                                    'skip to content', 'home', 'competitions', 'datasets', 'models'
-                                ]):
-                                    content_lines.append(line)
-
-                                # Stop when we reach the comments section
-                                if 'comments' in line.lower() or 'discussion' in line.lower():
-                                    if len(content_lines) > 10:  # Only stop if we have substantial content
-                                        break
-
-                        else:
-                            # Fallback: extract meaningful content from anywhere
-                            for line in lines:
-                                line = line.strip()
-                                if len(line) > 20 and not any(skip in line.lower() for skip in [
-                                    'kaggle', 'navigation', 'menu', 'search', 'sign in', 'register',
-                                    'skip to content', 'home', 'competitions', 'datasets', 'models'
-                                ]):
-                                    content_lines.append(line)
-
-                        if content_lines:
-                            # Take substantial amount of content for writeups
-                            main_content = '\n'.join(content_lines[:50])  # More content for writeups
+                    main_content = _writeup_content_from_text(all_text)
 
             else:
                 # Discussion-specific content extraction
@@ -931,104 +1251,161 @@ class KaggleDiscussionExtractor:
         if self.dev_mode:
             logger.debug(f"Saved: {output_file.name}")
 
-    async def extract_competition_writeups(self, competition_url: str, limit: Optional[int] = None) -> bool:
+    @staticmethod
+    def _discussion_id(url: str) -> str:
+        """Stable identifier of a discussion/writeup taken from its URL (e.g. '123456')"""
+        path = url.split('#')[0].split('?')[0].rstrip('/')
+        return path.split('/')[-1] or "unknown"
+
+    def _discussion_filename(self, discussion: Discussion) -> str:
+        """Deterministic markdown filename keyed by discussion ID"""
+        # Create a clean filename with the discussion title
+        safe_title = re.sub(r'[<>:"/\\|?*]', '_', discussion.title)
+        # Limit filename length but keep meaningful parts
+        if len(safe_title) > 100:
+            safe_title = safe_title[:97] + "..."
+        return f"{self._discussion_id(discussion.url)}_{safe_title}.md"
+
+    def _create_parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Process pool for offline parsing, if configured"""
+        if self.parse_mode == "offline" and self.parse_workers > 0:
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        return None
+
+    async def parse_discussion_html(self, html: str, url: str,
+                                    executor: Optional[ProcessPoolExecutor] = None) -> Optional[Discussion]:
         """
-        Extract all writeups from a Kaggle competition
+        Parse rendered discussion HTML off the event loop (offline parse mode)
 
         Args:
-            competition_url: Full URL to the Kaggle competition
-            limit: Number of writeups to extract (None = all)
-
-        Returns:
-            bool: Success status
+            html: Output of fetch_page_html()
+            url: Discussion or writeup URL
+            executor: Process pool to parse in (default: a worker thread)
         """
-        logger.info(f"Starting writeup extraction for: {competition_url}")
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
-
-            try:
-                # Load competition page
-                await page.goto(competition_url, wait_until="domcontentloaded")
-                await asyncio.sleep(3)
-
-                writeups_url = f"{competition_url}/writeups"
-                await page.goto(writeups_url, wait_until="domcontentloaded")
-                await asyncio.sleep(5)
-
-                # Get writeup links
-                writeup_links = []
-
-                # Look for writeup links
-                all_links = await page.query_selector_all('a[href*="/writeups/"]')
-
-                for link in all_links:
-                    href = await link.get_attribute('href')
-                    if href and '/writeups/' in href:
-                        full_url = f"https://www.kaggle.com{href}" if href.startswith('/') else href
-                        base_url = full_url.split('#')[0]
-                        if not base_url.endswith('/writeups') and base_url not in writeup_links:
-                            writeup_links.append(base_url)
-
-                if not writeup_links:
-                    logger.error("No writeup links found!")
-                    return False
-
-                logger.info(f"Found {len(writeup_links)} writeups")
-
-                # Apply limit if specified
-                extract_count = min(limit, len(writeup_links)) if limit else len(writeup_links)
-                logger.info(f"Extracting {extract_count} writeups")
-
-                # Create output directory
-                output_dir = Path("kaggle_writeups_extracted")
-                if output_dir.exists():
-                    import shutil
-                    shutil.rmtree(output_dir)
-                output_dir.mkdir(exist_ok=True)
-
-                successful_extractions = 0
-                for i, url in enumerate(writeup_links[:extract_count], 1):
-                    logger.info(f"[{i}/{extract_count}] Processing writeup...")
+        from .html_parser import OfflineDiscussionParser, parse_discussion_html
 
-                    try:
-                        writeup = await self.extract_single_discussion(page, url)  # Reuse discussion method
+        loop = asyncio.get_running_loop()
+        try:
+            if executor is not None:
+                return await loop.run_in_executor(executor, parse_discussion_html, html, url)
 
-                        if writeup:
-                            # Create a clean filename with the writeup title
-                            safe_title = re.sub(r'[<>:"/\\|?*]', '_', writeup.title)
-                            # Limit filename length but keep meaningful parts
-                            if len(safe_title) > 100:
-                                safe_title = safe_title[:97] + "..."
-                            md_file = output_dir / f"{i:02d}_{safe_title}.md"
+            parser = OfflineDiscussionParser(extractor=self, dev_mode=self.dev_mode)
+            return await loop.run_in_executor(None, parser.parse, html, url)
 
-                            self.save_discussion_markdown(writeup, md_file)
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing discussion HTML: {e}")
+            return None
 
-                            successful_extractions += 1
+    async def _extract_competition(self, competition_url: str, limit: Optional[int], content_type: str,
+                                   output_dir: Optional[Path] = None, pool: Optional[BrowserPool] = None,
+                                   scheduler: Optional[FairScheduler] = None,
+                                   parse_executor: Optional[ProcessPoolExecutor] = None) -> bool:
+        """
+        Discover and extract every discussion or writeup of a competition
 
-                            nested = sum(len(r.sub_replies) for r in writeup.replies)
-                            if nested > 0:
-                                logger.info(f"   Stats: {len(writeup.replies)} top-level, {nested} nested replies")
-                            else:
-                                logger.info(f"   Stats: {writeup.total_replies} replies total")
+        Args:
+            competition_url: Full URL to the Kaggle competition
+            limit: Number of items to extract (None = all)
+            content_type: "discussion" or "writeup" (see CONTENT_TYPES)
+            output_dir: Output directory (default: the content type's directory)
+            pool: Browser pool to use instead of self.browser_pool / a temporary one
+            scheduler: Fair scheduler shared with other competitions (batch mode)
+            parse_executor: Offline parse process pool shared with other competitions
 
-                            await asyncio.sleep(2)
+        Returns:
+            bool: Success status
+        """
+        settings = CONTENT_TYPES[content_type]
+
+        # Create output directory (incremental and resumed runs keep and update it)
+        output_dir = output_dir or Path(settings['output_dir'])
+        if output_dir.exists() and not (self.incremental or self.resume):
+            import shutil
+            shutil.rmtree(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Only incremental runs skip unchanged threads; --resume alone re-extracts whatever is left
+        manifest = None
+        if self.incremental:
+            manifest = ExtractionManifest(output_dir, competition_url, dev_mode=self.dev_mode).load()
+
+        checkpoint = CrawlCheckpoint(output_dir, competition_url, content_type, dev_mode=self.dev_mode)
+        dead_letters = DeadLetterQueue(
+            output_dir / f"failed_{content_type}s_{ExtractionManifest.competition_slug(competition_url)}.json"
+        ).load()
+        if self.resume:
+            checkpoint.load()
+            if checkpoint.has_progress:
+                logger.info(f"Resuming: {len(checkpoint.completed)}/{len(checkpoint.links)} {content_type}s already done, "
+                            f"{len(checkpoint.failures)} failed ones will be retried")
+
+        async with browser_session(pool or self.browser_pool, self.headless, self.dev_mode, self.concurrency,
+                                   self.resource_policy, self.record_har, self.replay_har) as pool:
+            blocking_snapshot = pool.resource_policy.stats.copy() if pool.resource_policy else None
+            logger.info(f"Extracting {limit or 'all'} {content_type}s (concurrency={self.concurrency})")
+
+            if checkpoint.discovery_complete:
+                # The interrupted run already listed everything
+                links = checkpoint.entries()
+            else:
+                # Links stream into extraction while later listing pages are still loading
+                discovery = ListingDiscovery(pool, self.readiness, concurrency=self.concurrency,
+                                             rate_limiter=self.rate_limiter, dev_mode=self.dev_mode)
+                links = discovery.discover_entries(
+                    f"{competition_url.rstrip('/')}/{settings['listing']}", settings['link_fragment'], limit=limit,
+                    page_type=settings['page_type'], paginate=settings['paginate']
+                )
+
+            pipeline = ExtractionPipeline(self, pool, output_dir, content_type=content_type,
+                                          manifest=manifest, checkpoint=checkpoint, dead_letters=dead_letters,
+                                          scheduler=scheduler, tenant=ExtractionManifest.competition_slug(competition_url),
+                                          parse_executor=parse_executor)
+            successful_extractions = await pipeline.run(links)
+
+            pipeline.log_stats()
+            if scheduler is None:
+                # In batch mode these are shared; extract_multiple_competitions() logs their totals once
+                self.readiness.log_summary()
+                self.rate_limiter.log_summary()
+            if pool.resource_policy:
+                pool.resource_policy.log_summary(since=blocking_snapshot)
+
+            if len(dead_letters):
+                logger.warning(f"{len(dead_letters)} {content_type}s failed after retries, see {dead_letters.path}")
+
+            if pipeline.interrupted:
+                logger.warning(f"Stopped early after {successful_extractions} {content_type}s; "
+                               f"rerun with resume=True (--resume) to continue")
+                return False
+
+            if pipeline.discovered == 0:
+                logger.error(f"No {content_type} links found!")
+                return False
+
+            if successful_extractions > 0 or pipeline.skipped > 0 or pipeline.resumed > 0:
+                logger.info(f"SUCCESS: Extracted {successful_extractions}/{pipeline.discovered} {content_type}s"
+                            f" ({pipeline.written} written, {pipeline.unchanged + pipeline.skipped} unchanged,"
+                            f" {pipeline.resumed} from the previous run)")
+                logger.info(f"Output saved in: {output_dir.absolute()}")
+                return True
+            else:
+                logger.error(f"No {content_type}s successfully extracted!")
+                return False
 
-                    except Exception as e:
-                        logger.error(f"   Error: {e}")
-                        continue
+    async def extract_competition_writeups(self, competition_url: str, limit: Optional[int] = None) -> bool:
+        """
+        Extract all writeups from a Kaggle competition
 
-                if successful_extractions > 0:
-                    logger.info(f"SUCCESS: Extracted {successful_extractions}/{extract_count} writeups")
-                    logger.info(f"Output saved in: {output_dir.absolute()}")
-                    return True
-                else:
-                    logger.error("No writeups successfully extracted!")
-                    return False
+        Args:
+            competition_url: Full URL to the Kaggle competition
+            limit: Number of writeups to extract (None = all)
 
-            finally:
-                await browser.close()
+        Returns:
+            bool: Success status
+        """
+        logger.info(f"Starting writeup extraction for: {competition_url}")
+        return await self._extract_competition(competition_url, limit, "writeup")
 
     async def extract_competition_discussions(self, competition_url: str, limit: Optional[int] = None) -> bool:
         """
@@ -1042,124 +1419,63 @@ class KaggleDiscussionExtractor:
             bool: Success status
         """
         logger.info(f"Starting extraction for: {competition_url}")
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
-            
-            try:
-                # Load competition page
-                await page.goto(competition_url, wait_until="domcontentloaded")
-                await asyncio.sleep(3)
-                
-                discussions_url = f"{competition_url}/discussion"
-                await page.goto(discussions_url, wait_until="domcontentloaded")
-                await asyncio.sleep(5)
-                
-                # Get discussion links from all pages
-                discussion_links = []
-                page_num = 1
-                
-                while True:
-                    page_url = f"{discussions_url}?page={page_num}" if page_num > 1 else discussions_url
-                    if self.dev_mode:
-                        logger.debug(f"Loading page {page_num}: {page_url}")
-                    
-                    await page.goto(page_url, wait_until="domcontentloaded")
-                    await asyncio.sleep(3)
-                    
-                    # Get discussion links from current page
-                    all_links = await page.query_selector_all('a[href*="/discussion/"]')
-                    page_links = []
-                    
-                    for link in all_links:
-                        href = await link.get_attribute('href')
-                        if href and '/discussion/' in href:
-                            full_url = f"https://www.kaggle.com{href}" if href.startswith('/') else href
-                            base_url = full_url.split('#')[0]
-                            if not base_url.endswith('/discussion') and base_url not in discussion_links:
-                                page_links.append(base_url)
-                                discussion_links.append(base_url)
-                    
-                    if self.dev_mode:
-                        logger.debug(f"Page {page_num}: Found {len(page_links)} discussions")
-                    
-                    # Check if there's a next page
-                    next_button = await page.query_selector('button[aria-label="Go to next page"], a[aria-label="Go to next page"], [data-testid="pagination-next"]')
-                    
-                    is_disabled = False
-                    if next_button:
-                        is_disabled = await next_button.evaluate('el => el.disabled || el.classList.contains("disabled")')
-                    
-                    if not next_button or is_disabled or len(page_links) == 0:
-                        if self.dev_mode:
-                            logger.debug(f"Reached last page (page {page_num})")
-                        break
-                    
-                    page_num += 1
-                    
-                    # Safety limit
-                    if page_num > 50:
-                        logger.warning("Reached maximum page limit (50)")
-                        break
-                
-                discussion_links = list(dict.fromkeys(discussion_links))
-                
-                if not discussion_links:
-                    logger.error("No discussion links found!")
-                    return False
-                
-                logger.info(f"Found {len(discussion_links)} unique discussions")
-                
-                # Apply limit if specified
-                extract_count = min(limit, len(discussion_links)) if limit else len(discussion_links)
-                logger.info(f"Extracting {extract_count} discussions")
-                
-                # Create output directory
-                output_dir = Path("kaggle_discussions_extracted")
-                if output_dir.exists():
-                    import shutil
-                    shutil.rmtree(output_dir)
-                output_dir.mkdir(exist_ok=True)
-                
-                successful_extractions = 0
-                for i, url in enumerate(discussion_links[:extract_count], 1):
-                    logger.info(f"[{i}/{extract_count}] Processing discussion...")
-                    
-                    try:
-                        discussion = await self.extract_single_discussion(page, url)
-                        
-                        if discussion:
-                            # Create a clean filename with the discussion title
-                            safe_title = re.sub(r'[<>:"/\\|?*]', '_', discussion.title)
-                            # Limit filename length but keep meaningful parts
-                            if len(safe_title) > 100:
-                                safe_title = safe_title[:97] + "..."
-                            md_file = output_dir / f"{i:02d}_{safe_title}.md"
-
-                            self.save_discussion_markdown(discussion, md_file)
-                            
-                            successful_extractions += 1
-                            
-                            nested = sum(len(r.sub_replies) for r in discussion.replies)
-                            if nested > 0:
-                                logger.info(f"   Stats: {len(discussion.replies)} top-level, {nested} nested replies")
-                            else:
-                                logger.info(f"   Stats: {discussion.total_replies} replies total")
-                            
-                            await asyncio.sleep(2)
-                        
-                    except Exception as e:
-                        logger.error(f"   Error: {e}")
-                        continue
-                
-                if successful_extractions > 0:
-                    logger.info(f"SUCCESS: Extracted {successful_extractions}/{extract_count} discussions")
-                    logger.info(f"Output saved in: {output_dir.absolute()}")
-                    return True
-                else:
-                    logger.error("No discussions successfully extracted!")
+        return await self._extract_competition(competition_url, limit, "discussion")
+
+    async def extract_multiple_competitions(self, competition_urls: List[str], limit: Optional[int] = None,
+                                            content_type: str = "discussion") -> Dict[str, bool]:
+        """
+        Extract several competitions in one process
+
+        All competitions run at the same time on one browser pool and rate limiter.
+        Page slots are handed out round-robin between competitions (FairScheduler),
+        so a competition with thousands of threads cannot starve the small ones.
+        Output goes to one subdirectory per competition, e.g.
+        kaggle_discussions_extracted/<competition>/.
+
+        Args:
+            competition_urls: Full URLs of the Kaggle competitions
+            limit: Number of items to extract per competition (None = all)
+            content_type: "discussion" or "writeup"
+
+        Returns:
+            Dict mapping each competition URL to its success status
+        """
+        if content_type not in CONTENT_TYPES:
+            raise ValueError(f"Unknown content_type: {content_type} (expected one of {', '.join(CONTENT_TYPES)})")
+
+        # Same competition listed twice would write the same files concurrently
+        urls = list(dict.fromkeys(url.rstrip('/') for url in competition_urls))
+        base_dir = Path(CONTENT_TYPES[content_type]['output_dir'])
+        logger.info(f"Starting batch extraction of {len(urls)} competitions (concurrency={self.concurrency})")
+
+        async with browser_session(self.browser_pool, self.headless, self.dev_mode, self.concurrency,
+                                   self.resource_policy, self.record_har, self.replay_har) as pool:
+            scheduler = FairScheduler(pool.max_pages, dev_mode=self.dev_mode)
+            parse_executor = self._create_parse_executor()
+
+            async def run_one(url: str) -> bool:
+                slug = ExtractionManifest.competition_slug(url)
+                try:
+                    return await self._extract_competition(url, limit, content_type, output_dir=base_dir / slug,
+                                                           pool=pool, scheduler=scheduler,
+                                                           parse_executor=parse_executor)
+                except Exception as e:
+                    logger.error(f"Error extracting {url}: {e}")
                     return False
-                    
+
+            try:
+                results = await asyncio.gather(*(run_one(url) for url in urls))
             finally:
-                await browser.close()
\ No newline at end of file
+                if parse_executor is not None:
+                    parse_executor.shutdown(wait=False)
+
+            scheduler.log_summary()
+            self.readiness.log_summary()
+            self.rate_limiter.log_summary()
+
+        summary = dict(zip(urls, results))
+        logger.info(f"Batch finished: {sum(results)}/{len(urls)} competitions succeeded")
+        for url, success in summary.items():
+            if not success:
+                logger.warning(f"   Failed: {url}")
+        return summary
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Listing Discovery
+Finds discussion and writeup links by loading listing pages concurrently
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from .browser_pool import BrowserPool
+from .readiness import ReadinessEngine
+from .rate_limiter import RateLimiter
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+NEXT_PAGE_SELECTOR = 'button[aria-label="Go to next page"], a[aria-label="Go to next page"], [data-testid="pagination-next"]'
+
+# Collects every matching href (with the comment count and last-activity time shown in its
+# listing row) and the state of the "next page" control in one round trip. Last activity is
+# taken from an absolute timestamp (<time datetime> or a title tooltip), never from relative
+# text like "2 days ago", which changes without any activity.
+_LISTING_JS = '''
+    ([linkSelector, nextSelector]) => {
+        const items = Array.from(document.querySelectorAll(linkSelector)).map(a => {
+            const row = a.closest('li, [role="listitem"]') || a.parentElement;
+            const match = row ? (row.innerText || '').match(/(\\d[\\d,]*)\\s+(?:comments?|replies|reply)/i) : null;
+            let activity = null;
+            for (const el of row ? row.querySelectorAll('time[datetime], [title]') : []) {
+                const value = el.getAttribute('datetime') || el.getAttribute('title');
+                if (value && /\\d/.test(value) && !isNaN(Date.parse(value))) {
+                    activity = value;
+                    break;
+                }
+            }
+            return {
+                href: a.getAttribute('href'),
+                comments: match ? parseInt(match[1].replace(/,/g, ''), 10) : null,
+                activity: activity
+            };
+        });
+        const next = document.querySelector(nextSelector);
+        const hasNext = !!next && !(next.disabled || next.classList.contains('disabled'));
+        return { items: items, hasNext: hasNext };
+    }
+'''
+
+
+@dataclass
+class ListingEntry:
+    """An item link plus the metadata visible on the listing page"""
+    url: str
+    comment_count: Optional[int] = None
+    last_activity: Optional[str] = None
+
+
+class ListingDiscovery:
+    """
+    Limit-aware discovery of links from paginated listing pages.
+
+    Page 1 is loaded first to learn the page size; further pages are then loaded
+    concurrently (never more than are needed to reach the limit) and their links
+    are yielded in page order. Discovery stops at the first page that has no next
+    page or no new links, or as soon as the limit is reached.
+    """
+
+    def __init__(self, pool: BrowserPool, readiness: ReadinessEngine, concurrency: int = 4,
+                 max_pages: Optional[int] = None, rate_limiter: Optional[RateLimiter] = None,
+                 dev_mode: bool = False):
+        """
+        Initialize discovery
+
+        Args:
+            pool: Browser pool to borrow listing pages from
+            readiness: Readiness engine used after each listing navigation
+            concurrency: Maximum number of listing pages loaded at the same time
+            max_pages: Optional safety cap on listing pages (default: no cap)
+            rate_limiter: Limiter listing navigations go through (default: none)
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.pool = pool
+        self.readiness = readiness
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.rate_limiter = rate_limiter
+        self.dev_mode = dev_mode
+
+    @staticmethod
+    def page_url(listing_url: str, page_num: int) -> str:
+        return f"{listing_url}?page={page_num}" if page_num > 1 else listing_url
+
+    @staticmethod
+    def normalize_link(href: Optional[str], link_fragment: str) -> Optional[str]:
+        """Absolute link without fragment, or None if href is not an item link"""
+        if not href or link_fragment not in href:
+            return None
+        full_url = f"https://www.kaggle.com{href}" if href.startswith('/') else href
+        base_url = full_url.split('#')[0]
+        if base_url.endswith(link_fragment.rstrip('/')):
+            return None
+        return base_url
+
+    async def _fetch_listing_page(self, url: str, link_fragment: str, page_type: str) -> Tuple[List[ListingEntry], bool]:
+        """Load one listing page and return (item entries in page order, has next page)"""
+        async with self.pool.page() as page:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.goto(page, url, wait_until="domcontentloaded")
+            else:
+                await page.goto(url, wait_until="domcontentloaded")
+            await self.readiness.wait(page, page_type)
+            result = await page.evaluate(_LISTING_JS, [f'a[href*="{link_fragment}"]', NEXT_PAGE_SELECTOR])
+
+        entries = []
+        for item in result['items']:
+            link = self.normalize_link(item['href'], link_fragment)
+            if link:
+                entries.append(ListingEntry(url=link, comment_count=item['comments'],
+                                            last_activity=item.get('activity')))
+        return entries, result['hasNext']
+
+    async def discover(self, listing_url: str, link_fragment: str = '/discussion/',
+                       limit: Optional[int] = None, page_type: str = 'discussion_listing',
+                       paginate: bool = True) -> AsyncIterator[str]:
+        """Yield unique item links in listing order (see discover_entries())"""
+        async for entry in self.discover_entries(listing_url, link_fragment, limit, page_type, paginate):
+            yield entry.url
+
+    async def discover_entries(self, listing_url: str, link_fragment: str = '/discussion/',
+                               limit: Optional[int] = None, page_type: str = 'discussion_listing',
+                               paginate: bool = True) -> AsyncIterator[ListingEntry]:
+        """
+        Yield unique item entries in listing order
+
+        Args:
+            listing_url: First listing page (e.g. .../competitions/x/discussion)
+            link_fragment: Substring identifying item links ('/discussion/' or '/writeups/')
+            limit: Stop after this many unique links (None = all)
+            page_type: Readiness predicate for listing pages
+            paginate: Follow ?page=N pagination
+        """
+        seen: Set[str] = set()
+        found = 0
+
+        def new_links(entries: List[ListingEntry]) -> List[ListingEntry]:
+            fresh = []
+            for entry in entries:
+                if entry.url not in seen:
+                    seen.add(entry.url)
+                    fresh.append(entry)
+                else:
+                    # Title and comment-count links of one row: keep whichever carries the metadata
+                    for kept in fresh:
+                        if kept.url == entry.url:
+                            if kept.comment_count is None:
+                                kept.comment_count = entry.comment_count
+                            if kept.last_activity is None:
+                                kept.last_activity = entry.last_activity
+            return fresh
+
+        # Page 1 alone: tells us the page size before fanning out
+        entries, has_next = await self._fetch_listing_page(listing_url, link_fragment, page_type)
+        fresh = new_links(entries)
+        if self.dev_mode:
+            logger.debug(f"Page 1: Found {len(fresh)} links")
+
+        for entry in fresh:
+            yield entry
+            found += 1
+            if limit and found >= limit:
+                return
+
+        if not paginate or not has_next or not fresh:
+            return
+
+        page_size = len(fresh)
+        pending: Dict[int, asyncio.Task] = {}
+        next_page = 2
+        current_page = 2
+
+        def pages_needed() -> int:
+            if not limit:
+                return self.concurrency
+            return max(1, math.ceil((limit - found) / page_size))
+
+        def schedule():
+            nonlocal next_page
+            while len(pending) < min(self.concurrency, pages_needed()):
+                if self.max_pages and next_page > self.max_pages:
+                    break
+                url = self.page_url(listing_url, next_page)
+                if self.dev_mode:
+                    logger.debug(f"Loading page {next_page}: {url}")
+                pending[next_page] = asyncio.ensure_future(
+                    self._fetch_listing_page(url, link_fragment, page_type)
+                )
+                next_page += 1
+
+        try:
+            schedule()
+            while current_page in pending:
+                entries, has_next = await pending.pop(current_page)
+                fresh = new_links(entries)
+
+                if self.dev_mode:
+                    logger.debug(f"Page {current_page}: Found {len(fresh)} links")
+
+                for entry in fresh:
+                    yield entry
+                    found += 1
+                    if limit and found >= limit:
+                        return
+
+                if not has_next or not fresh:
+                    if self.dev_mode:
+                        logger.debug(f"Reached last page (page {current_page})")
+                    return
+
+                current_page += 1
+                schedule()
+
+            if self.max_pages and current_page > self.max_pages:
+                logger.warning(f"Reached maximum page limit ({self.max_pages})")
+
+        finally:
+            for task in pending.values():
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.values(), return_exceptions=True)
+
+    async def collect(self, listing_url: str, link_fragment: str = '/discussion/',
+                      limit: Optional[int] = None, page_type: str = 'discussion_listing',
+                      paginate: bool = True) -> List[str]:
+        """Run discover() to completion and return the links as a list"""
+        return [link async for link in self.discover(listing_url, link_fragment, limit, page_type, paginate)]
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Notebook Download Pool
+Runs `kaggle kernels pull` as non-blocking subprocesses with bounded parallelism
+"""
+
+import json
+import time
+import asyncio
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+from .rate_limiter import RateLimiter, is_throttle_status
+from .kaggle_client import KaggleApiClient, KaggleApiError
+from .notebook_converter import IJSON_AVAILABLE, STREAMING_THRESHOLD
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class KaggleCommandTimeout(Exception):
+    """A `kaggle` CLI call did not finish in time and was killed"""
+
+
+class _UseCli(Exception):
+    """An API download failed in a way the CLI might not"""
+
+
+async def run_kaggle_command(args: Sequence[str], timeout: float = 60.0,
+                             command: Sequence[str] = ('kaggle',)) -> Tuple[int, str, str]:
+    """
+    Run a `kaggle` CLI command without blocking the event loop
+
+    Args:
+        args: Arguments after the executable, e.g. ['kernels', 'pull', 'user/kernel']
+        timeout: Seconds before the process is killed
+        command: Executable (and leading arguments) to run
+
+    Returns:
+        Tuple of (return code, stdout, stderr)
+
+    Raises:
+        KaggleCommandTimeout: The process was killed after `timeout` seconds
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command, *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise KaggleCommandTimeout(f"'{' '.join([*command, *args])}' timed out after {timeout:.0f}s")
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    return (process.returncode,
+            stdout.decode('utf-8', errors='replace'),
+            stderr.decode('utf-8', errors='replace'))
+
+
+@dataclass
+class DownloadStats:
+    """Counters reported by NotebookDownloadPool.log_summary()"""
+    downloaded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    via_api: int = 0
+    cli_fallbacks: int = 0
+    busy_seconds: float = 0.0
+
+
+def _spool_notebook_source(response_file: Path, notebook_file: Path) -> Path:
+    """Write blob.source of a /kernels/pull response stored on disk to notebook_file, parsing it with ijson"""
+    import ijson
+
+    with open(response_file, 'rb') as response:
+        for source in ijson.items(response, 'blob.source', use_float=True):
+            with open(notebook_file, 'w', encoding='utf-8') as output:
+                if isinstance(source, str):
+                    output.write(source)
+                else:
+                    json.dump(source, output)
+            return notebook_file
+    raise ValueError("response has no blob.source")
+
+
+class NotebookDownloadPool:
+    """
+    Pulls notebooks with up to `workers` `kaggle kernels pull` processes at once.
+
+    Every pull runs in its own temporary directory passed with `-p`, so the
+    process working directory is never changed and concurrent pulls cannot see
+    each other's files. Each pull takes a token from the rate limiter first.
+    fetch() returns the notebook text so callers can convert it without
+    storing the .ipynb; pull() writes it to a given path.
+
+    Given a KaggleApiClient, notebooks are fetched in-process instead and the
+    CLI is only used when the API call fails for a reason other than a client
+    error (e.g. connection problems), unless cli_fallback is False.
+
+    Example:
+        pool = NotebookDownloadPool(workers=8)
+        await asyncio.gather(*(pool.pull(slug, target) for slug, target in jobs))
+        source = await pool.fetch("user/kernel")
+    """
+
+    def __init__(self, workers: int = 4, timeout: float = 60.0, rate_limiter: Optional[RateLimiter] = None,
+                 command: Sequence[str] = ('kaggle',), client: Optional[KaggleApiClient] = None,
+                 cli_fallback: bool = True, stream_threshold: int = STREAMING_THRESHOLD, dev_mode: bool = False):
+        """
+        Initialize the pool
+
+        Args:
+            workers: Maximum number of concurrent downloads
+            timeout: Seconds before a single download is killed
+            rate_limiter: Limiter shared with everything else that talks to Kaggle
+            command: Kaggle CLI executable (and leading arguments)
+            client: In-process API client to download with (default: CLI only)
+            cli_fallback: Retry with the CLI when the API client fails
+            stream_threshold: Notebook size from which fetch() leaves the download on disk (given a spool_file)
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter(dev_mode=dev_mode)
+        self.command = tuple(command)
+        self.client = client
+        self.cli_fallback = cli_fallback
+        self.stream_threshold = stream_threshold
+        self.dev_mode = dev_mode
+        self.stats = DownloadStats()
+        self._semaphore: Optional[asyncio.Semaphore] = None  # created in the running loop by fetch()
+
+    async def fetch(self, kernel_slug: str, spool_file: Optional[Path] = None) -> Optional[Union[str, Path]]:
+        """
+        Download a notebook and return its JSON text without storing it
+
+        Args:
+            kernel_slug: "<username>/<kernel-name>"
+            spool_file: Where a notebook of at least stream_threshold bytes is written instead of
+                being read into memory, for streaming conversion (needs ijson; default: always read)
+
+        Returns:
+            The notebook text, spool_file if the notebook was left there, or None if the download failed
+        """
+        if not IJSON_AVAILABLE:
+            spool_file = None
+
+        if self._semaphore is None:
+            # Before Python 3.10 a Semaphore binds to the loop current at creation, not the one using it
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                if self.client:
+                    try:
+                        return await self._fetch_via_api(kernel_slug, spool_file)
+                    except _UseCli:
+                        self.stats.cli_fallbacks += 1
+                return await self._fetch_via_cli(kernel_slug, spool_file)
+            finally:
+                self.stats.busy_seconds += time.monotonic() - started
+
+    async def pull(self, kernel_slug: str, target_file: Path) -> bool:
+        """
+        Download a notebook to target_file
+
+        Args:
+            kernel_slug: "<username>/<kernel-name>"
+            target_file: Where the .ipynb is stored
+
+        Returns:
+            bool: Success status
+        """
+        source = await self.fetch(kernel_slug)
+        if source is None:
+            return False
+        target_file = Path(target_file)
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        target_file.write_text(source, encoding='utf-8')
+        return True
+
+    async def _fetch_via_api(self, kernel_slug: str, spool_file: Optional[Path] = None) -> Optional[Union[str, Path]]:
+        """Download with the API client; raises _UseCli when the CLI should be tried instead"""
+        response_file = spool_file.with_name(spool_file.name + '.response') if spool_file is not None else None
+        try:
+            response = await self.client.pull_kernel(kernel_slug, spool_file=response_file,
+                                                     spool_threshold=self.stream_threshold)
+            if isinstance(response, Path):
+                # Large notebook: the response is parsed from disk and only blob.source is kept, on disk too
+                loop = asyncio.get_running_loop()
+                source = await loop.run_in_executor(None, _spool_notebook_source, response, spool_file)
+            else:
+                source = response['blob']['source']
+        except KaggleApiError as e:
+            if (400 <= e.status < 500 and not is_throttle_status(e.status)) or not self.cli_fallback:
+                # The CLI would get the same answer
+                self.stats.failed += 1
+                logger.error(f"Download of {kernel_slug} failed: {e}")
+                return None
+            error = e
+        except Exception as e:
+            if not self.cli_fallback:
+                self.stats.failed += 1
+                logger.error(f"Download of {kernel_slug} failed: {e}")
+                return None
+            error = e
+
+        else:
+            self.stats.downloaded += 1
+            self.stats.via_api += 1
+            if self.dev_mode:
+                logger.debug(f"Downloaded {kernel_slug} via the API")
+            return source if isinstance(source, (str, Path)) else json.dumps(source)
+
+        finally:
+            if response_file is not None and response_file.exists():
+                response_file.unlink()
+
+        logger.warning(f"API download of {kernel_slug} failed ({error}), retrying with the kaggle CLI")
+        raise _UseCli()
+
+    async def _fetch_via_cli(self, kernel_slug: str, spool_file: Optional[Path] = None) -> Optional[Union[str, Path]]:
+        # The CLI can only write files: pull into a private temp dir and read it back once
+        with tempfile.TemporaryDirectory(prefix="kaggle-pull-") as temp_dir:
+            await self.rate_limiter.acquire()
+            try:
+                returncode, stdout, stderr = await run_kaggle_command(
+                    ['kernels', 'pull', kernel_slug, '-p', temp_dir], timeout=self.timeout, command=self.command
+                )
+            except KaggleCommandTimeout as e:
+                self.stats.timed_out += 1
+                self.stats.failed += 1
+                logger.error(f"Download of {kernel_slug} failed: {e}")
+                return None
+            except OSError as e:
+                self.stats.failed += 1
+                logger.error(f"Cannot run the kaggle CLI: {e}")
+                return None
+
+            if returncode != 0:
+                self.rate_limiter.report_cli_output(stderr + stdout)
+                self.stats.failed += 1
+                logger.error(f"Kaggle API error for {kernel_slug}: {stderr.strip()}")
+                return None
+
+            ipynb_files = sorted(Path(temp_dir).glob("*.ipynb"))
+            if not ipynb_files:
+                self.stats.failed += 1
+                logger.error(f"No .ipynb file found after downloading {kernel_slug}")
+                return None
+
+            if spool_file is not None and ipynb_files[0].stat().st_size >= self.stream_threshold:
+                # Large notebook: moved out of the temp dir for streaming conversion, never read here
+                shutil.move(str(ipynb_files[0]), str(spool_file))
+                source = spool_file
+            else:
+                source = ipynb_files[0].read_text(encoding='utf-8')
+
+        self.stats.downloaded += 1
+        if self.dev_mode:
+            logger.debug(f"Downloaded {kernel_slug}")
+        return source
+
+    def log_summary(self, elapsed: Optional[float] = None):
+        """Log download counts and, given the wall time, the effective parallelism"""
+        total = self.stats.downloaded + self.stats.failed
+        if not total:
+            return
+        message = f"Downloads: {self.stats.downloaded}/{total} succeeded"
+        if self.client:
+            message += f" ({self.stats.via_api} via the API, {self.stats.cli_fallbacks} CLI fallbacks)"
+        if self.stats.timed_out:
+            message += f", {self.stats.timed_out} timed out"
+        if elapsed:
+            message += f", {elapsed:.1f}s wall time, average parallelism {self.stats.busy_seconds / elapsed:.1f}/{self.workers}"
+        logger.info(message)
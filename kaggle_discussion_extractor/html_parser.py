@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Offline HTML Parse Engine
+Extracts Discussion, Reply and Author from rendered page HTML without a live browser
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .core import (
+    Author,
+    Discussion,
+    KaggleDiscussionExtractor,
+    AUTHOR_SKIP_PATHS,
+    BADGE_KEYWORDS,
+    RANK_PATTERNS,
+    _content_from_fragment,
+    _format_rank,
+    _writeup_content_from_text,
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Check for lxml (optional dependency, installed with the "enhanced" extra)
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+
+# XPath equivalents of the CSS selectors used by the live-DOM path in core.py
+COMMENT_XPATH = '//div[@data-testid="discussions-comment"]'
+
+WRITEUP_TITLE_XPATHS = [
+    '//h1[contains(@class, "writeup")]',
+    '//h1[contains(@class, "solution")]',
+    '//h1',
+    '//h2',
+    '//title',
+    '//*[contains(@data-testid, "writeup")]',
+    '//*[contains(@data-testid, "solution")]'
+]
+
+DISCUSSION_TITLE_XPATHS = [
+    '//h1[contains(@class, "title")]',
+    '//h1[contains(@class, "topic")]',
+    '//h1',
+    '//h2[contains(@class, "title")]',
+    '//h2',
+    '//h3[contains(@class, "kvnevz")]',
+    '//*[contains(@data-testid, "title")]',
+    '//*[contains(@data-testid, "topic")]'
+]
+
+DISCUSSION_SPECIFIC_XPATH = (
+    '//*[contains(@class, "discussion") or contains(@class, "topic") or contains(@class, "thread")]'
+)
+
+WRITEUP_CONTENT_XPATHS = [
+    '//div[contains(@class, "writeup")]',
+    '//div[contains(@class, "solution")]',
+    '//article[contains(@class, "writeup")]',
+    '//article',
+    '//div[contains(@class, "content")]',
+    '//div[contains(@class, "post")]',
+    '//div[contains(@class, "body")]',
+    '//*[contains(@data-testid, "writeup")]',
+    '//*[contains(@data-testid, "content")]'
+]
+
+WRITEUP_AUTHOR_XPATHS = [
+    '//*[contains(@class, "author")]',
+    '//*[contains(@data-testid, "author")]',
+    '//div[contains(@class, "user")]',
+    '//a[starts-with(@href, "/")]'
+]
+
+DISCUSSION_MAIN_XPATHS = [
+    '//div[@data-testid="discussions-topic-header"]',
+    '//div[contains(@class, "topic-header")]',
+    '//article[not(preceding-sibling::article)]'
+]
+
+CONTENT_CONTAINER_XPATH = './/div[contains(@class, "eTCgfj") or contains(@class, "jMpVQY")]'
+
+CONTENT_CONTAINER_PATTERN = r'<div[^>]*class="[^"]*(?:eTCgfj|jMpVQY)[^"]*"[^>]*>(.*?)</div>'
+
+
+class OfflineDiscussionParser:
+    """
+    Pure-Python counterpart of KaggleDiscussionExtractor.extract_loaded_discussion.
+
+    Works on the HTML returned by page.content(), so the browser tab can be reused
+    as soon as the page has rendered and parsing can run in worker processes.
+    Computed styles are not available offline, so reply depth comes from the
+    nesting of comment containers only (the live path also uses visual indentation).
+    """
+
+    def __init__(self, extractor: Optional[KaggleDiscussionExtractor] = None, dev_mode: bool = False):
+        """
+        Initialize the parser
+
+        Args:
+            extractor: Extractor whose hierarchy/writeup helpers are reused (default: a new one)
+            dev_mode: Enable development mode with detailed logging
+        """
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml is required for offline parsing. Please run: pip install lxml")
+
+        self.extractor = extractor or KaggleDiscussionExtractor(dev_mode=dev_mode)
+        self.dev_mode = dev_mode
+
+    @staticmethod
+    def _first(root, xpath: str):
+        matches = root.xpath(xpath)
+        return matches[0] if matches else None
+
+    @staticmethod
+    def _text(element) -> str:
+        return element.text_content() or ""
+
+    @staticmethod
+    def _inner_html(element) -> str:
+        return (element.text or "") + "".join(
+            lxml.html.tostring(child, encoding='unicode') for child in element
+        )
+
+    @staticmethod
+    def _outer_html(element) -> str:
+        return lxml.html.tostring(element, encoding='unicode', with_tail=False)
+
+    def author_from_element(self, element) -> Author:
+        """Offline equivalent of KaggleDiscussionExtractor.extract_author_info"""
+        try:
+            author_link = None
+            username = "unknown"
+
+            for link in element.xpath('.//a[starts-with(@href, "/")]'):
+                href = link.get('href')
+                if href and not any(skip in href for skip in AUTHOR_SKIP_PATHS):
+                    username_match = re.match(r'^/([^/]+)$', href)
+                    if username_match:
+                        author_link = link
+                        username = username_match.group(1)
+                        break
+
+            if author_link is None:
+                return Author(name="Unknown", username="unknown")
+
+            display_name = self._text(author_link).strip() or username
+
+            rank = None
+            full_text = self._text(element)
+            element_html = None
+            for pattern in RANK_PATTERNS:
+                match = re.search(pattern, full_text, re.IGNORECASE)
+                if not match:
+                    if element_html is None:
+                        element_html = self._inner_html(element)
+                    match = re.search(pattern, element_html, re.IGNORECASE)
+                if match:
+                    rank = _format_rank(int(match.group(1)))
+                    break
+
+            badges = self._badges(element)
+
+            return Author(
+                name=display_name,
+                username=username,
+                rank=rank,
+                badges=badges if badges else None,
+                profile_url=f"https://www.kaggle.com/{username}"
+            )
+
+        except Exception as e:
+            if self.dev_mode:
+                logger.warning(f"Error extracting author: {e}")
+            return Author(name="Unknown", username="unknown")
+
+    def _badges(self, element) -> List[str]:
+        badges = []
+        for elem in element.xpath('.//span | .//div'):
+            text = self._text(elem).strip()
+            if text and len(text) < 30:
+                lower = text.lower()
+                if any(word.lower() in lower for word in BADGE_KEYWORDS) and text not in badges:
+                    badges.append(text)
+        return badges
+
+    def upvotes_from_element(self, element) -> int:
+        """Offline equivalent of KaggleDiscussionExtractor.extract_upvotes"""
+        for button in element.xpath('.//button[contains(@aria-label, "vote")]'):
+            match = re.search(r'(-?\d+)\s+votes?', button.get('aria-label') or '')
+            if match:
+                return int(match.group(1))
+
+        for button in element.xpath('.//button'):
+            text = self._text(button).strip()
+            if re.match(r'^-?\d+$', text):
+                return int(text)
+        return 0
+
+    def comment_records(self, root) -> List[Dict]:
+        """Raw comment records in the same shape as the batched in-page script returns"""
+        comments = root.xpath(COMMENT_XPATH)
+        index_of = {element: i for i, element in enumerate(comments)}
+        records = []
+
+        for element in comments:
+            depth = 0
+            parent_index = None
+            for ancestor in element.iterancestors():
+                classes = ancestor.get('class') or ''
+                is_comment = ancestor.get('data-testid') == 'discussions-comment'
+                if is_comment and parent_index is None:
+                    parent_index = index_of.get(ancestor)
+                if 'reply' in classes or 'nested' in classes or 'thread' in classes or is_comment:
+                    depth += 1
+                if depth > 5:
+                    break
+
+            author = self.author_from_element(element)
+
+            content_match = re.search(CONTENT_CONTAINER_PATTERN, self._outer_html(element), re.DOTALL)
+            content_html = content_match.group(1) if content_match else None
+            if content_html is not None and _content_from_fragment(content_html) is None:
+                content_html = None
+
+            time_elem = self._first(element, './/span[@title]')
+
+            records.append({
+                'username': author.username if author.username != "unknown" else None,
+                'displayName': author.name,
+                'rankNumber': int(re.match(r'\d+', author.rank).group(0)) if author.rank else None,
+                'badges': author.badges,
+                'upvotes': self.upvotes_from_element(element),
+                'timestamp': time_elem.get('title', '') if time_elem is not None else '',
+                'contentHtml': content_html,
+                'text': None if content_html is not None else self._text(element),
+                'depth': depth,
+                'isNested': depth > 0,
+                'visualIndent': 0,
+                'parentIndex': parent_index
+            })
+
+        return records
+
+    def _writeup_title(self, root, url: str) -> str:
+        title = "Unknown Title"
+
+        # Try to get from page title first for writeups
+        page_title = ' '.join((root.findtext('.//title') or '').split())
+        if page_title and '|' in page_title:
+            writeup_title = page_title.split('|')[0].strip()
+            if writeup_title and writeup_title != "Kaggle":
+                title = writeup_title
+
+        # If page title didn't work, try DOM selectors
+        if title == "Unknown Title":
+            for xpath in WRITEUP_TITLE_XPATHS:
+                title_elem = self._first(root, xpath)
+                if title_elem is not None:
+                    text = self._text(title_elem)
+                    if text and text.strip():
+                        if not any(skip in text.lower() for skip in ['kaggle', 'competition']):
+                            title = text.strip()
+                            break
+
+        # Extract from URL for writeups (e.g., "2nd-place-solution")
+        if title == "Unknown Title":
+            url_parts = url.split('/')
+            if 'writeups' in url_parts:
+                writeup_idx = url_parts.index('writeups')
+                if writeup_idx + 1 < len(url_parts):
+                    title = url_parts[writeup_idx + 1].replace('-', ' ').title()
+
+        return title
+
+    def _discussion_title(self, root, url: str) -> str:
+        title = "Unknown Title"
+
+        for xpath in DISCUSSION_TITLE_XPATHS:
+            title_elem = self._first(root, xpath)
+            if title_elem is not None:
+                text = self._text(title_elem)
+                if text and text.strip():
+                    # Skip generic competition titles
+                    if not any(skip in text.lower() for skip in ['cmi - detect behavior', 'kaggle']):
+                        title = text.strip()
+                        break
+                    elif title == "Unknown Title":  # Keep as fallback
+                        title = text.strip()
+
+        # If we still have a generic title, try to get it from the page
+        if title in ["Unknown Title", "CMI - Detect Behavior with Sensor Data"]:
+            url_parts = url.split('/')
+            if len(url_parts) > 2 and url_parts[-1].isdigit():
+                for elem in root.xpath(DISCUSSION_SPECIFIC_XPATH):
+                    text = self._text(elem)
+                    if text and 10 < len(text.strip()) < 200:
+                        lines = text.strip().split('\n')
+                        if lines and len(lines[0]) > 5:
+                            title = lines[0].strip()
+                            break
+
+        return title
+
+    def parse(self, html: str, url: str) -> Discussion:
+        """
+        Parse a rendered discussion or writeup page
+
+        Args:
+            html: Output of page.content() for the URL
+            url: Discussion or writeup URL
+
+        Returns:
+            Discussion object equivalent to the live-DOM extraction
+        """
+        root = lxml.html.document_fromstring(html)
+        is_writeup = '/writeups/' in url
+
+        main_content = ""
+        main_author = Author(name="Unknown", username="unknown")
+        main_upvotes = 0
+
+        if is_writeup:
+            title = self._writeup_title(root, url)
+
+            for xpath in WRITEUP_CONTENT_XPATHS:
+                main_elem = self._first(root, xpath)
+                if main_elem is not None:
+                    main_author = self.author_from_element(main_elem)
+                    main_upvotes = self.upvotes_from_element(main_elem)
+
+                    content_text = self._text(main_elem)
+                    if content_text and len(content_text.strip()) > 100:
+                        main_content = content_text.strip()
+                        break
+
+            if main_author.name == "Unknown":
+                for xpath in WRITEUP_AUTHOR_XPATHS:
+                    for elem in root.xpath(xpath):
+                        author = self.author_from_element(elem)
+                        if author.name != "Unknown":
+                            main_author = author
+                            break
+                    if main_author.name != "Unknown":
+                        break
+
+            if main_author.name == "Unknown":
+                comment_authors = []
+                if self.extractor._writeup_target_placement(title):
+                    comment_authors = [self.author_from_element(c) for c in root.xpath(COMMENT_XPATH)]
+                main_author, main_content = self.extractor._resolve_writeup_author(
+                    title, comment_authors, main_author, main_content
+                )
+
+            if not main_content:
+                main_content = _writeup_content_from_text(self._text(root.body))
+
+        else:
+            title = self._discussion_title(root, url)
+
+            for xpath in DISCUSSION_MAIN_XPATHS:
+                main_elem = self._first(root, xpath)
+                if main_elem is not None:
+                    main_author = self.author_from_element(main_elem)
+                    main_upvotes = self.upvotes_from_element(main_elem)
+
+                    content_elem = self._first(main_elem, CONTENT_CONTAINER_XPATH)
+                    if content_elem is not None:
+                        main_content = self._text(content_elem).strip()
+                        if main_content:
+                            break
+
+        processed_comments = self.extractor._process_raw_comments(self.comment_records(root))
+        replies = self.extractor._build_reply_hierarchy(processed_comments)
+
+        return Discussion(
+            title=title,
+            url=url,
+            main_content=main_content,
+            main_author=main_author,
+            main_upvotes=main_upvotes,
+            replies=replies,
+            total_replies=self.extractor._count_all_replies(replies),
+            extraction_time=datetime.now().isoformat()
+        )
+
+
+_worker_parser: Optional[OfflineDiscussionParser] = None
+
+
+def parse_discussion_html(html: str, url: str) -> Discussion:
+    """Parse a rendered page with a per-process parser (picklable entry point for worker pools)"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = OfflineDiscussionParser()
+    return _worker_parser.parse(html, url)
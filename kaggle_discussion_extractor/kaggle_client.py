@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Kaggle API Client
+In-process client for the Kaggle public API over pooled keep-alive connections
+"""
+
+import os
+import json
+import queue
+import base64
+import shutil
+import asyncio
+import logging
+import http.client
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .rate_limiter import RateLimiter
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://www.kaggle.com/api/v1"
+
+# Errors that mean a pooled keep-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                            BrokenPipeError, ConnectionResetError)
+
+# Read size when a large response is copied to disk
+_SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class KaggleCredentialsError(Exception):
+    """No Kaggle API credentials were found"""
+
+
+class KaggleApiError(Exception):
+    """The Kaggle API answered with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Kaggle API error {status}: {message}")
+        self.status = status
+
+
+def load_credentials() -> Tuple[str, str]:
+    """
+    Find API credentials the same way the kaggle CLI does
+
+    KAGGLE_USERNAME/KAGGLE_KEY take precedence over kaggle.json in
+    $KAGGLE_CONFIG_DIR (default ~/.kaggle).
+
+    Returns:
+        Tuple of (username, key)
+
+    Raises:
+        KaggleCredentialsError: Neither source has credentials
+    """
+    username, key = os.environ.get('KAGGLE_USERNAME'), os.environ.get('KAGGLE_KEY')
+    if username and key:
+        return username, key
+
+    config_dir = Path(os.environ.get('KAGGLE_CONFIG_DIR') or Path.home() / '.kaggle')
+    config_file = config_dir / 'kaggle.json'
+    try:
+        config = json.loads(config_file.read_text(encoding='utf-8'))
+        return config['username'], config['key']
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise KaggleCredentialsError(f"No Kaggle credentials in environment or {config_file}: {e}")
+
+
+class KaggleApiClient:
+    """
+    Calls the Kaggle API from this process instead of spawning `kaggle` per call.
+
+    Requests go through a small pool of keep-alive HTTP connections, so TLS is
+    negotiated once per connection rather than once per notebook. http.client
+    is blocking, so requests run on a thread pool sized to the connection pool.
+    Every request takes a rate-limiter token and feeds its status back.
+
+    Example:
+        client = KaggleApiClient()
+        kernels = await client.list_kernels("neurips-2025", page_size=50)
+        notebook = await client.pull_kernel("user/kernel")
+        client.close()
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, username: Optional[str] = None, key: Optional[str] = None,
+                 pool_size: int = 4, timeout: float = 30.0, rate_limiter: Optional[RateLimiter] = None,
+                 dev_mode: bool = False):
+        """
+        Initialize the client
+
+        Args:
+            base_url: API root (point it at a local server in tests)
+            username: Kaggle username (default: from load_credentials())
+            key: Kaggle API key (default: from load_credentials())
+            pool_size: Number of pooled connections and worker threads
+            timeout: Socket timeout per request in seconds
+            rate_limiter: Limiter shared with everything else that talks to Kaggle
+            dev_mode: Enable development mode with detailed logging
+
+        Raises:
+            KaggleCredentialsError: No credentials given or found
+        """
+        if not (username and key):
+            username, key = load_credentials()
+
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter(dev_mode=dev_mode)
+        self.dev_mode = dev_mode
+
+        token = base64.b64encode(f"{username}:{key}".encode('utf-8')).decode('ascii')
+        self._headers = {
+            'Authorization': f"Basic {token}",
+            'Accept': 'application/json',
+            'User-Agent': 'kaggle-discussion-extractor',
+        }
+        self._connections: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="kaggle-api")
+        self.connections_opened = 0
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _request(self, path: str, params: Optional[Dict[str, Any]] = None, spool_file: Optional[Path] = None,
+                 spool_threshold: int = 0) -> Tuple[int, Dict[str, str], Optional[bytes]]:
+        """
+        Blocking GET on a pooled connection; a stale keep-alive connection is replaced once
+
+        A successful response whose Content-Length is at least spool_threshold is
+        copied to spool_file instead of being read into memory (body is then None).
+        """
+        query = urlencode({name: value for name, value in (params or {}).items() if value is not None})
+        url = f"{self.base_path}{path}" + (f"?{query}" if query else "")
+
+        for attempt in range(2):
+            try:
+                connection = self._connections.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = self._new_connection()
+                reused = False
+
+            try:
+                connection.request('GET', url, headers=self._headers)
+                response = connection.getresponse()
+                length = response.getheader('content-length', '')
+                if (spool_file is not None and response.status < 400 and length.isdigit()
+                        and int(length) >= spool_threshold):
+                    with open(spool_file, 'wb') as spool:
+                        shutil.copyfileobj(response, spool, _SPOOL_CHUNK_SIZE)
+                    body = None
+                else:
+                    body = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._connections.put(connection)
+            return response.status, {name.lower(): value for name, value in response.getheaders()}, body
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None, spool_file: Optional[Path] = None,
+                        spool_threshold: int = 0) -> Any:
+        """Parsed JSON response, or spool_file when the body was written there (see _request())"""
+        await self.rate_limiter.acquire()
+        loop = asyncio.get_running_loop()
+        status, headers, body = await loop.run_in_executor(self._executor, self._request, path, params,
+                                                           spool_file, spool_threshold)
+
+        retry_after = headers.get('retry-after', '').strip()
+        self.rate_limiter.record_response(status, float(retry_after) if retry_after.isdigit() else None)
+        if self.dev_mode:
+            logger.debug(f"GET {path} -> {status} ({headers.get('content-length', len(body or b''))} bytes)")
+
+        if body is None:
+            return spool_file
+        if status >= 400:
+            raise KaggleApiError(status, body.decode('utf-8', errors='replace')[:200])
+        return json.loads(body.decode('utf-8'))
+
+    async def list_kernels(self, competition: str, page_size: int = 100, page: int = 1,
+                           sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        One page of a competition's notebooks
+
+        Args:
+            competition: Competition slug
+            page_size: Notebooks per page
+            page: 1-based page number
+            sort_by: API sort order, e.g. "voteCount" or "dateRun"
+
+        Returns:
+            List of kernel dicts (ref, title, author, lastRunTime, totalVotes, ...)
+        """
+        return await self._get_json('/kernels/list', {
+            'competition': competition,
+            'pageSize': page_size,
+            'page': page,
+            'sortBy': sort_by,
+        })
+
+    async def pull_kernel(self, kernel_slug: str, spool_file: Optional[Path] = None,
+                          spool_threshold: int = 0) -> Union[Dict[str, Any], Path]:
+        """
+        Latest version of a notebook
+
+        Args:
+            kernel_slug: "<username>/<kernel-name>"
+            spool_file: Write a response of at least spool_threshold bytes here instead of parsing it
+            spool_threshold: Response size (Content-Length) from which spool_file is used
+
+        Returns:
+            Dict with "metadata" and "blob" (blob["source"] is the notebook JSON text),
+            or spool_file holding that response unparsed
+        """
+        owner, _, name = kernel_slug.partition('/')
+        return await self._get_json('/kernels/pull', {'userName': owner, 'kernelSlug': name},
+                                    spool_file, spool_threshold)
+
+    def close(self):
+        """Close pooled connections and stop the worker threads"""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+        self._executor.shutdown(wait=False)
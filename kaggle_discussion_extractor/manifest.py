@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Extraction Manifest
+Remembers what was extracted per competition so reruns only touch changed threads
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from .core import Discussion
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """What is known about one extracted discussion/writeup"""
+    id: str
+    url: str
+    filename: str
+    total_replies: int
+    content_hash: str
+    listing_comments: Optional[int] = None
+    listing_activity: Optional[str] = None
+    last_seen: str = ""
+    last_changed: str = ""
+
+
+class ExtractionManifest:
+    """
+    Persistent per-competition record of extracted threads.
+
+    Stored as .manifest-<competition>.json inside the output directory. A thread
+    whose listing metadata (comment count and last-activity time) matches the
+    recorded one can be skipped without loading it; a thread that is loaded is only rewritten when its content hash
+    (which ignores the extraction timestamp) or filename changed.
+    """
+
+    def __init__(self, output_dir: Path, competition_url: str, dev_mode: bool = False):
+        """
+        Initialize the manifest (call load() to read a previous run)
+
+        Args:
+            output_dir: Directory holding the extracted markdown files
+            competition_url: Competition the manifest belongs to
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.output_dir = Path(output_dir)
+        self.competition = self.competition_slug(competition_url)
+        self.path = self.output_dir / f".manifest-{self.competition}.json"
+        self.dev_mode = dev_mode
+        self.entries: Dict[str, ManifestEntry] = {}
+
+    @staticmethod
+    def competition_slug(competition_url: str) -> str:
+        """'https://www.kaggle.com/competitions/x/discussion' -> 'x'"""
+        path = competition_url.split('?')[0].rstrip('/')
+        if '/competitions/' in path:
+            return path.split('/competitions/', 1)[1].split('/')[0]
+        return path.split('/')[-1] or "competition"
+
+    @staticmethod
+    def content_hash(discussion: "Discussion") -> str:
+        """Hash of everything extracted except the extraction timestamp"""
+        data = asdict(discussion)
+        data.pop('extraction_time', None)
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self) -> "ExtractionManifest":
+        """Read the manifest of a previous run, if there is one"""
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.entries = {
+                entry['id']: ManifestEntry(**entry) for entry in data.get('entries', [])
+            }
+            if self.dev_mode:
+                logger.debug(f"Loaded manifest with {len(self.entries)} entries from {self.path}")
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+            self.entries = {}
+        return self
+
+    def save(self):
+        """Write the manifest atomically (temp file + rename)"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': MANIFEST_VERSION,
+            'competition': self.competition,
+            'entries': [asdict(entry) for entry in sorted(self.entries.values(), key=lambda e: e.id)],
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def get(self, discussion_id: str) -> Optional[ManifestEntry]:
+        return self.entries.get(discussion_id)
+
+    def is_unchanged(self, discussion_id: str, listing_comments: Optional[int],
+                     listing_activity: Optional[str] = None) -> bool:
+        """
+        Whether a thread can be skipped based on listing metadata alone
+
+        Every value the listing shows must match the recorded one; a value the
+        previous run did not record counts as changed. Nothing known = changed.
+
+        Args:
+            discussion_id: ID from the thread URL
+            listing_comments: Comment count shown on the listing page (None = unknown)
+            listing_activity: Last-activity timestamp shown on the listing page (None = unknown)
+        """
+        entry = self.entries.get(discussion_id)
+        if entry is None:
+            return False
+        known = [(current, recorded) for current, recorded in ((listing_comments, entry.listing_comments),
+                                                                (listing_activity, entry.listing_activity))
+                 if current is not None]
+        if not known or any(current != recorded for current, recorded in known):
+            return False
+        return (self.output_dir / entry.filename).exists()
+
+    def needs_write(self, discussion_id: str, discussion: "Discussion", filename: str) -> bool:
+        """Whether a freshly extracted thread differs from what is on disk"""
+        entry = self.entries.get(discussion_id)
+        if entry is None or entry.filename != filename:
+            return True
+        if not (self.output_dir / filename).exists():
+            return True
+        return entry.content_hash != self.content_hash(discussion)
+
+    def mark_seen(self, discussion_id: str, listing_comments: Optional[int] = None,
+                  listing_activity: Optional[str] = None):
+        """Refresh last_seen (and the listing metadata) of an entry that did not change"""
+        entry = self.entries.get(discussion_id)
+        if entry is None:
+            return
+        entry.last_seen = datetime.now().isoformat()
+        if listing_comments is not None:
+            entry.listing_comments = listing_comments
+        if listing_activity is not None:
+            entry.listing_activity = listing_activity
+
+    def record(self, discussion_id: str, discussion: "Discussion", filename: str,
+               listing_comments: Optional[int] = None, listing_activity: Optional[str] = None) -> ManifestEntry:
+        """Store the current state of a thread that was just written"""
+        now = datetime.now().isoformat()
+        entry = ManifestEntry(
+            id=discussion_id,
+            url=discussion.url,
+            filename=filename,
+            total_replies=discussion.total_replies,
+            content_hash=self.content_hash(discussion),
+            listing_comments=listing_comments,
+            listing_activity=listing_activity,
+            last_seen=now,
+            last_changed=now,
+        )
+        self.entries[discussion_id] = entry
+        return entry
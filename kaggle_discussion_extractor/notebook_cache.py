@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Notebook Cache
+Remembers which kernel version was downloaded so reruns skip unchanged notebooks
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_FILENAME = ".notebook-cache.json"
+
+
+@dataclass
+class NotebookCacheEntry:
+    """What is known about one downloaded notebook"""
+    ref: str
+    version: str
+    filename: str
+    has_ipynb: bool = True
+    last_seen: str = ""
+    last_changed: str = ""
+
+
+class NotebookCache:
+    """
+    Persistent per-competition record of downloaded notebooks.
+
+    Stored as .notebook-cache.json in the competition's notebook directory and
+    keyed by kernel ref ("<owner>/<kernel>"). The version is what the listing
+    reports (version number, or lastRunTime when the number is not available),
+    so a notebook whose listed version matches the cached one - and whose files
+    are still on disk - is skipped without any request to Kaggle.
+    """
+
+    def __init__(self, output_dir: Path, dev_mode: bool = False):
+        """
+        Initialize the cache (call load() to read a previous run)
+
+        Args:
+            output_dir: Directory holding the competition's converted notebooks
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / CACHE_FILENAME
+        self.dev_mode = dev_mode
+        self.entries: Dict[str, NotebookCacheEntry] = {}
+
+    def load(self) -> "NotebookCache":
+        """Read the cache of a previous run, if there is one"""
+        if not self.path.exists():
+            return self
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.entries = {entry['ref']: NotebookCacheEntry(**entry) for entry in data.get('entries', [])}
+            if self.dev_mode:
+                logger.debug(f"Loaded notebook cache with {len(self.entries)} entries from {self.path}")
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable notebook cache {self.path}: {e}")
+            self.entries = {}
+        return self
+
+    def save(self):
+        """Write the cache atomically (temp file + rename)"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': CACHE_VERSION,
+            'entries': [asdict(entry) for entry in sorted(self.entries.values(), key=lambda e: e.ref)],
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def get(self, ref: str) -> Optional[NotebookCacheEntry]:
+        return self.entries.get(ref)
+
+    def is_current(self, ref: str, version: Optional[str], need_ipynb: bool = False) -> bool:
+        """
+        Whether a notebook can be skipped based on listing metadata alone
+
+        Args:
+            ref: Kernel ref ("<owner>/<kernel>")
+            version: Version reported by the listing (None/empty = unknown, never current)
+            need_ipynb: The original .ipynb must be on disk as well
+        """
+        entry = self.entries.get(ref)
+        if entry is None or not version or entry.version != version:
+            return False
+        python_file = self.output_dir / entry.filename
+        if not python_file.exists():
+            return False
+        if need_ipynb and not (entry.has_ipynb and python_file.with_suffix('.ipynb').exists()):
+            return False
+        return True
+
+    def mark_seen(self, ref: str):
+        """Refresh last_seen of an entry that did not change"""
+        entry = self.entries.get(ref)
+        if entry is not None:
+            entry.last_seen = datetime.now().isoformat()
+
+    def record(self, ref: str, version: Optional[str], filename: str, has_ipynb: bool = True) -> NotebookCacheEntry:
+        """Store the version of a notebook that was just written"""
+        now = datetime.now().isoformat()
+        entry = NotebookCacheEntry(
+            ref=ref,
+            version=version or "",
+            filename=filename,
+            has_ipynb=has_ipynb,
+            last_seen=now,
+            last_changed=now,
+        )
+        self.entries[ref] = entry
+        return entry
@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Notebook Converter
+Converts .ipynb files to Python in worker processes that each reuse one nbconvert exporter
+"""
+
+import os
+import re
+import ast
+import json
+import time
+import asyncio
+import logging
+import warnings
+from pathlib import Path
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .notebook_outputs import DEFAULT_MAX_OUTPUT_CHARS, OUTPUT_MODES, dumps_notebook, strip_notebook_outputs
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Check for ijson (optional dependency, installed with the "enhanced" extra)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+CONVERTER_MODES = ("fast", "nbconvert")
+
+# Notebook files at least this large are converted cell by cell without loading them (needs ijson)
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+# Cell members the Python output never uses; the streaming parser skips them without building them
+_STREAM_SKIPPED_KEYS = ('outputs', 'attachments')
+_STREAM_SKIPPED_PREFIXES = tuple(f'cells.item.{key}' for key in _STREAM_SKIPPED_KEYS)
+
+_worker_exporter = None
+
+# nbconvert's python template, reproduced without Jinja
+_PYTHON_HEADER = "#!/usr/bin/env python\n# coding: utf-8\n"
+_RAW_MIMETYPES = ('', 'text/x-python')
+
+_INDENT = re.compile(r'^[ \t]+')
+# Input that IPython's prompt strippers would rewrite (>>> / ... / In [1]:)
+_PROMPT = re.compile(r'^(\s*(>>>|\.\.\.)( |$)|In \[\d+\]: |\s*\.{3,}: ?)')
+# "x = !cmd" and "x = %magic args"
+_ASSIGN_ESCAPE = re.compile(r'^(\s*[\w.]+\s*=\s*)([!%])(.*)$')
+
+
+class FastConversionUnsupported(Exception):
+    """The notebook uses something the fast converter does not reproduce exactly"""
+
+
+def _get_exporter():
+    """The PythonExporter of this process, built on first use (Jinja template loading is the slow part)"""
+    global _worker_exporter
+    if _worker_exporter is None:
+        from nbconvert import PythonExporter
+        _worker_exporter = PythonExporter()
+    return _worker_exporter
+
+
+def _cell_source(cell: dict) -> str:
+    source = cell.get('source', '')
+    return ''.join(source) if isinstance(source, list) else source
+
+
+def _is_python(code: str) -> bool:
+    with warnings.catch_warnings():
+        # e.g. SyntaxWarning for invalid escape sequences; only validity matters here
+        warnings.simplefilter("ignore")
+        try:
+            ast.parse(code)
+            return True
+        except (SyntaxError, ValueError):
+            return False
+
+
+def _escape_call(escape: str, content: str) -> str:
+    """The get_ipython() call IPython generates for !cmd, !!cmd and %magic"""
+    if escape == '!!':
+        return f"get_ipython().getoutput({content!r})"
+    if escape == '!':
+        return f"get_ipython().system({content!r})"
+    name, _, args = content.partition(' ')
+    return f"get_ipython().run_line_magic({name!r}, {args!r})"
+
+
+def _translate_code_cell(source: str) -> str:
+    """
+    Same result as nbconvert's ipython2python filter for the common cases
+
+    Plain Python, line magics (%), shell escapes (! and !!), their assignment
+    forms (x = !cmd) and cell magics (%%) are translated here; anything else
+    raises FastConversionUnsupported.
+    """
+    if not source.endswith('\n'):
+        source += '\n'
+    lines = source.splitlines(keepends=True)
+
+    # Cleanup transforms: drop leading blank lines, dedent by the first line's indent
+    for i, line in enumerate(lines):
+        if line and not line.isspace():
+            lines = lines[i:]
+            break
+    indent = _INDENT.match(lines[0])
+    if indent:
+        space = indent.group(0)
+        lines = [line[len(space):] if line.startswith(space) else line for line in lines]
+
+    if lines[0].startswith('%%'):
+        if re.match(r'%%\w+\?', lines[0]):
+            raise FastConversionUnsupported("cell magic help")
+        magic_name, _, first_line = lines[0][2:].rstrip().partition(' ')
+        return f"get_ipython().run_cell_magic({magic_name!r}, {first_line!r}, {''.join(lines[1:])!r})\n"
+
+    code = ''.join(lines)
+    if _is_python(code):
+        return code
+
+    # Not plain Python: rewrite escaped lines, then the result must parse
+    if '"""' in code or "'''" in code:
+        raise FastConversionUnsupported("escapes next to multi-line strings")
+    translated = []
+    for line in lines:
+        stripped = line.lstrip(' \t')
+        body = line.rstrip('\n')
+        if _PROMPT.match(line):
+            raise FastConversionUnsupported("prompt characters")
+        if stripped[:1] in ('!', '%'):
+            if body.rstrip().endswith('\\'):
+                raise FastConversionUnsupported("continued escape line")
+            prefix = line[:len(line) - len(stripped)]
+            content = stripped.rstrip()
+            escape = content[:2] if content.startswith('!!') else content[:1]
+            translated.append(prefix + _escape_call(escape, content[len(escape):]) + '\n')
+            continue
+        assignment = _ASSIGN_ESCAPE.match(body)
+        if assignment:
+            lhs, escape, content = assignment.groups()
+            # x = !cmd captures the output, like !!cmd
+            translated.append(lhs + _escape_call('!!' if escape == '!' else '%', content.rstrip()) + '\n')
+            continue
+        translated.append(line)
+
+    code = ''.join(translated)
+    if not _is_python(code):
+        raise FastConversionUnsupported("cell is not Python after translating magics")
+    return code
+
+
+def fast_convert_notebook_source(source: str) -> Tuple[str, int]:
+    """
+    Convert notebook JSON text to Python without nbconvert's template engine
+
+    Returns:
+        Tuple of (python code, number of cells)
+
+    Raises:
+        FastConversionUnsupported: Use convert_notebook_source() for this notebook
+    """
+    return fast_convert_notebook(json.loads(source))
+
+
+def fast_convert_notebook(nb: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Convert a parsed notebook (json.loads() of the .ipynb) to Python
+
+    Produces the same text as PythonExporter: the header, an "# In[n]:" prompt
+    before each code cell, markdown as "# " comments and python/untyped raw
+    cells verbatim.
+
+    Returns:
+        Tuple of (python code, number of cells)
+
+    Raises:
+        FastConversionUnsupported: Use convert_notebook_source() for this notebook
+    """
+    if not isinstance(nb, dict) or nb.get('nbformat', 0) < 4 or not isinstance(nb.get('cells'), list):
+        raise FastConversionUnsupported("not an nbformat 4 notebook")
+
+    parts = [_PYTHON_HEADER]
+    parts.extend(_convert_cell(cell) for cell in nb['cells'])
+    return ''.join(parts), len(nb['cells'])
+
+
+def _convert_cell(cell: Dict[str, Any]) -> str:
+    """The text PythonExporter emits for one cell"""
+    metadata = cell.get('metadata') or {}
+    if (metadata.get('transient') or {}).get('remove_source'):
+        return ''
+    cell_type = cell.get('cell_type')
+    if cell_type == 'code':
+        execution_count = cell.get('execution_count') or ' '
+        return f"\n# In[{execution_count}]:\n\n\n{_translate_code_cell(_cell_source(cell))}\n"
+    if cell_type == 'markdown':
+        commented = '\n'.join('# ' + line for line in _cell_source(cell).split('\n'))
+        return f"\n{commented}\n"
+    if cell_type == 'raw':
+        if str(metadata.get('raw_mimetype', '')).lower() in _RAW_MIMETYPES:
+            return _cell_source(cell)
+        return ''
+    raise FastConversionUnsupported(f"unknown cell type {cell_type!r}")
+
+
+def _stream_cells(notebook_file, info: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the cells of an open (binary) notebook file one at a time, without outputs/attachments
+
+    info receives 'nbformat' and 'has_cells' as they are parsed; nbformat usually
+    comes after the cells, so both are only final once the generator is exhausted.
+    """
+    info.setdefault('nbformat', 0)
+    info.setdefault('has_cells', False)
+    builder = None
+    for prefix, event, value in ijson.parse(notebook_file):
+        if builder is None:
+            if prefix == 'cells.item' and event == 'start_map':
+                builder = ijson.ObjectBuilder()
+            elif prefix == 'cells' and event == 'start_array':
+                info['has_cells'] = True
+                continue
+            elif prefix == 'nbformat' and event == 'number':
+                info['nbformat'] = value
+                continue
+            else:
+                continue
+
+        if prefix == 'cells.item' and event == 'map_key' and value in _STREAM_SKIPPED_KEYS:
+            continue
+        if prefix.startswith(_STREAM_SKIPPED_PREFIXES):
+            continue
+        builder.event(event, value)
+        if prefix == 'cells.item' and event == 'end_map':
+            yield builder.value
+            builder = None
+
+
+def stream_convert_notebook_file(ipynb_path: str, python_path: str, header: str = "") -> int:
+    """
+    Convert a notebook file cell by cell without loading the document (needs ijson)
+
+    Same output as fast_convert_notebook_source(), but only one cell is held in
+    memory at a time and cell outputs/attachments are skipped by the parser
+    instead of being built, so memory does not grow with the notebook's size.
+    The result goes to a temporary file renamed over python_path on success.
+
+    Returns:
+        Number of cells
+
+    Raises:
+        FastConversionUnsupported: Convert this notebook from memory instead
+    """
+    if not IJSON_AVAILABLE:
+        raise FastConversionUnsupported("ijson is not installed")
+
+    tmp_path = f"{python_path}.tmp"
+    info: Dict[str, Any] = {}
+    cells = 0
+    try:
+        with open(ipynb_path, 'rb') as notebook_file, open(tmp_path, 'w', encoding='utf-8') as output:
+            output.write(header + _PYTHON_HEADER)
+            for cell in _stream_cells(notebook_file, info):
+                output.write(_convert_cell(cell))
+                cells += 1
+
+        if info['nbformat'] < 4 or not info['has_cells']:
+            raise FastConversionUnsupported("not an nbformat 4 notebook")
+        os.replace(tmp_path, python_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return cells
+
+
+def read_notebook_sources(ipynb_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a notebook without its outputs/attachments (needs ijson)
+
+    Enough for everything that only uses cell sources (e.g. CellStore.add_notebook())
+    when the file is too large to json.load().
+
+    Returns:
+        nbformat 4 notebook dict whose cells have no outputs
+
+    Raises:
+        FastConversionUnsupported: ijson is not installed or the file is not an nbformat 4 notebook
+    """
+    if not IJSON_AVAILABLE:
+        raise FastConversionUnsupported("ijson is not installed")
+    info: Dict[str, Any] = {}
+    with open(ipynb_path, 'rb') as notebook_file:
+        cells = list(_stream_cells(notebook_file, info))
+    if info['nbformat'] < 4 or not info['has_cells']:
+        raise FastConversionUnsupported("not an nbformat 4 notebook")
+    return {'cells': cells, 'metadata': {}, 'nbformat': info['nbformat'], 'nbformat_minor': 4}
+
+
+def convert_notebook_source(source: str) -> Tuple[str, int]:
+    """
+    Convert notebook JSON text to Python source with nbconvert's PythonExporter
+
+    Returns:
+        Tuple of (python code, number of cells)
+    """
+    import nbformat
+
+    # reads() joins multi-line sources stored as lists of lines, which from_dict() does not
+    nb = nbformat.reads(source, as_version=4)
+    python_code, _ = _get_exporter().from_notebook_node(nb)
+    return python_code, len(nb.get('cells', []))
+
+
+def convert_notebook_file(ipynb_path: str, python_path: str, header: str = "", mode: str = "fast",
+                          strip_outputs: str = "keep",
+                          max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS) -> Tuple[int, int, int, bool]:
+    """
+    Convert one notebook file and write the result (picklable entry point for worker pools)
+
+    Args:
+        ipynb_path: Notebook to read
+        python_path: Python file to write
+        header: Text written before the converted code
+        mode: "fast" (native, nbconvert only as fallback) or "nbconvert"
+        strip_outputs: Output stripping applied after reading (see OUTPUT_MODES)
+        max_output_chars: Longest text output kept with strip_outputs="truncate"
+
+    Returns:
+        Tuple of (number of cells, bytes read, bytes after stripping, whether nbconvert was used in fast mode)
+    """
+    size = os.path.getsize(ipynb_path)
+    if mode == "fast" and IJSON_AVAILABLE and size >= STREAMING_THRESHOLD:
+        # Outputs are never loaded, so there is nothing to strip (the .ipynb itself is not rewritten)
+        try:
+            return stream_convert_notebook_file(ipynb_path, python_path, header), size, size, False
+        except FastConversionUnsupported:
+            pass
+
+    source = Path(ipynb_path).read_text(encoding='utf-8')
+    return convert_notebook_text(source, python_path, header, mode, None, strip_outputs, max_output_chars, size)
+
+
+def convert_notebook_text(source: str, python_path: str, header: str = "", mode: str = "fast",
+                          ipynb_path: Optional[str] = None, strip_outputs: str = "keep",
+                          max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS,
+                          source_bytes: Optional[int] = None) -> Tuple[int, int, int, bool]:
+    """
+    Convert notebook text held in memory and write the result (picklable entry point for worker pools)
+
+    Args:
+        source: Notebook JSON text, e.g. straight from a download
+        python_path: Python file to write
+        header: Text written before the converted code
+        mode: "fast" (native, nbconvert only as fallback) or "nbconvert"
+        ipynb_path: Also store the notebook text here (default: not stored)
+        strip_outputs: Output stripping applied before conversion and storage (see OUTPUT_MODES)
+        max_output_chars: Longest text output kept with strip_outputs="truncate"
+        source_bytes: UTF-8 size of source if the caller knows it (e.g. the file size)
+
+    Returns:
+        Tuple of (number of cells, notebook bytes, bytes after stripping, whether nbconvert was used in fast mode)
+    """
+    size = source_bytes if source_bytes is not None else len(source.encode('utf-8'))
+    kept = size
+    nb = None
+    if strip_outputs != "keep":
+        # Parse once: the stripped notebook feeds both the converter and the stored .ipynb
+        nb = json.loads(source)
+        if strip_notebook_outputs(nb, strip_outputs, max_output_chars):
+            source = dumps_notebook(nb)
+            kept = len(source.encode('utf-8'))
+
+    fell_back = False
+    if mode == "fast":
+        try:
+            python_code, cells = fast_convert_notebook(nb) if nb is not None else fast_convert_notebook_source(source)
+        except FastConversionUnsupported:
+            python_code, cells = convert_notebook_source(source)
+            fell_back = True
+    else:
+        python_code, cells = convert_notebook_source(source)
+    Path(python_path).write_text(header + python_code, encoding='utf-8')
+    if ipynb_path:
+        Path(ipynb_path).write_text(source, encoding='utf-8')
+    return cells, size, kept, fell_back
+
+
+@dataclass
+class ConversionStats:
+    """Counters reported by NotebookConverter.log_summary()"""
+    converted: int = 0
+    failed: int = 0
+    fallbacks: int = 0
+    cells: int = 0
+    bytes_read: int = 0
+    bytes_kept: int = 0
+    seconds: float = 0.0
+
+    @property
+    def notebooks_per_second(self) -> float:
+        return self.converted / self.seconds if self.seconds else 0.0
+
+    def size_summary(self) -> str:
+        """'12.0 MB -> 1.5 MB (-88%)' when outputs were stripped, else ''"""
+        if self.bytes_kept >= self.bytes_read:
+            return ""
+        saved = 1 - self.bytes_kept / self.bytes_read
+        return f"{self.bytes_read / 1024 / 1024:.1f} MB -> {self.bytes_kept / 1024 / 1024:.1f} MB (-{saved:.0%})"
+
+    def summary(self) -> str:
+        fallbacks = f" ({self.fallbacks} via nbconvert)" if self.fallbacks else ""
+        stripped = f", outputs stripped {self.size_summary()}" if self.size_summary() else ""
+        return (f"{self.converted} converted{fallbacks}, {self.failed} failed, {self.cells} cells, "
+                f"{self.bytes_read / 1024 / 1024:.1f} MB in {self.seconds:.1f}s "
+                f"({self.notebooks_per_second:.1f} notebooks/s){stripped}")
+
+
+class NotebookConverter:
+    """
+    Runs notebook -> Python conversion off the event loop.
+
+    In "fast" mode notebooks are converted natively (see
+    fast_convert_notebook_source()) and only the ones it cannot reproduce exactly
+    go through nbconvert; "nbconvert" mode always uses PythonExporter.
+
+    With workers > 0 conversions run in a process pool; every worker builds one
+    PythonExporter (when it needs one) and reuses it for all notebooks it
+    converts. With workers=0 they run in a thread of this process. The pool is
+    started on first use and stopped by close().
+
+    Example:
+        converter = NotebookConverter(workers=4)
+        stats = await converter.convert_directory(Path("notebooks"))
+        converter.close()
+    """
+
+    def __init__(self, workers: Optional[int] = None, mode: str = "fast", strip_outputs: str = "keep",
+                 max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS, dev_mode: bool = False):
+        """
+        Initialize the converter
+
+        Args:
+            workers: Worker processes (None = one per CPU, 0 = convert in a thread)
+            mode: "fast" or "nbconvert"
+            strip_outputs: "keep", "images", "truncate" or "all" (see notebook_outputs)
+            max_output_chars: Longest text output kept with strip_outputs="truncate"
+            dev_mode: Enable development mode with detailed logging
+        """
+        if mode not in CONVERTER_MODES:
+            raise ValueError(f"mode must be one of {', '.join(CONVERTER_MODES)}")
+        if strip_outputs not in OUTPUT_MODES:
+            raise ValueError(f"strip_outputs must be one of {', '.join(OUTPUT_MODES)}")
+        self.mode = mode
+        self.strip_outputs = strip_outputs
+        self.max_output_chars = max_output_chars
+        self.workers = workers if workers is None else max(0, workers)
+        self.dev_mode = dev_mode
+        self.stats = ConversionStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def streams_large_files(self) -> bool:
+        """Whether convert() handles notebooks of STREAMING_THRESHOLD bytes or more without loading them"""
+        return self.mode == "fast" and IJSON_AVAILABLE
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 0:
+            return None
+        if self._executor is None:
+            # Fast mode builds an exporter lazily, only in workers that hit a fallback
+            initializer = _get_exporter if self.mode == "nbconvert" else None
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=initializer)
+        return self._executor
+
+    async def convert(self, ipynb_path: Path, python_path: Path, header: str = "") -> bool:
+        """
+        Convert a notebook file to a Python file
+
+        Args:
+            ipynb_path: Notebook to read
+            python_path: Python file to write
+            header: Text written before the converted code
+
+        Returns:
+            bool: Success status
+        """
+        return await self._run(ipynb_path, convert_notebook_file, str(ipynb_path), str(python_path), header, self.mode,
+                               self.strip_outputs, self.max_output_chars)
+
+    async def convert_source(self, source: str, python_path: Path, header: str = "",
+                             ipynb_path: Optional[Path] = None) -> bool:
+        """
+        Convert notebook text held in memory (no intermediate .ipynb on disk)
+
+        Args:
+            source: Notebook JSON text
+            python_path: Python file to write
+            header: Text written before the converted code
+            ipynb_path: Also store the notebook text here (default: not stored)
+
+        Returns:
+            bool: Success status
+        """
+        return await self._run(python_path, convert_notebook_text, source, str(python_path), header, self.mode,
+                               str(ipynb_path) if ipynb_path else None, self.strip_outputs, self.max_output_chars)
+
+    async def _run(self, label: Path, function, *args) -> bool:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            cells, size, kept, fell_back = await loop.run_in_executor(self._get_executor(), function, *args)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Error converting {label}: {e}")
+            return False
+
+        self.stats.converted += 1
+        self.stats.fallbacks += fell_back
+        self.stats.cells += cells
+        self.stats.bytes_read += size
+        self.stats.bytes_kept += kept
+        if self.dev_mode:
+            stripped = f", {size} -> {kept} bytes" if kept < size else ""
+            logger.debug(f"Converted {label} ({cells} cells{stripped}) in {time.monotonic() - started:.2f}s")
+        return True
+
+    async def convert_directory(self, input_dir: Path, output_dir: Optional[Path] = None,
+                                pattern: str = "*.ipynb") -> ConversionStats:
+        """
+        Convert every notebook in a directory
+
+        Args:
+            input_dir: Directory to search (recursively) for notebooks
+            output_dir: Where to write the .py files, mirroring the input layout (default: next to each notebook)
+            pattern: Glob for notebook files
+
+        Returns:
+            ConversionStats for this batch
+        """
+        input_dir = Path(input_dir)
+        notebooks: List[Path] = sorted(input_dir.rglob(pattern))
+        before = ConversionStats(**vars(self.stats))
+        started = time.monotonic()
+
+        async def convert_one(ipynb_path: Path) -> bool:
+            if output_dir is None:
+                python_path = ipynb_path.with_suffix('.py')
+            else:
+                python_path = Path(output_dir) / ipynb_path.relative_to(input_dir).with_suffix('.py')
+                python_path.parent.mkdir(parents=True, exist_ok=True)
+            return await self.convert(ipynb_path, python_path)
+
+        await asyncio.gather(*(convert_one(path) for path in notebooks))
+        elapsed = time.monotonic() - started
+        self.stats.seconds += elapsed
+
+        batch = ConversionStats(
+            converted=self.stats.converted - before.converted,
+            failed=self.stats.failed - before.failed,
+            fallbacks=self.stats.fallbacks - before.fallbacks,
+            cells=self.stats.cells - before.cells,
+            bytes_read=self.stats.bytes_read - before.bytes_read,
+            bytes_kept=self.stats.bytes_kept - before.bytes_kept,
+            seconds=elapsed,
+        )
+        logger.info(f"Converted {input_dir}: {batch.summary()}")
+        return batch
+
+    def log_summary(self):
+        """Log conversion counts (throughput is reported by convert_directory())"""
+        if self.stats.converted or self.stats.failed:
+            logger.info(f"Notebook conversion: {self.stats.converted} converted, {self.stats.failed} failed, "
+                        f"{self.stats.cells} cells")
+            if self.stats.size_summary():
+                logger.info(f"Notebook outputs stripped ({self.strip_outputs}): {self.stats.size_summary()}")
+
+    def close(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -6,13 +6,12 @@ Downloads notebooks from Kaggle competitions and converts them to Python files
 
 import sys
 import asyncio
-import json
 import re
+import time
 import logging
-import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 from urllib.parse import urljoin
 
@@ -21,13 +20,113 @@ logger = logging.getLogger(__name__)
 
 # Check for dependencies
 try:
-    from playwright.async_api import async_playwright, Page
+    from playwright.async_api import Page
     import nbformat
-    from nbconvert import PythonExporter
+    import nbconvert
 except ImportError as e:
     logger.error(f"Missing dependencies: {e}. Please run: pip install nbformat nbconvert")
     sys.exit(1)
 
+from .browser_pool import BrowserPool, browser_session
+from .readiness import ReadinessEngine
+from .resource_blocking import ResourceBlockingPolicy
+from .rate_limiter import RateLimiter, is_throttle_status
+from .download_pool import NotebookDownloadPool, run_kaggle_command
+from .notebook_converter import NotebookConverter, read_notebook_sources
+from .notebook_cache import NotebookCache
+from .cell_store import CellStore
+from .kaggle_client import DEFAULT_BASE_URL, KaggleApiClient, KaggleApiError, KaggleCredentialsError
+
+KAGGLE_BACKENDS = ("auto", "api", "cli")
+
+# Friendly sort names -> Kaggle API sortBy values (API values are accepted as well)
+NOTEBOOK_SORT_OPTIONS = {
+    "votes": "voteCount",
+    "recent": "dateRun",
+    "created": "dateCreated",
+    "comments": "commentCount",
+    "views": "viewCount",
+    "hotness": "hotness",
+    "score": "scoreDescending",
+}
+
+
+NOTEBOOK_LINK_SELECTOR = 'a[href*="/code/"]'
+# How long one scroll of the notebook listing may take to attach new cards
+SCROLL_IDLE_MS = 3000
+MAX_SCROLLS = 100
+
+# Returns the links attached since the previous call and marks them, so every card is read once
+_COLLECT_NEW_LINKS_JS = '''
+    (selector) => Array.from(document.querySelectorAll(`${selector}:not([data-kde-read])`)).map(link => {
+        link.setAttribute('data-kde-read', '');
+        const author = link.parentElement && link.parentElement.querySelector('[class*="author"], .username');
+        return {
+            href: link.getAttribute('href'),
+            text: link.textContent,
+            author: author ? author.textContent : null
+        };
+    })
+'''
+
+# Scrolls to the bottom and resolves true as soon as unread links are attached, false after idleMs
+_SCROLL_AND_WAIT_JS = '''
+    ([selector, idleMs]) => new Promise(resolve => {
+        const unread = `${selector}:not([data-kde-read])`;
+        if (document.querySelector(unread)) {
+            resolve(true);
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            if (document.querySelector(unread)) {
+                finish(true);
+            }
+        });
+        const timer = setTimeout(() => finish(false), idleMs);
+        function finish(found) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(found);
+        }
+        observer.observe(document.body, { childList: true, subtree: true });
+        window.scrollTo(0, document.body.scrollHeight);
+    })
+'''
+
+
+def kernel_ref(notebook_url: str) -> str:
+    """'https://www.kaggle.com/code/owner/kernel/comments' -> 'owner/kernel'"""
+    path = notebook_url.split('?')[0].split('#')[0].rstrip('/')
+    if '/code/' not in path:
+        return ""
+    parts = path.split('/code/', 1)[1].split('/')
+    return '/'.join(parts[:2]) if len(parts) >= 2 else ""
+
+
+def notebook_filename(ref: str, title: str = "") -> str:
+    """Stable output filename: derived from the kernel ref, not the title or the date"""
+    name = ref.replace('/', '_') if ref else title
+    return re.sub(r'[<>:"/\\|?*\s]', '_', name) + '.py'
+
+
+def _listing_date(last_run: str) -> str:
+    """'2024-09-18 12:00:00' / '2024-09-18T12:00:00Z' -> '240918' (today when unknown)"""
+    try:
+        return datetime.strptime(last_run[:10], "%Y-%m-%d").strftime("%y%m%d")
+    except (TypeError, ValueError):
+        return datetime.now().strftime("%y%m%d")
+
+
+def resolve_sort_option(sort_by: Optional[str]) -> Optional[str]:
+    """Map a sort name to the API's sortBy value"""
+    if not sort_by:
+        return None
+    if sort_by in NOTEBOOK_SORT_OPTIONS:
+        return NOTEBOOK_SORT_OPTIONS[sort_by]
+    if sort_by in NOTEBOOK_SORT_OPTIONS.values() or sort_by in ("relevance", "scoreAscending"):
+        return sort_by
+    raise ValueError(f"Unknown notebook sort order '{sort_by}', expected one of {', '.join(NOTEBOOK_SORT_OPTIONS)}")
+
 
 @dataclass
 class NotebookInfo:
@@ -39,12 +138,22 @@ class NotebookInfo:
     votes: int = 0
     comments: int = 0
     filename: str = ""
+    ref: str = ""
+    version: str = ""
 
 
 class KaggleNotebookDownloader:
     """Downloads and converts Kaggle notebooks to Python files"""
 
-    def __init__(self, dev_mode: bool = False, headless: bool = True, extraction_attempts: int = 1):
+    def __init__(self, dev_mode: bool = False, headless: bool = True, extraction_attempts: int = 1,
+                 browser_pool: Optional[BrowserPool] = None,
+                 resource_policy: Optional[ResourceBlockingPolicy] = None,
+                 record_har: Optional[str] = None, replay_har: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None, download_workers: int = 4,
+                 download_timeout: float = 60.0, kaggle_backend: str = "auto",
+                 api_base_url: str = DEFAULT_BASE_URL, convert_workers: Optional[int] = None,
+                 converter_mode: str = "fast", keep_ipynb: bool = True, use_cache: bool = True,
+                 strip_outputs: str = "keep", cell_store: Optional[CellStore] = None):
         """
         Initialize the notebook downloader
 
@@ -52,10 +161,66 @@ class KaggleNotebookDownloader:
             dev_mode: Enable development mode with detailed logging
             headless: Run browser in headless mode
             extraction_attempts: Number of times to retry URL extraction logic (default: 1)
+            browser_pool: Shared BrowserPool to reuse across calls (default: one browser per call)
+            resource_policy: Opt-in request blocking policy (ignored when browser_pool has its own)
+            record_har: Directory to record browser traffic of the listing scrape into as HAR archives
+            replay_har: Directory of recorded HAR archives to replay the listing scrape from
+                (both ignored when browser_pool is given)
+            rate_limiter: Limiter every navigation and `kaggle` CLI call goes through; share one
+                instance with the discussion extractor to apply a single budget (default: 1 request/s,
+                unlimited when replaying HAR archives)
+            download_workers: Number of notebooks downloaded and converted in parallel
+            download_timeout: Seconds before a single `kaggle kernels pull` is killed
+            kaggle_backend: "api" calls the Kaggle API in-process, "cli" spawns the `kaggle`
+                CLI per call, "auto" uses the API when credentials are found and falls back
+                to the CLI when an API call fails
+            api_base_url: Kaggle API root for the in-process backend
+            convert_workers: Processes converting notebooks to Python (None = one per CPU,
+                0 = convert in a thread); call close() to stop them
+            converter_mode: "fast" converts natively (same output as nbconvert, which is
+                only used for notebooks the fast path cannot reproduce); "nbconvert" always
+                uses nbconvert's PythonExporter
+            keep_ipynb: Also store the original .ipynb next to the .py file
+            use_cache: Skip notebooks whose listed version was already downloaded (see NotebookCache)
+            strip_outputs: Cell outputs removed before the notebook is converted and stored:
+                "keep", "images", "truncate" (images + long text) or "all"
+            cell_store: Also add every downloaded notebook to this deduplicating CellStore
+                (the caller owns it and closes it)
         """
+        if record_har and replay_har:
+            raise ValueError("record_har and replay_har cannot be used together")
+        if kaggle_backend not in KAGGLE_BACKENDS:
+            raise ValueError(f"kaggle_backend must be one of {', '.join(KAGGLE_BACKENDS)}")
+
         self.dev_mode = dev_mode
         self.headless = headless
+        self.browser_pool = browser_pool
+        self.readiness = ReadinessEngine(dev_mode=dev_mode)
+        self.resource_policy = resource_policy
+        self.record_har = record_har
+        self.replay_har = replay_har
+        # Replayed responses come from local archives, so there is nothing to throttle
+        self.rate_limiter = rate_limiter or RateLimiter(rate=None if replay_har else 1.0, dev_mode=dev_mode)
         self.extraction_attempts = max(1, extraction_attempts)  # Ensure at least 1 attempt
+        self.keep_ipynb = keep_ipynb
+        self.use_cache = use_cache
+        self.cell_store = cell_store
+        self.converter = NotebookConverter(workers=convert_workers, mode=converter_mode, strip_outputs=strip_outputs,
+                                           dev_mode=dev_mode)
+        self.kaggle_backend = kaggle_backend
+        self.api_client = None
+        if kaggle_backend != "cli":
+            try:
+                self.api_client = KaggleApiClient(base_url=api_base_url, pool_size=download_workers,
+                                                  rate_limiter=self.rate_limiter, dev_mode=dev_mode)
+            except KaggleCredentialsError as e:
+                if kaggle_backend == "api":
+                    raise
+                if dev_mode:
+                    logger.debug(f"In-process Kaggle API unavailable, using the kaggle CLI: {e}")
+        self.download_pool = NotebookDownloadPool(workers=download_workers, timeout=download_timeout,
+                                                  rate_limiter=self.rate_limiter, client=self.api_client,
+                                                  cli_fallback=kaggle_backend == "auto", dev_mode=dev_mode)
 
         # Setup logging based on mode
         log_level = logging.DEBUG if dev_mode else logging.INFO
@@ -67,275 +232,310 @@ class KaggleNotebookDownloader:
         if dev_mode:
             logger.info("Development mode enabled - detailed logging active")
 
-    async def extract_notebook_list(self, competition_url: str, limit: Optional[int] = None) -> List[NotebookInfo]:
+    async def extract_notebook_list(self, competition_url: str, limit: Optional[int] = None,
+                                    sort_by: Optional[str] = None) -> List[NotebookInfo]:
         """
         Extract notebook list from competition using Kaggle API (primary) or web scraping (fallback)
 
         Args:
             competition_url: Competition URL (e.g., https://www.kaggle.com/competitions/neurips-2025)
             limit: Maximum number of notebooks to extract
+            sort_by: Listing order, see NOTEBOOK_SORT_OPTIONS (default: Kaggle's default order)
 
         Returns:
             List of NotebookInfo objects
         """
-        # First try Kaggle API (more reliable)
+        return [notebook async for notebook in self.iter_notebooks(competition_url, limit, sort_by)]
+
+    async def iter_notebooks(self, competition_url: str, limit: Optional[int] = None,
+                             sort_by: Optional[str] = None, page_size: int = 100) -> AsyncIterator[NotebookInfo]:
+        """
+        Yield a competition's notebooks page by page as they are listed
+
+        The Kaggle API (or CLI) is paged until a short page or `limit` is reached,
+        so a caller can start downloading while later pages are still loading.
+        If the first page cannot be listed (the API call raised), the web scraper
+        is used instead.
+
+        Args:
+            competition_url: Competition URL
+            limit: Maximum number of notebooks to yield
+            sort_by: Listing order, see NOTEBOOK_SORT_OPTIONS (e.g. "votes" for top-K by votes)
+            page_size: Notebooks requested per API page
+
+        Yields:
+            NotebookInfo objects in listing order
+        """
+        api_sort = resolve_sort_option(sort_by)
+        count = 0
+        api_failed = False
         try:
-            api_notebooks = await self._extract_via_kaggle_api(competition_url, limit)
-            if api_notebooks:
-                logger.info(f"Found {len(api_notebooks)} notebooks via Kaggle API")
-                return api_notebooks
+            async for notebook in self._iter_via_kaggle_api(competition_url, limit, api_sort, page_size):
+                count += 1
+                yield notebook
         except Exception as e:
+            if count:
+                # Keep what was listed; the pages already yielded cannot be taken back
+                logger.warning(f"Notebook listing stopped after {count} notebooks: {e}")
+                return
+            api_failed = True
             if self.dev_mode:
                 logger.warning(f"Kaggle API failed, falling back to web scraping: {e}")
 
+        if not api_failed:
+            # An empty listing is an answer (no public notebooks yet), not a reason to scrape
+            logger.info(f"Found {count} notebooks via Kaggle API")
+            return
+
         # Fallback to web scraping
-        return await self._extract_via_web_scraping(competition_url, limit)
+        if sort_by and self.dev_mode:
+            logger.debug(f"Web scraping ignores sort order '{sort_by}'")
+        async for notebook in self._iter_via_web_scraping(competition_url, limit):
+            yield notebook
 
-    async def _extract_via_kaggle_api(self, competition_url: str, limit: Optional[int] = None) -> List[NotebookInfo]:
+    async def _extract_via_kaggle_api(self, competition_url: str, limit: Optional[int] = None,
+                                      sort_by: Optional[str] = None) -> List[NotebookInfo]:
         """Extract notebooks using Kaggle API"""
-        try:
-            # Extract competition slug from URL
-            competition_slug = competition_url.rstrip('/').split('/')[-1]
-
-            import subprocess
-            import csv
-            import io
-
-            # Use Kaggle CLI to list kernels
-            page_size = min(limit or 200, 200)  # Max 200 per API
-            cmd = [
-                'kaggle', 'kernels', 'list',
-                '--competition', competition_slug,
-                '--page-size', str(page_size),
-                '--csv'
-            ]
-
-            if self.dev_mode:
-                logger.debug(f"Running Kaggle API command: {' '.join(cmd)}")
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode != 0:
-                raise Exception(f"Kaggle API error: {result.stderr}")
-
-            # Parse CSV output
-            csv_reader = csv.DictReader(io.StringIO(result.stdout))
-            notebooks = []
-
-            for i, row in enumerate(csv_reader):
-                if limit and i >= limit:
-                    break
-
-                # Extract data from API response
+        return [notebook async for notebook in
+                self._iter_via_kaggle_api(competition_url, limit, resolve_sort_option(sort_by))]
+
+    async def _iter_via_kaggle_api(self, competition_url: str, limit: Optional[int] = None,
+                                   sort_by: Optional[str] = None, page_size: int = 100) -> AsyncIterator[NotebookInfo]:
+        """Page through the Kaggle API listing, yielding NotebookInfo objects"""
+        # Extract competition slug from URL
+        competition_slug = competition_url.rstrip('/').split('/')[-1]
+        page_size = max(1, min(page_size, limit or page_size, 100))
+
+        seen_refs = set()
+        page = 1
+        while True:
+            rows = await self._list_kernels_page(competition_slug, page, page_size, sort_by)
+
+            for row in rows:
                 ref = row.get('ref', '')
-                title = row.get('title', 'Unknown Title')
-                author = row.get('author', 'Unknown Author')
-                last_run = row.get('lastRunTime', '')
-                votes = int(row.get('totalVotes', 0))
-
-                # Build notebook URL
-                notebook_url = f"https://www.kaggle.com/code/{ref}"
-
-                # Generate filename
-                safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
-                filename = f"{safe_title}_{datetime.now().strftime('%y%m%d')}.py"
+                # Rankings can shift between page requests; never yield a notebook twice
+                if not ref or ref in seen_refs:
+                    continue
+                seen_refs.add(ref)
 
-                notebook = NotebookInfo(
-                    title=title,
-                    url=notebook_url,
-                    author=author,
-                    last_updated=datetime.now().strftime("%y%m%d"),
-                    votes=votes,
-                    filename=filename
-                )
+                notebook = self._notebook_from_api_row(row)
+                if self.dev_mode:
+                    logger.debug(f"Found notebook via API: {notebook.title} by {notebook.author}")
+                yield notebook
 
-                notebooks.append(notebook)
+                if limit and len(seen_refs) >= limit:
+                    return
 
-                if self.dev_mode:
-                    logger.debug(f"Found notebook via API: {title} by {author}")
+            if len(rows) < page_size:
+                return
+            page += 1
 
-            return notebooks
+    async def _list_kernels_page(self, competition_slug: str, page: int, page_size: int,
+                                 sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One listing page as dicts with ref/title/author/lastRunTime/totalVotes"""
+        if self.api_client:
+            try:
+                return await self.api_client.list_kernels(competition_slug, page_size=page_size, page=page,
+                                                          sort_by=sort_by)
+            except KaggleApiError as e:
+                if (400 <= e.status < 500 and not is_throttle_status(e.status)) or self.kaggle_backend == "api":
+                    # The CLI would get the same answer
+                    raise
+                logger.warning(f"API listing failed ({e}), retrying with the kaggle CLI")
+            except Exception as e:
+                if self.kaggle_backend == "api":
+                    raise
+                logger.warning(f"API listing failed ({e}), retrying with the kaggle CLI")
+
+        import csv
+        import io
+
+        # Use Kaggle CLI to list kernels
+        cmd = [
+            'kernels', 'list',
+            '--competition', competition_slug,
+            '--page-size', str(page_size),
+            '--page', str(page),
+            '--csv'
+        ]
+        if sort_by:
+            cmd += ['--sort-by', sort_by]
 
-        except Exception as e:
-            if self.dev_mode:
-                logger.warning(f"Kaggle API extraction failed: {e}")
-            raise e
+        if self.dev_mode:
+            logger.debug(f"Running Kaggle API command: kaggle {' '.join(cmd)}")
+
+        await self.rate_limiter.acquire()
+        returncode, stdout, stderr = await run_kaggle_command(cmd, timeout=30)
+
+        if returncode != 0:
+            self.rate_limiter.report_cli_output(stderr + stdout)
+            raise Exception(f"Kaggle API error: {stderr}")
+
+        # Parse CSV output ("No kernels found" past the last page has no ref column)
+        return [row for row in csv.DictReader(io.StringIO(stdout)) if row.get('ref')]
+
+    def _notebook_from_api_row(self, row: Dict[str, Any]) -> NotebookInfo:
+        """Build a NotebookInfo from an API/CLI listing row"""
+        ref = row.get('ref', '')
+        title = row.get('title') or 'Unknown Title'
+        author = row.get('author') or 'Unknown Author'
+        votes = int(row.get('totalVotes') or 0)
+        last_run = str(row.get('lastRunTime') or '')
+
+        return NotebookInfo(
+            title=title,
+            url=f"https://www.kaggle.com/code/{ref}",
+            author=author,
+            last_updated=_listing_date(last_run),
+            votes=votes,
+            filename=notebook_filename(ref, title),
+            ref=ref,
+            # The listing CSV has no version number; a new run of the notebook changes lastRunTime
+            version=str(row.get('currentVersionNumber') or last_run)
+        )
 
     async def _extract_via_web_scraping(self, competition_url: str, limit: Optional[int] = None) -> List[NotebookInfo]:
         """Extract notebooks using web scraping (fallback method)"""
+        return [notebook async for notebook in self._iter_via_web_scraping(competition_url, limit)]
+
+    async def _iter_via_web_scraping(self, competition_url: str,
+                                     limit: Optional[int] = None) -> AsyncIterator[NotebookInfo]:
+        """Scrape the competition's code page, yielding notebooks while the listing keeps scrolling"""
         # Ensure URL ends with /code
         if not competition_url.endswith('/code'):
             competition_url = competition_url.rstrip('/') + '/code'
 
         logger.info(f"Extracting notebooks from: {competition_url}")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
-
+        async with browser_session(self.browser_pool, self.headless, self.dev_mode,
+                                   resource_policy=self.resource_policy, record_har_dir=self.record_har,
+                                   replay_har_dir=self.replay_har) as pool:
+            blocking_snapshot = pool.resource_policy.stats.copy() if pool.resource_policy else None
             try:
-                # Load competition code page
-                await page.goto(competition_url, wait_until="domcontentloaded")
-                await asyncio.sleep(5)  # Wait for initial load
-
-                # Handle lazy loading
-                await self._handle_lazy_loading(page, limit or 50)
-
-                # Extract notebook links and metadata
-                notebooks = await self._extract_notebooks_from_page(page, limit)
-
-                return notebooks
+                async with pool.page() as page:
+                    # Load competition code page
+                    await self.rate_limiter.goto(page, competition_url, wait_until="domcontentloaded")
+                    await self.readiness.wait(page, 'notebook_listing')
 
+                    async for notebook in self._scroll_notebooks(page, limit):
+                        yield notebook
             finally:
-                await browser.close()
+                if pool.resource_policy:
+                    pool.resource_policy.log_summary(since=blocking_snapshot)
 
-    async def _handle_lazy_loading(self, page, target_limit):
-        """Handle infinite scroll lazy loading to extract all possible notebooks"""
-        try:
-            previous_notebook_count = 0
-            consecutive_no_change = 0
-            max_scrolls = 20  # Reduced for efficiency
-            scroll_attempts = 0
+    async def _scroll_notebooks(self, page: Page, limit: Optional[int] = None, idle_ms: int = SCROLL_IDLE_MS,
+                                max_scrolls: int = MAX_SCROLLS) -> AsyncIterator[NotebookInfo]:
+        """
+        Yield notebooks from an infinite-scroll listing as their cards appear
 
-            if self.dev_mode:
-                logger.debug(f"Starting lazy loading to find up to {target_limit} notebooks")
+        Each round reads only the links added since the previous round (read
+        links are marked in the page), then scrolls and waits until new links
+        are attached - a MutationObserver, not a fixed sleep - or idle_ms pass.
+        Stops as soon as `limit` notebooks were yielded, or when two rounds in a
+        row bring no new notebook.
 
-            while scroll_attempts < max_scrolls and consecutive_no_change < 3:
-                scroll_attempts += 1
+        Args:
+            page: Page showing the notebook listing
+            limit: Maximum number of notebooks to yield
+            idle_ms: How long a scroll may take to load more cards
+            max_scrolls: Safety cap on scroll rounds
 
-                # Scroll down to trigger lazy loading
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await asyncio.sleep(3)
+        Yields:
+            NotebookInfo objects in page order
+        """
+        seen_urls = set()
+        count = 0
+        scrolls = 0
+        idle_rounds = 0
 
-                # Count current notebook links
-                current_links = await page.query_selector_all('a[href*="/code/"]')
-                current_count = len([link for link in current_links if link])
+        try:
+            while True:
+                links = await page.evaluate(_COLLECT_NEW_LINKS_JS, NOTEBOOK_LINK_SELECTOR)
+                found = 0
+                for link in links:
+                    notebook = self._notebook_from_link(link, seen_urls)
+                    if notebook is None:
+                        continue
+                    found += 1
+                    count += 1
+                    if self.dev_mode:
+                        logger.debug(f"Found notebook: {notebook.title} by {notebook.author}")
+                    yield notebook
+                    if limit and count >= limit:
+                        return
+
+                idle_rounds = idle_rounds + 1 if scrolls and not found else 0
+                if idle_rounds >= 2 or scrolls >= max_scrolls:
+                    break
 
+                scrolls += 1
+                started = time.monotonic()
+                loaded = await page.evaluate(_SCROLL_AND_WAIT_JS, [NOTEBOOK_LINK_SELECTOR, idle_ms])
                 if self.dev_mode:
-                    logger.debug(f"Scroll {scroll_attempts}: Found {current_count} notebook links")
-
-                # Check if we found new content
-                if current_count > previous_notebook_count:
-                    consecutive_no_change = 0
-                    previous_notebook_count = current_count
-
-                    # If we've reached our target, we can stop
-                    if target_limit and current_count >= target_limit * 2:
-                        break
-                else:
-                    consecutive_no_change += 1
+                    logger.debug(f"Scroll {scrolls}: {'new cards' if loaded else 'nothing new'} after "
+                                 f"{time.monotonic() - started:.2f}s, {count} notebooks so far")
 
         except Exception as e:
+            # Keep what was already yielded
             if self.dev_mode:
                 logger.warning(f"Error during lazy loading: {e}")
 
-    async def _extract_notebooks_from_page(self, page: Page, limit: Optional[int] = None) -> List[NotebookInfo]:
-        """Extract notebook information from the current page state"""
-        notebooks = []
-
-        # Find notebook links
-        notebook_links = await page.query_selector_all('a[href*="/code/"]')
-
-        if self.dev_mode:
-            logger.debug(f"Found {len(notebook_links)} potential notebook links")
-
-        # Process each notebook link
-        seen_urls = set()
-        for link in notebook_links:
-            try:
-                href = await link.get_attribute('href')
-                if not href or '/code/' not in href or '?scriptVersionId' in href:
-                    continue
-
-                # Skip comment links completely
-                if href.endswith('/comments'):
-                    continue
-
-                # Make absolute URL
-                notebook_url = urljoin('https://www.kaggle.com', href)
-
-                # Skip duplicates
-                if notebook_url in seen_urls:
-                    continue
-                seen_urls.add(notebook_url)
-
-                # Extract metadata
-                title = await self._extract_notebook_title(link)
-                author = await self._extract_notebook_author(link)
-                last_updated = datetime.now().strftime("%y%m%d")
-
-                # Generate safe filename
-                safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)
-                filename = f"{safe_title}_{last_updated}.py"
-
-                notebook = NotebookInfo(
-                    title=title,
-                    url=notebook_url,
-                    author=author,
-                    last_updated=last_updated,
-                    votes=0,
-                    filename=filename
-                )
-
-                notebooks.append(notebook)
-
-                if self.dev_mode:
-                    logger.debug(f"Found notebook: {title} by {author}")
-
-                # Apply limit
-                if limit and len(notebooks) >= limit:
-                    break
-
-            except Exception as e:
-                if self.dev_mode:
-                    logger.warning(f"Error processing notebook link: {e}")
-                continue
-
-        logger.info(f"Found {len(notebooks)} notebooks")
-        return notebooks
-
-    async def _extract_notebook_title(self, element) -> str:
-        """Extract notebook title from element"""
-        try:
-            # Try to get text content first (more descriptive)
-            text = await element.text_content()
-            if text and text.strip() and len(text.strip()) > 3:
-                clean_text = text.strip()
-                # Filter out generic terms
-                if not any(word in clean_text.lower() for word in ['comments', 'vote', 'ago']):
-                    return clean_text[:50]
-
-            # Fallback: get title from URL
-            href = await element.get_attribute('href')
-            if href and not href.endswith('/comments'):
-                parts = href.split('/')
-                if len(parts) >= 2:
-                    notebook_name = parts[-1]
-                    title_from_url = notebook_name.replace('-', ' ').title()
-                    if len(title_from_url) > 3:
-                        return title_from_url[:50]
-
-            return "Unknown Notebook"
-
-        except:
-            return "Unknown Notebook"
-
-    async def _extract_notebook_author(self, element) -> str:
-        """Extract notebook author from element"""
-        try:
-            # Look for author in parent elements
-            parent = await element.query_selector('xpath=..')
-            if parent:
-                author_elem = await parent.query_selector('[class*="author"], .username')
-                if author_elem:
-                    author = await author_elem.text_content()
-                    if author and author.strip():
-                        return author.strip()
-
-            return "unknown"
+        finally:
+            logger.info(f"Found {count} notebooks")
+
+    def _notebook_from_link(self, link: Dict[str, Any], seen_urls: set) -> Optional[NotebookInfo]:
+        """NotebookInfo for a link read by _COLLECT_NEW_LINKS_JS (None for non-notebook links and duplicates)"""
+        href = link.get('href')
+        if not href or '/code/' not in href or '?scriptVersionId' in href:
+            return None
+
+        # Skip comment links completely
+        if href.endswith('/comments'):
+            return None
+
+        # Make absolute URL
+        notebook_url = urljoin('https://www.kaggle.com', href)
+
+        # Skip duplicates
+        if notebook_url in seen_urls:
+            return None
+        seen_urls.add(notebook_url)
+
+        title = self._notebook_title(link.get('text'), href)
+        author = (link.get('author') or '').strip() or "unknown"
+        ref = kernel_ref(notebook_url)
+
+        # The listing page shows no version, so scraped notebooks are never cache hits
+        return NotebookInfo(
+            title=title,
+            url=notebook_url,
+            author=author,
+            last_updated=datetime.now().strftime("%y%m%d"),
+            votes=0,
+            filename=notebook_filename(ref, title),
+            ref=ref
+        )
 
-        except:
-            return "unknown"
+    @staticmethod
+    def _notebook_title(text: Optional[str], href: str) -> str:
+        """Notebook title from a link's text, or from its URL"""
+        # Try the text content first (more descriptive)
+        if text and text.strip() and len(text.strip()) > 3:
+            clean_text = text.strip()
+            # Filter out generic terms
+            if not any(word in clean_text.lower() for word in ['comments', 'vote', 'ago']):
+                return clean_text[:50]
+
+        # Fallback: get title from URL
+        if href and not href.endswith('/comments'):
+            parts = href.split('/')
+            if len(parts) >= 2:
+                notebook_name = parts[-1]
+                title_from_url = notebook_name.replace('-', ' ').title()
+                if len(title_from_url) > 3:
+                    return title_from_url[:50]
+
+        return "Unknown Notebook"
 
     async def download_and_convert_notebook(self, notebook: NotebookInfo, output_dir: Path) -> bool:
         """
@@ -354,12 +554,34 @@ class KaggleNotebookDownloader:
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Download via Kaggle API
-            success = await self._download_via_kaggle_api(notebook, output_dir)
+            python_file = output_dir / notebook.filename
+            ipynb_file = output_dir / notebook.filename.replace('.py', '.ipynb') if self.keep_ipynb else None
+
+            # Download into memory, then convert once: the .py (and the .ipynb if kept) are the only writes.
+            # Notebooks above the streaming threshold are left on disk instead and converted cell by cell;
+            # the kept .ipynb is then the downloaded file, so only when no output stripping must rewrite it
+            spool_file = None
+            if self.converter.streams_large_files and (ipynb_file is None or self.converter.strip_outputs == "keep"):
+                spool_file = ipynb_file or output_dir / f".{notebook.filename}.download.ipynb"
+
+            source = await self._download_via_kaggle_api(notebook, spool_file)
+            success = source is not None
 
             if success:
-                # Convert notebook to Python
-                success = self._convert_notebook_to_python_file(notebook, output_dir)
+                # Convert notebook to Python (off the event loop so downloads keep flowing)
+                header = self._python_header(notebook)
+                if isinstance(source, Path):
+                    try:
+                        success = await self.converter.convert(source, python_file, header)
+                        if success and self.cell_store is not None:
+                            await self._add_to_cell_store(notebook, source, header)
+                    finally:
+                        if source != ipynb_file and source.exists():
+                            source.unlink()
+                else:
+                    success = await self.converter.convert_source(source, python_file, header, ipynb_path=ipynb_file)
+                    if success and self.cell_store is not None:
+                        await self._add_to_cell_store(notebook, source, header)
 
             if success:
                 logger.info(f"Successfully processed: {notebook.title}")
@@ -372,8 +594,28 @@ class KaggleNotebookDownloader:
             logger.error(f"Error processing {notebook.title}: {e}")
             return False
 
-    async def _download_via_kaggle_api(self, notebook: NotebookInfo, output_dir: Path) -> bool:
-        """Download notebook using Kaggle API"""
+    async def _add_to_cell_store(self, notebook: NotebookInfo, source: Union[str, Path], header: str):
+        """Store the notebook's cells (parsing and SQLite writes run off the event loop)"""
+        ref = notebook.ref or kernel_ref(notebook.url)
+        loop = asyncio.get_running_loop()
+
+        def add():
+            # A notebook left on disk is read without its outputs (the store does not keep them)
+            nb = read_notebook_sources(source) if isinstance(source, Path) else source
+            return self.cell_store.add_notebook(ref, nb, header=header, title=notebook.title, url=notebook.url,
+                                                version=notebook.version)
+
+        try:
+            new_cells = await loop.run_in_executor(None, add)
+            if self.dev_mode:
+                logger.debug(f"Cell store: {notebook.title} added {new_cells} new cells")
+        except Exception as e:
+            # The .py is already written; a store failure does not fail the download
+            logger.warning(f"Could not add {notebook.title} to the cell store: {e}")
+
+    async def _download_via_kaggle_api(self, notebook: NotebookInfo,
+                                       spool_file: Optional[Path] = None) -> Optional[Union[str, Path]]:
+        """Download notebook using Kaggle API, returning its JSON text (or spool_file, see NotebookDownloadPool.fetch())"""
         try:
             # Extract username/kernel_name from URL
             # Clean URL by removing /comments suffix if present
@@ -381,80 +623,22 @@ class KaggleNotebookDownloader:
             url_parts = clean_url.split('/')
             if len(url_parts) < 5 or '/code/' not in clean_url:
                 logger.error(f"Invalid notebook URL format: {clean_url}")
-                return False
+                return None
 
             username = url_parts[-2]
             kernel_name = url_parts[-1]
             kernel_slug = f"{username}/{kernel_name}"
 
             logger.info(f"Downloading notebook: {kernel_slug}")
-
-            import subprocess
-            import os
-
-            # Create temporary directory for download
-            with tempfile.TemporaryDirectory() as temp_dir:
-                original_dir = os.getcwd()
-
-                try:
-                    os.chdir(temp_dir)
-
-                    # Run kaggle kernels pull command
-                    result = subprocess.run(
-                        ['kaggle', 'kernels', 'pull', kernel_slug],
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-
-                    if result.returncode == 0:
-                        # Look for downloaded .ipynb file
-                        ipynb_files = list(Path(temp_dir).glob("*.ipynb"))
-
-                        if ipynb_files:
-                            ipynb_file = ipynb_files[0]
-                            target_file = output_dir / f"{notebook.filename.replace('.py', '.ipynb')}"
-
-                            import shutil
-                            shutil.copy2(str(ipynb_file), str(target_file))
-                            logger.info(f"Downloaded notebook to: {target_file}")
-                            return True
-                        else:
-                            logger.error(f"No .ipynb file found after download")
-                            return False
-                    else:
-                        logger.error(f"Kaggle API error: {result.stderr}")
-                        return False
-
-                finally:
-                    os.chdir(original_dir)
+            return await self.download_pool.fetch(kernel_slug, spool_file)
 
         except Exception as e:
             logger.error(f"Error downloading notebook {notebook.title}: {e}")
-            return False
+            return None
 
-    def _convert_notebook_to_python_file(self, notebook: NotebookInfo, output_dir: Path) -> bool:
-        """Convert downloaded notebook to Python file"""
-        try:
-            # Look for the downloaded .ipynb file
-            ipynb_file = output_dir / f"{notebook.filename.replace('.py', '.ipynb')}"
-
-            if not ipynb_file.exists():
-                logger.warning(f"Notebook file not found: {ipynb_file}")
-                return False
-
-            # Read and convert notebook
-            with open(ipynb_file, 'r', encoding='utf-8') as f:
-                nb_data = json.load(f)
-
-            nb = nbformat.from_dict(nb_data)
-
-            # Use nbconvert to convert to Python
-            exporter = PythonExporter()
-            python_code, _ = exporter.from_notebook_node(nb)
-
-            # Add header with metadata
-            header = f'''#!/usr/bin/env python3
+    def _python_header(self, notebook: NotebookInfo) -> str:
+        """Metadata header written above the converted code"""
+        return f'''#!/usr/bin/env python3
 """
 {notebook.title}
 Author: {notebook.author}
@@ -465,19 +649,24 @@ Downloaded: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 '''
 
-            # Save Python file
-            python_file = output_dir / notebook.filename
-            with open(python_file, 'w', encoding='utf-8') as f:
-                f.write(header + python_code)
-
-            logger.info(f"Converted notebook to Python: {python_file}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error converting notebook {notebook.title}: {e}")
-            return False
-
-    async def download_competition_notebooks(self, competition_url: str, limit: Optional[int] = None, output_dir: Optional[Path] = None) -> bool:
+    def _record_in_cache(self, cache: NotebookCache, notebook: NotebookInfo, output_dir: Path):
+        """Remember the downloaded version; files of an earlier name for the same kernel are removed"""
+        previous = cache.get(notebook.ref)
+        if previous is not None and previous.filename != notebook.filename:
+            old_file = output_dir / previous.filename
+            for path in (old_file, old_file.with_suffix('.ipynb')):
+                if path.exists():
+                    path.unlink()
+        cache.record(notebook.ref, notebook.version, notebook.filename, has_ipynb=self.keep_ipynb)
+
+    def close(self):
+        """Stop the conversion workers and close pooled API connections"""
+        self.converter.close()
+        if self.api_client:
+            self.api_client.close()
+
+    async def download_competition_notebooks(self, competition_url: str, limit: Optional[int] = None, output_dir: Optional[Path] = None,
+                                             sort_by: Optional[str] = None) -> bool:
         """
         Download and convert all notebooks from a competition
 
@@ -485,6 +674,7 @@ Downloaded: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
             competition_url: Competition URL
             limit: Maximum number of notebooks to download
             output_dir: Output directory (default: kaggle_notebooks_downloaded)
+            sort_by: Listing order, see NOTEBOOK_SORT_OPTIONS; with limit this selects the top K
 
         Returns:
             bool: Success status
@@ -501,29 +691,62 @@ Downloaded: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
         comp_output_dir = output_dir / comp_name
         comp_output_dir.mkdir(exist_ok=True)
 
-        # Get notebook list
-        notebooks = await self.extract_notebook_list(competition_url, limit)
-
-        if not notebooks:
-            logger.error("No notebooks found!")
-            return False
-
-        # Download and convert each notebook
-        successful_downloads = 0
-        total_notebooks = len(notebooks)
+        cache = NotebookCache(comp_output_dir, dev_mode=self.dev_mode).load() if self.use_cache else None
+        unchanged = 0
 
-        for i, notebook in enumerate(notebooks, 1):
-            logger.info(f"[{i}/{total_notebooks}] Processing notebook: {notebook.title}")
+        # Download each notebook as soon as it is listed (bounded by the download pool). Listing
+        # waits while this many downloads are queued, so a large competition is not turned into
+        # thousands of pending tasks (and listing pages) before the first download completes
+        started = time.monotonic()
+        tasks = []
+        queued = asyncio.Semaphore(self.download_pool.workers * 2)
 
+        async def process(i: int, notebook: NotebookInfo) -> bool:
+            logger.info(f"[{i}] Processing notebook: {notebook.title}")
             success = await self.download_and_convert_notebook(notebook, comp_output_dir)
-            if success:
-                successful_downloads += 1
+            if success and cache is not None and notebook.ref:
+                self._record_in_cache(cache, notebook, comp_output_dir)
+            return success
+
+        loop = asyncio.get_running_loop()
+        try:
+            async for notebook in self.iter_notebooks(competition_url, limit, sort_by):
+                if (cache is not None and cache.is_current(notebook.ref, notebook.version, need_ipynb=self.keep_ipynb)
+                        and (self.cell_store is None
+                             or await loop.run_in_executor(None, self.cell_store.has_notebook, notebook.ref))):
+                    # Same version as last time: no request at all
+                    cache.mark_seen(notebook.ref)
+                    unchanged += 1
+                    if self.dev_mode:
+                        logger.debug(f"Unchanged, skipping: {notebook.title}")
+                    continue
+                await queued.acquire()
+                task = asyncio.ensure_future(process(len(tasks) + unchanged + 1, notebook))
+                task.add_done_callback(lambda _: queued.release())
+                tasks.append(task)
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if cache is not None:
+                cache.save()
+
+        if not tasks and not unchanged:
+            logger.error("No notebooks found!")
+            return False
 
-            # Small delay between downloads
-            await asyncio.sleep(2)
+        total_notebooks = len(tasks)
+        successful_downloads = sum(results)
 
         # Report results
+        self.download_pool.log_summary(elapsed=time.monotonic() - started)
+        self.converter.log_summary()
+        if self.cell_store is not None:
+            self.cell_store.log_summary()
+        self.rate_limiter.log_summary()
         logger.info(f"SUCCESS: Downloaded {successful_downloads}/{total_notebooks} notebooks")
+        if unchanged:
+            logger.info(f"Skipped {unchanged} unchanged notebooks (cached version is current)")
         logger.info(f"Output saved in: {comp_output_dir.absolute()}")
 
-        return successful_downloads > 0
\ No newline at end of file
+        return successful_downloads + unchanged > 0
\ No newline at end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Notebook Outputs
+Strips heavy cell outputs (plots, long logs) from parsed notebooks before they are stored
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Tuple, Union
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# keep: store outputs as downloaded
+# images: drop images/PDFs from outputs and markdown attachments
+# truncate: as images, and cut long text outputs to max_chars
+# all: remove every output
+OUTPUT_MODES = ("keep", "images", "truncate", "all")
+DEFAULT_MAX_OUTPUT_CHARS = 2000
+
+
+def _is_binary_mimetype(mimetype: str) -> bool:
+    return mimetype.startswith('image/') or mimetype == 'application/pdf'
+
+
+def _text(value: Union[str, List[str]]) -> str:
+    return ''.join(value) if isinstance(value, list) else value
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}\n... [truncated {len(text) - max_chars} characters]\n"
+
+
+def _strip_output(output: Dict[str, Any], mode: str, max_chars: int) -> Tuple[bool, bool]:
+    """
+    Strip one output in place
+
+    Returns:
+        Tuple of (whether anything worth keeping is left, whether the output changed)
+    """
+    output_type = output.get('output_type')
+
+    if output_type == 'stream':
+        if mode == 'truncate':
+            text = _text(output.get('text', ''))
+            if len(text) > max_chars:
+                output['text'] = _truncate(text, max_chars)
+                return True, True
+        return True, False
+
+    if output_type in ('display_data', 'execute_result'):
+        data = output.get('data') or {}
+        changed = False
+        for mimetype in [name for name in data if _is_binary_mimetype(name)]:
+            del data[mimetype]
+            changed = True
+        if mode == 'truncate':
+            for mimetype, value in list(data.items()):
+                if not mimetype.startswith('text/') or not isinstance(value, (str, list)):
+                    continue
+                text = _text(value)
+                if len(text) <= max_chars:
+                    continue
+                if mimetype == 'text/html' and 'text/plain' in data:
+                    # Cut-off HTML is broken markup; the plain text rendering says the same
+                    del data[mimetype]
+                else:
+                    data[mimetype] = _truncate(text, max_chars)
+                changed = True
+        # An execute_result keeps its place (the text/plain repr is usually there anyway)
+        return bool(data) or output_type == 'execute_result', changed
+
+    return True, False
+
+
+def strip_notebook_outputs(nb: Dict[str, Any], mode: str, max_chars: int = DEFAULT_MAX_OUTPUT_CHARS) -> bool:
+    """
+    Strip outputs of a parsed nbformat 4 notebook in place
+
+    Args:
+        nb: Notebook as loaded by json.loads()
+        mode: One of OUTPUT_MODES
+        max_chars: Longest text output kept in "truncate" mode
+
+    Returns:
+        bool: Whether the notebook was changed
+    """
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"mode must be one of {', '.join(OUTPUT_MODES)}")
+    if mode == 'keep' or not isinstance(nb.get('cells'), list):
+        # Old nbformat 3 notebooks (worksheets) are stored as they are
+        return False
+
+    changed = False
+    for cell in nb['cells']:
+        if mode != 'all' and isinstance(cell.get('attachments'), dict):
+            for name, bundle in list(cell['attachments'].items()):
+                for mimetype in [key for key in bundle if _is_binary_mimetype(key)]:
+                    del bundle[mimetype]
+                    changed = True
+                if not bundle:
+                    del cell['attachments'][name]
+
+        outputs = cell.get('outputs')
+        if not outputs:
+            continue
+        if mode == 'all':
+            cell['outputs'] = []
+            changed = True
+            continue
+
+        kept = []
+        for output in outputs:
+            keep, output_changed = _strip_output(output, mode, max_chars)
+            if keep:
+                kept.append(output)
+            changed = changed or output_changed or not keep
+        cell['outputs'] = kept
+
+    return changed
+
+
+def dumps_notebook(nb: Dict[str, Any]) -> str:
+    """Serialize a notebook the way nbformat writes .ipynb files"""
+    return json.dumps(nb, sort_keys=True, indent=1, ensure_ascii=False) + "\n"
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Extraction Pipeline
+Streams discovery -> fetch -> parse -> write through bounded queues
+"""
+
+import time
+import signal
+import asyncio
+import logging
+from pathlib import Path
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Set, Union
+
+from .browser_pool import BrowserPool
+from .discovery import ListingEntry
+from .manifest import ExtractionManifest
+from .checkpoint import CrawlCheckpoint
+from .retry import DeadLetterQueue
+from .rate_limiter import PageStatusError
+from .scheduler import FairScheduler
+
+if TYPE_CHECKING:
+    from .core import Discussion, KaggleDiscussionExtractor
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# Pipelines currently running in this process; one signal handler stops them all
+_ACTIVE_PIPELINES: Set["ExtractionPipeline"] = set()
+_HANDLED_SIGNALS: List[int] = []
+
+
+def _stop_active_pipelines():
+    for pipeline in list(_ACTIVE_PIPELINES):
+        pipeline.request_stop()
+
+
+def _register_pipeline(pipeline: "ExtractionPipeline"):
+    if not _ACTIVE_PIPELINES:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, _stop_active_pipelines)
+                _HANDLED_SIGNALS.append(sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows event loops and non-main threads: keep default handling
+                pass
+    _ACTIVE_PIPELINES.add(pipeline)
+
+
+def _unregister_pipeline(pipeline: "ExtractionPipeline"):
+    _ACTIVE_PIPELINES.discard(pipeline)
+    if not _ACTIVE_PIPELINES:
+        loop = asyncio.get_running_loop()
+        while _HANDLED_SIGNALS:
+            loop.remove_signal_handler(_HANDLED_SIGNALS.pop())
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage"""
+    name: str
+    workers: int = 1
+    items: int = 0
+    busy_seconds: float = 0.0
+    first_item_at: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of stage wall time"""
+        wall = self.wall_seconds
+        return self.items / wall if wall > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent processing rather than waiting on queues"""
+        capacity = self.wall_seconds * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.name}: {self.items} items, {self.throughput:.2f}/s, "
+                f"{self.utilization:.0%} busy ({self.workers} worker{'s' if self.workers != 1 else ''})")
+
+
+@dataclass
+class PipelineItem:
+    """A discussion URL moving through the pipeline"""
+    url: str
+    listing_comments: Optional[int] = None
+    listing_activity: Optional[str] = None
+    html: Optional[str] = None
+    discussion: Optional["Discussion"] = None
+
+
+class ExtractionPipeline:
+    """
+    Streaming extraction of discussions or writeups.
+
+    Stages run concurrently and are connected by bounded queues, so a slow stage
+    applies backpressure to the ones before it and the first files are written
+    while discovery is still running:
+
+        discovery -> fetch (N pages) -> parse -> write
+
+    In live parse mode the fetch stage already extracts from the DOM and the parse
+    stage passes items through; in offline mode fetch returns HTML and parsing
+    happens off the event loop.
+
+    With a manifest, threads whose listing metadata is unchanged never leave the
+    discovery stage and threads whose content is unchanged are not rewritten.
+    Fetches are retried according to extractor.retry_policy and gated by
+    extractor.circuit_breaker; URLs that fail for good go to the dead-letter list.
+    With a checkpoint, progress is saved after every item and completed items are
+    skipped; SIGINT/SIGTERM stop taking new work, let fetched items finish writing
+    and save the checkpoint (a second signal stops immediately). Every pipeline
+    running in the process is stopped by the same signal.
+
+    With a scheduler (batch mode), each fetch first takes a slot for this
+    pipeline's tenant so competitions sharing a pool are served round-robin.
+    """
+
+    def __init__(self, extractor: "KaggleDiscussionExtractor", pool: BrowserPool, output_dir: Path,
+                 content_type: str = "discussion", queue_size: Optional[int] = None,
+                 manifest: Optional[ExtractionManifest] = None,
+                 checkpoint: Optional[CrawlCheckpoint] = None,
+                 dead_letters: Optional[DeadLetterQueue] = None,
+                 scheduler: Optional[FairScheduler] = None, tenant: str = "",
+                 parse_executor=None):
+        """
+        Initialize the pipeline
+
+        Args:
+            extractor: Extractor providing fetch/parse/save operations and settings
+            pool: Browser pool the fetch stage borrows pages from
+            output_dir: Directory for the markdown files
+            content_type: Label used in log messages
+            queue_size: Capacity of each inter-stage queue (default: 2 x concurrency)
+            manifest: Loaded manifest for incremental runs; updated as files are written
+            checkpoint: Crawl checkpoint to skip completed items and record progress in
+            dead_letters: List receiving URLs that failed after all retries
+            scheduler: Fair scheduler shared with other pipelines on the same pool
+            tenant: Name this pipeline is scheduled under (e.g. the competition slug)
+            parse_executor: Shared offline parse executor (default: the pipeline creates its own)
+        """
+        self.extractor = extractor
+        self.pool = pool
+        self.output_dir = output_dir
+        self.content_type = content_type
+        self.dev_mode = extractor.dev_mode
+
+        self.fetch_workers = extractor.concurrency
+        self.parse_workers = max(1, extractor.parse_workers) if extractor.parse_mode == "offline" else 1
+        self.queue_size = queue_size or 2 * self.fetch_workers
+        self.manifest = manifest
+        self.checkpoint = checkpoint
+        self.dead_letters = dead_letters
+        self.retry_policy = extractor.retry_policy
+        self.circuit_breaker = extractor.circuit_breaker
+        self.scheduler = scheduler
+        self.tenant = tenant or content_type
+
+        self.stats = {
+            'discovery': StageStats('discovery'),
+            'fetch': StageStats('fetch', workers=self.fetch_workers),
+            'parse': StageStats('parse', workers=self.parse_workers),
+            'write': StageStats('write'),
+        }
+        self.discovered = 0
+        self.written = 0
+        self.skipped = 0
+        self.unchanged = 0
+        self.resumed = 0
+        self.failed = 0
+        self.retries = 0
+        self.interrupted = False
+        self._forced_stop = False
+        self._run_task: Optional[asyncio.Task] = None
+        self._start_time: Optional[float] = None
+        self._shared_parse_executor = parse_executor
+        self._parse_executor = None
+
+    def request_stop(self):
+        """Stop taking new work; a second call abandons in-flight items too"""
+        if self.interrupted:
+            logger.warning("Stopping immediately")
+            self._forced_stop = True
+            if self._run_task is not None:
+                self._run_task.cancel()
+            return
+
+        self.interrupted = True
+        logger.warning("Interrupted: finishing in-flight items and saving progress (interrupt again to stop now)")
+
+    @asynccontextmanager
+    async def _fetch_slot(self) -> AsyncIterator[None]:
+        if self.scheduler is None:
+            yield
+            return
+        async with self.scheduler.slot(self.tenant):
+            yield
+
+    async def run(self, links: AsyncIterator[Union[str, ListingEntry]]) -> int:
+        """
+        Run every stage until the link source is exhausted
+
+        Args:
+            links: Async iterator of URLs or ListingEntry objects (e.g. ListingDiscovery.discover_entries())
+
+        Returns:
+            int: Number of successfully extracted items (written or confirmed unchanged)
+        """
+        fetch_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        self._start_time = time.perf_counter()
+        self._parse_executor = self._shared_parse_executor or self.extractor._create_parse_executor()
+        self._run_task = asyncio.current_task()
+        _register_pipeline(self)
+        finished = False
+
+        async def stage(name: str, workers: List, out_queue: Optional[asyncio.Queue], downstream: int):
+            self.stats[name].started_at = time.perf_counter()
+            await asyncio.gather(*workers)
+            self.stats[name].finished_at = time.perf_counter()
+            if out_queue is not None:
+                for _ in range(downstream):
+                    await out_queue.put(_DONE)
+
+        tasks = [
+            asyncio.ensure_future(stage('discovery', [self._discover(links, fetch_queue)],
+                                        fetch_queue, self.fetch_workers)),
+            asyncio.ensure_future(stage('fetch', [self._fetch(fetch_queue, parse_queue)
+                                                  for _ in range(self.fetch_workers)],
+                                        parse_queue, self.parse_workers)),
+            asyncio.ensure_future(stage('parse', [self._parse(parse_queue, write_queue)
+                                                  for _ in range(self.parse_workers)],
+                                        write_queue, 1)),
+            asyncio.ensure_future(stage('write', [self._write(write_queue)], None, 0)),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+            finished = not self.interrupted
+        except asyncio.CancelledError:
+            if not self._forced_stop:
+                raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            _unregister_pipeline(self)
+            if self._parse_executor is not None and self._parse_executor is not self._shared_parse_executor:
+                self._parse_executor.shutdown(wait=False)
+            self._parse_executor = None
+            if self.manifest is not None:
+                self.manifest.save()
+            if self.checkpoint is not None:
+                if finished and not self.failed:
+                    self.checkpoint.clear()
+                else:
+                    self.checkpoint.save()
+                    logger.info(f"Progress saved to {self.checkpoint.path} (resume to continue)")
+
+        return self.written + self.unchanged
+
+    async def _discover(self, links: AsyncIterator[Union[str, ListingEntry]], out_queue: asyncio.Queue):
+        stats = self.stats['discovery']
+        try:
+            async for link in links:
+                if self.interrupted:
+                    break
+
+                entry = link if isinstance(link, ListingEntry) else ListingEntry(url=link)
+                self.discovered += 1
+                stats.items += 1
+                if stats.first_item_at is None:
+                    stats.first_item_at = time.perf_counter()
+
+                discussion_id = self.extractor._discussion_id(entry.url)
+                if self.checkpoint is not None:
+                    self.checkpoint.add_link(entry)
+                    if self.checkpoint.is_completed(discussion_id):
+                        self.resumed += 1
+                        continue
+
+                if self.manifest is not None and self.manifest.is_unchanged(discussion_id, entry.comment_count,
+                                                                            entry.last_activity):
+                    self.manifest.mark_seen(discussion_id)
+                    self.skipped += 1
+                    self._completed(discussion_id, entry.url)
+                    if self.dev_mode:
+                        logger.debug(f"Unchanged since last run, skipping: {entry.url}")
+                    continue
+
+                await out_queue.put(PipelineItem(url=entry.url, listing_comments=entry.comment_count,
+                                                 listing_activity=entry.last_activity))
+
+            if self.checkpoint is not None and not self.interrupted:
+                self.checkpoint.discovery_complete = True
+                self.checkpoint.save()
+        finally:
+            if hasattr(links, 'aclose'):
+                await links.aclose()
+
+    def _completed(self, discussion_id: str, url: str):
+        if self.checkpoint is not None:
+            self.checkpoint.mark_completed(discussion_id, url)
+            self.checkpoint.save()
+        if self.dead_letters is not None and self.dead_letters.remove(url):
+            self.dead_letters.save()
+
+    def _failed(self, url: str, error: str, attempts: int = 1):
+        self.failed += 1
+        if self.checkpoint is not None:
+            self.checkpoint.mark_failed(url, error)
+            self.checkpoint.save()
+        if self.dead_letters is not None:
+            self.dead_letters.add(url, error, attempts)
+            self.dead_letters.save()
+
+    async def _fetch_once(self, item: PipelineItem):
+        """One attempt at loading an item; raises on any failure"""
+        async with self._fetch_slot():
+            if self.extractor.parse_mode == "offline":
+                # The tab goes back to the pool as soon as the HTML is captured
+                async with self.pool.page() as page:
+                    item.html = await self.extractor.fetch_page_html(page, item.url)
+            else:
+                async with self.pool.page() as page:
+                    item.discussion = await self.extractor.fetch_discussion(page, item.url)
+
+        if item.html is None and item.discussion is None:
+            raise RuntimeError("No content extracted")
+
+    async def _fetch(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        stats = self.stats['fetch']
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+            if self.interrupted:
+                # Left for the next (resumed) run
+                continue
+
+            start = time.perf_counter()
+            logger.info(f"[{stats.items + 1}/{self.discovered}] Processing {self.content_type}...")
+
+            max_attempts = self.retry_policy.max_attempts
+            error: Optional[Exception] = None
+            attempt = 0
+            while attempt < max_attempts and not self.interrupted:
+                attempt += 1
+                await self.circuit_breaker.wait()
+                try:
+                    await self._fetch_once(item)
+                    self.circuit_breaker.record_success()
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+                    if isinstance(e, PageStatusError) and not e.retryable:
+                        # Kaggle answered (e.g. 404 for a deleted topic): final, and no sign of an outage
+                        self.circuit_breaker.record_success()
+                        break
+                    self.circuit_breaker.record_failure()
+                    if attempt < max_attempts and not self.interrupted:
+                        delay = self.retry_policy.delay(attempt)
+                        self.retries += 1
+                        logger.warning(f"   Attempt {attempt}/{max_attempts} failed ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+
+            stats.items += 1
+            stats.busy_seconds += time.perf_counter() - start
+
+            if error is not None:
+                logger.error(f"   Error: {error}")
+                self._failed(item.url, str(error), attempt)
+            elif item.html is not None or item.discussion is not None:
+                await out_queue.put(item)
+
+    async def _parse(self, in_queue: asyncio.Queue, out_queue: asyncio.Queue):
+        stats = self.stats['parse']
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+
+            start = time.perf_counter()
+            if item.discussion is None and item.html is not None:
+                item.discussion = await self.extractor.parse_discussion_html(item.html, item.url, self._parse_executor)
+                item.html = None
+
+            stats.items += 1
+            stats.busy_seconds += time.perf_counter() - start
+
+            if item.discussion is not None:
+                await out_queue.put(item)
+            else:
+                self._failed(item.url, "Could not parse page HTML")
+
+    async def _write(self, in_queue: asyncio.Queue):
+        stats = self.stats['write']
+        while True:
+            item = await in_queue.get()
+            if item is _DONE:
+                return
+
+            start = time.perf_counter()
+            discussion = item.discussion
+            try:
+                discussion_id = self.extractor._discussion_id(discussion.url)
+                filename = self.extractor._discussion_filename(discussion)
+
+                if self.manifest is not None and not self.manifest.needs_write(discussion_id, discussion, filename):
+                    self.manifest.mark_seen(discussion_id, item.listing_comments, item.listing_activity)
+                    self.unchanged += 1
+                    self._completed(discussion_id, discussion.url)
+                    logger.info(f"   Unchanged: {filename}")
+                    stats.items += 1
+                    stats.busy_seconds += time.perf_counter() - start
+                    continue
+
+                self.extractor.save_discussion_markdown(discussion, self.output_dir / filename)
+                self.written += 1
+
+                if self.manifest is not None:
+                    previous = self.manifest.get(discussion_id)
+                    if previous is not None and previous.filename != filename:
+                        # Title changed: drop the file written under the old name
+                        (self.output_dir / previous.filename).unlink(missing_ok=True)
+                    self.manifest.record(discussion_id, discussion, filename, item.listing_comments,
+                                         item.listing_activity)
+                self._completed(discussion_id, discussion.url)
+
+                nested = sum(len(r.sub_replies) for r in discussion.replies)
+                if nested > 0:
+                    logger.info(f"   Stats: {len(discussion.replies)} top-level, {nested} nested replies")
+                else:
+                    logger.info(f"   Stats: {discussion.total_replies} replies total")
+
+            except Exception as e:
+                logger.error(f"   Error writing {item.url}: {e}")
+                self._failed(item.url, str(e))
+
+            stats.items += 1
+            stats.busy_seconds += time.perf_counter() - start
+            if stats.first_item_at is None:
+                stats.first_item_at = time.perf_counter()
+                if self.dev_mode:
+                    logger.debug(f"First {self.content_type} written after {stats.first_item_at - self._start_time:.1f}s")
+
+    def log_stats(self):
+        """Log per-stage throughput and time to first result"""
+        for stage_stats in self.stats.values():
+            logger.info(f"Pipeline {stage_stats.summary()}")
+
+        if self.skipped or self.unchanged:
+            logger.info(f"Pipeline: {self.skipped} skipped from listing metadata, {self.unchanged} fetched but unchanged")
+        if self.resumed:
+            logger.info(f"Pipeline: {self.resumed} already completed in the interrupted run")
+        if self.failed or self.retries:
+            logger.info(f"Pipeline: {self.retries} retries, {self.failed} failed")
+
+        first_write = self.stats['write'].first_item_at
+        if first_write is not None and self._start_time is not None:
+            logger.info(f"Pipeline: first result written after {first_write - self._start_time:.1f}s")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Token bucket shared by browser navigations and Kaggle CLI calls, with adaptive backoff
+"""
+
+import re
+import time
+import asyncio
+import logging
+import weakref
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Responses that count as feedback from Kaggle (subresources from CDNs are ignored)
+FEEDBACK_RESOURCE_TYPES = {'document', 'xhr', 'fetch'}
+FEEDBACK_HOSTS = ('kaggle.com',)
+
+# Status codes in `kaggle` CLI error output, e.g. "429 - Too Many Requests" or "(503)"
+_CLI_STATUS_PATTERN = re.compile(r'\((429|5\d\d)\)|\b(429|5\d\d)\s*-|HTTP(?: Error)?\s*(429|5\d\d)|Too Many Requests', re.IGNORECASE)
+
+
+def is_throttle_status(status: int) -> bool:
+    """429 and 5xx mean "slow down"""
+    return status == 429 or 500 <= status < 600
+
+
+class PageStatusError(Exception):
+    """A navigation answered with a throttle or error status"""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+        # 429/5xx may clear up on a later attempt; a 404 or 403 will not
+        self.retryable = is_throttle_status(status)
+
+
+@dataclass
+class RateLimiterStats:
+    """Counters reported by RateLimiter.log_summary()"""
+    requests: int = 0
+    waited_seconds: float = 0.0
+    backoffs: int = 0
+    throttled_by_status: Dict[int, int] = field(default_factory=dict)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter with AIMD rate adaptation.
+
+    Every request takes one token; tokens refill at the current rate up to the
+    burst size. A 429/5xx response (seen through Playwright response events or
+    reported from CLI output) halves the current rate and pauses all requests
+    with exponential backoff, honouring Retry-After. Each successful response
+    adds back a tenth of the configured rate, so throughput climbs back to the
+    configured maximum while Kaggle stays responsive.
+
+    One instance should be shared by everything that talks to Kaggle.
+    """
+
+    def __init__(self, rate: Optional[float] = 1.0, burst: int = 4, min_rate: float = 0.1,
+                 base_backoff: float = 2.0, max_backoff: float = 120.0, dev_mode: bool = False):
+        """
+        Initialize the limiter
+
+        Args:
+            rate: Maximum sustained requests per second (None or 0 = unlimited, e.g. for HAR replay)
+            burst: Requests allowed back to back after an idle period
+            min_rate: Lower bound the rate is reduced to under throttling
+            base_backoff: Pause after the first 429/5xx, doubled for each consecutive one
+            max_backoff: Upper bound for a single pause
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.rate = rate if rate and rate > 0 else None
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, self.rate) if self.rate else min_rate
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.dev_mode = dev_mode
+
+        self.current_rate = self.rate
+        self.stats = RateLimiterStats()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._throttle_streak = 0
+        self._lock: Optional[asyncio.Lock] = None  # created in the running loop by acquire()
+        self._watched = weakref.WeakSet()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate is not None
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.current_rate)
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        if not self.enabled:
+            return
+
+        if self._lock is None:
+            # Before Python 3.10 a Lock binds to the loop current at creation, not the one using it
+            self._lock = asyncio.Lock()
+
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self.stats.requests += 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.current_rate
+
+                self.stats.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+    def record_response(self, status: int, retry_after: Optional[float] = None):
+        """
+        Feed back the status of a response from Kaggle
+
+        Args:
+            status: HTTP status code
+            retry_after: Seconds from a Retry-After header, if any
+        """
+        if not self.enabled:
+            return
+        if is_throttle_status(status):
+            self._throttled(status, retry_after)
+        elif status < 400:
+            self._throttle_streak = 0
+            self.current_rate = min(self.rate, self.current_rate + self.rate / 10)
+
+    def _throttled(self, status: int, retry_after: Optional[float]):
+        now = time.monotonic()
+        self.stats.throttled_by_status[status] = self.stats.throttled_by_status.get(status, 0) + 1
+
+        if now < self._blocked_until:
+            # Already backing off: concurrent failures from the same burst only extend the pause
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            return
+
+        self._throttle_streak += 1
+        delay = min(self.max_backoff, self.base_backoff * (2 ** (self._throttle_streak - 1)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_backoff))
+
+        self._blocked_until = now + delay
+        self._tokens = 0.0
+        self.current_rate = max(self.min_rate, self.current_rate / 2)
+        self.stats.backoffs += 1
+
+        logger.warning(f"Kaggle answered {status}: pausing requests for {delay:.1f}s "
+                       f"(rate now {self.current_rate:.2f}/s)")
+
+    def report_cli_output(self, output: str) -> Optional[int]:
+        """
+        Look for a 429/5xx in failed `kaggle` CLI output and back off if found
+
+        Returns:
+            int: The status found, or None
+        """
+        match = _CLI_STATUS_PATTERN.search(output or "")
+        if not match:
+            return None
+        status = int(next((group for group in match.groups() if group), 429))
+        self.record_response(status)
+        return status
+
+    def watch(self, page):
+        """Observe the responses of a page's context (once per context)"""
+        context = page.context
+        if context in self._watched:
+            return
+        self._watched.add(context)
+        context.on("response", self._on_response)
+
+    def _on_response(self, response):
+        try:
+            host = urlparse(response.url).hostname or ""
+            if not any(host == name or host.endswith('.' + name) for name in FEEDBACK_HOSTS):
+                return
+            if response.request.resource_type not in FEEDBACK_RESOURCE_TYPES:
+                return
+
+            retry_after = None
+            header = response.headers.get('retry-after')
+            if header and header.strip().isdigit():
+                retry_after = float(header.strip())
+
+            self.record_response(response.status, retry_after)
+        except Exception as e:
+            if self.dev_mode:
+                logger.debug(f"Could not inspect response: {e}")
+
+    async def goto(self, page, url: str, raise_for_status: bool = False, **kwargs):
+        """
+        page.goto() after taking a token; the page's responses feed the backoff
+
+        Args:
+            page: Page to navigate
+            url: URL to load
+            raise_for_status: Raise PageStatusError when the document answers 429/5xx (retryable)
+                or another 4xx (not retryable), instead of handing back the error page
+            **kwargs: Passed to page.goto()
+
+        Returns:
+            The Playwright response (None for same-document navigations)
+        """
+        await self.acquire()
+        if self.enabled:
+            self.watch(page)
+        response = await page.goto(url, **kwargs)
+        if raise_for_status and response is not None:
+            if response.status >= 400:  # throttling (429/5xx) included
+                raise PageStatusError(response.status, url)
+        return response
+
+    def log_summary(self):
+        """Log request count, time spent waiting and throttling seen"""
+        if not self.enabled or not self.stats.requests:
+            return
+        logger.info(f"Rate limiter: {self.stats.requests} requests, waited {self.stats.waited_seconds:.1f}s, "
+                    f"rate {self.current_rate:.2f}/{self.rate:.2f} per second")
+        if self.stats.throttled_by_status:
+            by_status = ", ".join(f"{status}: {count}" for status, count in sorted(self.stats.throttled_by_status.items()))
+            logger.info(f"Rate limiter: throttled responses ({by_status}), {self.stats.backoffs} backoffs")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Page Readiness Engine
+Event-driven waits per page type, replacing fixed sleeps after navigation
+"""
+
+import sys
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Check for playwright
+try:
+    from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    logger.error("playwright not installed. Please run: pip install playwright && playwright install chromium")
+    sys.exit(1)
+
+
+# Resolves once the number of elements matching a selector has not changed for stableMs.
+# State lives on window, so it is reset automatically by every navigation.
+_STABLE_COUNT_JS = '''
+    ([selector, stableMs]) => {
+        const count = document.querySelectorAll(selector).length;
+        const now = performance.now();
+        const state = window.__kdeStableCounts || (window.__kdeStableCounts = {});
+        const previous = state[selector];
+        if (!previous || previous.count !== count) {
+            state[selector] = { count: count, since: now };
+            return false;
+        }
+        return now - previous.since >= stableMs;
+    }
+'''
+
+
+@dataclass
+class PageReadiness:
+    """Readiness predicate for one page type"""
+    anchor_selector: str  # Page is usable once this is attached
+    stable_selector: Optional[str] = None  # Then wait until the count of these stops changing
+    stable_ms: int = 750
+    timeout_ms: int = 15000
+
+
+COMMENT_SELECTOR = 'div[data-testid="discussions-comment"]'
+
+DEFAULT_READINESS: Dict[str, PageReadiness] = {
+    'discussion_listing': PageReadiness(
+        anchor_selector='a[href*="/discussion/"]',
+        stable_selector='a[href*="/discussion/"]',
+        stable_ms=500
+    ),
+    'discussion': PageReadiness(
+        anchor_selector='div[data-testid="discussions-topic-header"], h1, h3',
+        stable_selector=COMMENT_SELECTOR,
+        stable_ms=1000,
+        timeout_ms=30000
+    ),
+    'writeup_listing': PageReadiness(
+        anchor_selector='a[href*="/writeups/"]',
+        stable_selector='a[href*="/writeups/"]',
+        stable_ms=500
+    ),
+    'writeup': PageReadiness(
+        anchor_selector='h1',
+        stable_selector=f'p, {COMMENT_SELECTOR}',
+        stable_ms=1000,
+        timeout_ms=30000
+    ),
+    'notebook_listing': PageReadiness(
+        anchor_selector='a[href*="/code/"]',
+        stable_selector='a[href*="/code/"]',
+        stable_ms=500
+    ),
+}
+
+
+class ReadinessEngine:
+    """Waits until a page is really ready and records how long each URL took"""
+
+    def __init__(self, predicates: Optional[Dict[str, PageReadiness]] = None, dev_mode: bool = False):
+        """
+        Initialize the engine
+
+        Args:
+            predicates: Page type -> PageReadiness overrides merged over DEFAULT_READINESS
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.predicates = dict(DEFAULT_READINESS)
+        if predicates:
+            self.predicates.update(predicates)
+        self.dev_mode = dev_mode
+        self.wait_times: Dict[str, float] = {}
+
+    async def wait(self, page: Page, page_type: str, url: Optional[str] = None) -> float:
+        """
+        Wait for the readiness predicate of page_type
+
+        A predicate that times out is logged and the page is used as-is, so a
+        thread without comments does not fail extraction.
+
+        Args:
+            page: Page that has just been navigated
+            page_type: Key into self.predicates (e.g. 'discussion')
+            url: URL to record the wait time under (default: page.url)
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        spec = self.predicates[page_type]
+        start = time.perf_counter()
+
+        try:
+            await page.wait_for_selector(spec.anchor_selector, state='attached', timeout=spec.timeout_ms)
+
+            if spec.stable_selector:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                remaining_ms = max(spec.stable_ms * 2, spec.timeout_ms - elapsed_ms)
+                await page.wait_for_function(
+                    _STABLE_COUNT_JS,
+                    arg=[spec.stable_selector, spec.stable_ms],
+                    polling=100,
+                    timeout=remaining_ms
+                )
+
+        except PlaywrightTimeoutError:
+            if self.dev_mode:
+                logger.debug(f"Readiness timeout for {page_type} page, continuing with current DOM")
+
+        waited = time.perf_counter() - start
+        self.wait_times[url or page.url] = waited
+
+        if self.dev_mode:
+            logger.debug(f"{page_type} page ready after {waited:.2f}s")
+
+        return waited
+
+    def summary(self) -> Dict[str, float]:
+        """Aggregate wait statistics over every recorded URL"""
+        times = list(self.wait_times.values())
+        if not times:
+            return {'pages': 0, 'total': 0.0, 'mean': 0.0, 'max': 0.0}
+        return {
+            'pages': len(times),
+            'total': sum(times),
+            'mean': sum(times) / len(times),
+            'max': max(times),
+        }
+
+    def log_summary(self):
+        """Log the aggregated wait statistics"""
+        stats = self.summary()
+        if stats['pages']:
+            logger.info(f"Page readiness: {stats['pages']} pages, "
+                        f"mean wait {stats['mean']:.2f}s, max {stats['max']:.2f}s")
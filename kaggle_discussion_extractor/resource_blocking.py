@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking Policy
+Aborts requests for images, fonts, media and third-party trackers the extractors never read
+"""
+
+import sys
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Check for playwright
+try:
+    from playwright.async_api import Route
+except ImportError:
+    logger.error("playwright not installed. Please run: pip install playwright && playwright install chromium")
+    sys.exit(1)
+
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')
+
+DEFAULT_BLOCKED_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'segment.io',
+    'segment.com',
+    'sentry.io',
+    'intercom.io',
+    'intercomcdn.com',
+)
+
+# Blocked responses are never downloaded, so their size is unknown.
+# Bytes saved are estimated from typical transfer sizes per resource type.
+DEFAULT_ESTIMATED_BYTES = {
+    'image': 25_000,
+    'font': 40_000,
+    'media': 500_000,
+    'script': 60_000,
+    'stylesheet': 20_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+FALLBACK_ESTIMATED_BYTES = 10_000
+
+
+@dataclass
+class BlockingStats:
+    """Counters collected by a ResourceBlockingPolicy"""
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    allowed_requests: int = 0
+    estimated_bytes_saved: int = 0
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    def copy(self) -> "BlockingStats":
+        return BlockingStats(dict(self.blocked_by_type), self.allowed_requests, self.estimated_bytes_saved)
+
+    def since(self, earlier: "BlockingStats") -> "BlockingStats":
+        """Counters accumulated after the earlier snapshot was taken"""
+        blocked = {
+            resource_type: count - earlier.blocked_by_type.get(resource_type, 0)
+            for resource_type, count in self.blocked_by_type.items()
+            if count - earlier.blocked_by_type.get(resource_type, 0) > 0
+        }
+        return BlockingStats(
+            blocked,
+            self.allowed_requests - earlier.allowed_requests,
+            self.estimated_bytes_saved - earlier.estimated_bytes_saved
+        )
+
+
+class ResourceBlockingPolicy:
+    """
+    Opt-in request interception shared by every page of a BrowserPool.
+
+    A request is blocked when its resource type or host is on a deny list and
+    neither is on an allow list (allow lists win). Domains match themselves and
+    all of their subdomains. Note that Playwright disables the HTTP cache for
+    routed contexts.
+    """
+
+    def __init__(self,
+                 block_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+                 block_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+                 allow_resource_types: Iterable[str] = (),
+                 allow_domains: Iterable[str] = (),
+                 estimated_bytes: Optional[Dict[str, int]] = None,
+                 dev_mode: bool = False):
+        """
+        Initialize the policy
+
+        Args:
+            block_resource_types: Playwright resource types to abort (image, font, media, ...)
+            block_domains: Hosts whose requests are aborted regardless of type
+            allow_resource_types: Resource types that are never blocked
+            allow_domains: Hosts that are never blocked
+            estimated_bytes: Per-type size estimates used for the bytes-saved report
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.block_resource_types = frozenset(block_resource_types)
+        self.block_domains = tuple(d.lower().lstrip('.') for d in block_domains)
+        self.allow_resource_types = frozenset(allow_resource_types)
+        self.allow_domains = tuple(d.lower().lstrip('.') for d in allow_domains)
+        self.estimated_bytes = dict(DEFAULT_ESTIMATED_BYTES)
+        if estimated_bytes:
+            self.estimated_bytes.update(estimated_bytes)
+        self.dev_mode = dev_mode
+        self.stats = BlockingStats()
+
+    @staticmethod
+    def _matches_domain(host: str, domains: Iterable[str]) -> bool:
+        return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Decide whether a request of this type to this URL is aborted"""
+        host = (urlparse(url).hostname or '').lower()
+
+        if resource_type in self.allow_resource_types or self._matches_domain(host, self.allow_domains):
+            return False
+        if self._matches_domain(host, self.block_domains):
+            return True
+        return resource_type in self.block_resource_types
+
+    async def install(self, target):
+        """Route every request of a BrowserContext or Page through this policy"""
+        await target.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Route):
+        request = route.request
+        resource_type = request.resource_type
+
+        if self.should_block(resource_type, request.url):
+            self.stats.blocked_by_type[resource_type] = self.stats.blocked_by_type.get(resource_type, 0) + 1
+            self.stats.estimated_bytes_saved += self.estimated_bytes.get(resource_type, FALLBACK_ESTIMATED_BYTES)
+            await route.abort()
+        else:
+            self.stats.allowed_requests += 1
+            # Hand over to earlier routes (e.g. HAR replay); goes to the network if there are none
+            await route.fallback()
+
+    def log_summary(self, since: Optional[BlockingStats] = None):
+        """
+        Log blocked request counts and estimated bytes saved
+
+        Args:
+            since: Snapshot taken at the start of a run, to report that run only
+        """
+        stats = self.stats.since(since) if since else self.stats
+        if not stats.blocked_requests:
+            return
+
+        by_type = ', '.join(f"{t}={n}" for t, n in sorted(stats.blocked_by_type.items()))
+        logger.info(f"Resource blocking: {stats.blocked_requests} requests blocked ({by_type}), "
+                    f"{stats.allowed_requests} allowed, ~{stats.estimated_bytes_saved / 1_000_000:.1f} MB saved (estimated)")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Retry Handling
+Retry policy with jitter, a crawl-wide circuit breaker and a dead-letter list
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from datetime import datetime
+from typing import Deque, Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter for transient navigation/extraction failures.
+
+    The delay before retry n is base_delay * 2^(n-1), capped at max_delay and
+    scaled by a random factor in [1 - jitter, 1 + jitter] so that workers which
+    failed together do not retry in lockstep.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 30.0,
+                 jitter: float = 0.5):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts: Total attempts per URL including the first (1 = no retries)
+            base_delay: Delay before the first retry in seconds
+            max_delay: Upper bound for the un-jittered delay
+            jitter: Relative random spread applied to every delay (0 = none)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max_delay
+        self.jitter = min(max(jitter, 0.0), 1.0)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Pauses the whole crawl when the recent error rate spikes.
+
+    closed:    requests flow; outcomes of the last `window` requests are tracked
+    open:      error rate reached the threshold; every request waits for the cooldown
+    half-open: one probe request is let through; success closes the breaker,
+               failure reopens it with a doubled cooldown (up to max_cooldown)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, error_threshold: float = 0.5, window: int = 20, min_requests: int = 10,
+                 cooldown: float = 60.0, max_cooldown: float = 600.0, dev_mode: bool = False):
+        """
+        Initialize the breaker
+
+        Args:
+            error_threshold: Failure ratio over the window that opens the breaker
+            window: Number of most recent outcomes considered
+            min_requests: Outcomes needed before the breaker may open
+            cooldown: Initial pause in seconds when the breaker opens
+            max_cooldown: Upper bound for the pause after repeated failed probes
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.error_threshold = error_threshold
+        self.window = max(1, window)
+        self.min_requests = max(1, min(min_requests, self.window))
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.dev_mode = dev_mode
+
+        self.state = self.CLOSED
+        self.times_opened = 0
+        self._outcomes: Deque[bool] = deque(maxlen=self.window)
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        # Created by wait() inside the running loop (before Python 3.10 an Event binds to the
+        # loop current at creation); None while nobody is waiting
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _transition(self, state: str):
+        self.state = state
+        # Wake every waiter; they re-check the new state
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def _open(self):
+        self._open_until = time.monotonic() + self._cooldown
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(f"Circuit breaker open: error rate {self.error_rate:.0%} over the last "
+                       f"{len(self._outcomes)} requests, pausing the crawl for {self._cooldown:.0f}s")
+        self._transition(self.OPEN)
+
+    async def wait(self):
+        """Block while the breaker is open; in half-open state only one caller gets through"""
+        while True:
+            if self.state == self.CLOSED:
+                return
+
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            changed = self._changed
+            if self.state == self.OPEN:
+                remaining = self._open_until - time.monotonic()
+                if remaining <= 0:
+                    if self.dev_mode:
+                        logger.debug("Circuit breaker half-open: sending a probe request")
+                    self._transition(self.HALF_OPEN)
+                    continue
+                timeout = remaining
+            elif not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            else:
+                # A probe whose outcome never arrives must not block the crawl forever
+                timeout = self._cooldown
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if self.state == self.HALF_OPEN:
+                    self._probe_in_flight = False
+
+    def record_success(self):
+        self._outcomes.append(True)
+        if self.state == self.HALF_OPEN:
+            logger.info("Circuit breaker closed: requests are succeeding again")
+            self._outcomes.clear()
+            self._cooldown = self.base_cooldown
+            self._probe_in_flight = False
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self._outcomes.append(False)
+        if self.state == self.HALF_OPEN:
+            self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+            self._open()
+        elif (self.state == self.CLOSED and len(self._outcomes) >= self.min_requests
+              and self.error_rate >= self.error_threshold):
+            self._open()
+
+
+class DeadLetterQueue:
+    """
+    URLs that still failed after every retry, with the last error.
+
+    Stored as a JSON list next to the extracted files so failures are visible
+    without reading logs; an entry is removed once its URL succeeds on a later run.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+
+    def load(self) -> "DeadLetterQueue":
+        """Read entries of previous runs, if any"""
+        if self.path.exists():
+            try:
+                self.entries = {entry['url']: entry for entry in json.loads(self.path.read_text(encoding='utf-8'))}
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable dead-letter file {self.path}: {e}")
+        return self
+
+    def save(self):
+        """Write the list atomically; the file is removed when nothing failed"""
+        if not self.entries:
+            if self.path.exists():
+                self.path.unlink()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(list(self.entries.values()), indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+    def add(self, url: str, error: str, attempts: int = 1):
+        self.entries[url] = {
+            'url': url,
+            'error': error,
+            'attempts': attempts,
+            'failed_at': datetime.now().isoformat(),
+        }
+
+    def remove(self, url: str) -> bool:
+        return self.entries.pop(url, None) is not None
+
+    def __len__(self) -> int:
+        return len(self.entries)
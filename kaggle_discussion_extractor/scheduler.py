@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Fair Scheduler
+Round-robin page slots across competitions sharing one browser pool
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class FairScheduler:
+    """
+    Hands out a fixed number of slots round-robin between tenants (competitions).
+
+    While slots are free they are granted immediately. Once every slot is busy,
+    a released slot goes to the next tenant in rotation that is waiting, not to
+    whichever request queued first, so a competition with thousands of threads
+    gets the same share as one with ten while both have work.
+
+    Example:
+        scheduler = FairScheduler(capacity=4)
+        async with scheduler.slot("competition-a"):
+            ...
+    """
+
+    def __init__(self, capacity: int, dev_mode: bool = False):
+        """
+        Initialize the scheduler
+
+        Args:
+            capacity: Number of slots (usually the browser pool's max_pages)
+            dev_mode: Enable development mode with detailed logging
+        """
+        self.capacity = max(1, capacity)
+        self.dev_mode = dev_mode
+        self.granted: Dict[str, int] = {}
+
+        self._in_use = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self._rotation: "OrderedDict[str, None]" = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for queue in self._waiters.values() for future in queue if not future.done())
+
+    def _grant(self, tenant: str):
+        self.granted[tenant] = self.granted.get(tenant, 0) + 1
+
+    async def acquire(self, tenant: str):
+        """Wait for a slot on behalf of tenant"""
+        if self._in_use < self.capacity and not self.waiting:
+            self._in_use += 1
+            self._grant(tenant)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tenant, deque()).append(future)
+        self._rotation.setdefault(tenant, None)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled: pass it on
+                self.release()
+            raise
+
+    def release(self):
+        """Return a slot; it goes straight to the next waiting tenant in rotation"""
+        while self._rotation:
+            tenant, _ = self._rotation.popitem(last=False)
+            queue = self._waiters.get(tenant)
+            while queue and queue[0].done():
+                queue.popleft()
+            if not queue:
+                self._waiters.pop(tenant, None)
+                continue
+
+            future = queue.popleft()
+            if queue:
+                # Back of the line until every other waiting tenant had a turn
+                self._rotation[tenant] = None
+            else:
+                self._waiters.pop(tenant, None)
+            self._grant(tenant)
+            future.set_result(None)
+            return
+
+        self._in_use -= 1
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        """Hold a slot for the duration of an async with block"""
+        await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def log_summary(self):
+        """Log how many slots each tenant received"""
+        if not self.granted:
+            return
+        shares = ", ".join(f"{tenant}: {count}" for tenant, count in sorted(self.granted.items()))
+        logger.info(f"Scheduler slots granted: {shares}")
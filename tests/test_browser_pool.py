@@ -0,0 +1,131 @@
+"""Tests for BrowserPool against a fake browser (no Chromium needed)."""
+
+import os
+import asyncio
+
+import pytest
+
+from kaggle_discussion_extractor.browser_pool import BrowserPool
+
+
+class TestHarOptions:
+    """Record/replay directory handling."""
+
+    def test_record_and_replay_are_exclusive(self, tmp_path):
+        with pytest.raises(ValueError):
+            BrowserPool(record_har_dir=tmp_path, replay_har_dir=tmp_path)
+
+    def test_archives_oldest_first(self, tmp_path):
+        for i, name in enumerate(["b.har.zip", "a.har", "c.har.zip"]):
+            path = tmp_path / name
+            path.write_bytes(b"")
+            os.utime(path, (1000 + i, 1000 + i))
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        pool = BrowserPool(replay_har_dir=tmp_path)
+        assert [p.name for p in pool.har_archives()] == ["b.har.zip", "a.har", "c.har.zip"]
+
+    def test_missing_archives_raise(self, tmp_path):
+        pool = BrowserPool(replay_har_dir=tmp_path)
+        with pytest.raises(FileNotFoundError):
+            pool.har_archives()
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+
+    def is_closed(self):
+        return self.context.closed
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+def fake_pool(**kwargs):
+    pool = BrowserPool(**kwargs)
+    pool._browser = FakeBrowser()  # start() sees a running browser and launches nothing
+    return pool
+
+
+class TestEventLoop:
+    """A pool may be built before the event loop that uses it exists."""
+
+    def test_created_outside_the_loop(self):
+        pool = fake_pool(max_pages=1)
+
+        async def borrow_twice():
+            for _ in range(2):
+                async with pool.page() as page:
+                    assert not page.is_closed()
+
+        asyncio.run(borrow_twice())
+        assert len(pool._browser.contexts) == 1
+
+
+class TestPagePool:
+    """Checkout bookkeeping, the max_pages bound and pages returned after errors."""
+
+    async def test_released_page_is_reused(self):
+        pool = fake_pool(max_pages=2)
+        first = await pool.acquire_page()
+        second = await pool.acquire_page()
+        assert first is not second
+        assert len(pool._all_pages) == 2
+
+        await pool.release_page(first)
+        assert pool._idle_pages == [first]
+        assert await pool.acquire_page() is first
+        assert len(pool._browser.contexts) == 2
+
+    async def test_max_pages_bound(self):
+        pool = fake_pool(max_pages=1)
+        page = await pool.acquire_page()
+        waiting = asyncio.ensure_future(pool.acquire_page())
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+
+        await pool.release_page(page)
+        assert await asyncio.wait_for(waiting, 1) is page
+
+    async def test_page_is_discarded_after_exception(self):
+        pool = fake_pool(max_pages=1)
+        with pytest.raises(RuntimeError):
+            async with pool.page() as page:
+                raise RuntimeError("navigation crashed")
+
+        assert page.context.closed
+        assert pool._all_pages == [] and pool._idle_pages == []
+        # The slot was handed back: the next borrow gets a fresh page without waiting
+        replacement = await asyncio.wait_for(pool.acquire_page(), 1)
+        assert replacement is not page
+
+    async def test_closed_idle_page_is_replaced(self):
+        pool = fake_pool(max_pages=1)
+        page = await pool.acquire_page()
+        await pool.release_page(page)
+        await page.context.close()
+
+        assert await pool.acquire_page() is not page
+        assert len(pool._all_pages) == 1
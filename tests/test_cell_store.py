@@ -0,0 +1,67 @@
+"""Tests for the content-addressed cell store."""
+
+import json
+
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output, new_raw_cell
+
+from kaggle_discussion_extractor.cell_store import CellStore, cell_hash
+from kaggle_discussion_extractor.notebook_converter import fast_convert_notebook_source
+
+IMPORTS = "import numpy as np\nimport pandas as pd"
+
+
+def forked_notebook(i):
+    return json.dumps(new_notebook(cells=[
+        new_markdown_cell(f"# Fork {i}"),
+        new_code_cell(IMPORTS, execution_count=1, outputs=[new_output("stream", name="stdout", text="ok\n")]),
+        new_code_cell("%%time\nmodel.fit(X, y)", execution_count=2),
+        new_code_cell(f"lr = {i / 100}", execution_count=i + 3),
+        new_raw_cell("# raw python"),
+        new_code_cell("df?"),  # nbconvert-only syntax
+    ]))
+
+
+class TestCellStore:
+    """Deduplication, reconstruction and lookups."""
+
+    def test_forks_share_cells(self, tmp_path):
+        store = CellStore(tmp_path / "cells.sqlite")
+        assert store.add_notebook("alice/fork-0", forked_notebook(0)) == 6
+        assert store.add_notebook("bob/fork-1", forked_notebook(1)) == 2  # its markdown and lr cells
+
+        stats = store.stats()
+        assert (stats.notebooks, stats.cell_references, stats.unique_cells) == (2, 12, 8)
+        assert stats.stored_bytes < stats.referenced_bytes
+        assert store.find_notebooks(cell_hash(IMPORTS)) == ["alice/fork-0", "bob/fork-1"]
+        assert store.find_notebooks(cell_hash("lr = 0.01")) == ["bob/fork-1"]
+        assert store.find_notebooks(cell_hash(IMPORTS, "markdown")) == []
+        assert store.most_shared_cells(limit=1)[0]["notebooks"] == 2
+        store.close()
+
+    def test_python_is_rebuilt_exactly(self, tmp_path):
+        store = CellStore(tmp_path / "cells.sqlite")
+        store.add_notebook("alice/fork-0", forked_notebook(0), header="# Title: Fork 0\n")
+        store.close()
+
+        store = CellStore(tmp_path / "cells.sqlite")
+        expected = "# Title: Fork 0\n" + fast_convert_notebook_source(json.dumps(new_notebook(cells=[
+            new_markdown_cell("# Fork 0"), new_code_cell(IMPORTS, execution_count=1),
+            new_code_cell("%%time\nmodel.fit(X, y)", execution_count=2), new_code_cell("lr = 0.0", execution_count=3),
+            new_raw_cell("# raw python"),
+        ])))[0]
+        python_code = store.get_python("alice/fork-0")
+        assert python_code.startswith(expected)
+        assert "get_ipython().run_line_magic('pinfo', 'df')" in python_code
+        assert store.export_python("alice/fork-0", tmp_path / "fork.py")
+        assert (tmp_path / "fork.py").read_text() == python_code
+        assert store.get_python("nobody/none") is None
+        store.close()
+
+    def test_new_version_replaces_and_prunes(self):
+        store = CellStore(":memory:")
+        store.add_notebook("alice/fork-0", forked_notebook(0), version="1")
+        store.add_notebook("alice/fork-0", forked_notebook(5), version="2")
+        assert store.find_notebooks(cell_hash("lr = 0.0")) == []
+        assert store.prune() == 2
+        assert store.stats().unique_cells == store.stats().cell_references == 6
+        store.close()
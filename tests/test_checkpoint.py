@@ -0,0 +1,78 @@
+"""Tests for crawl checkpoints and resuming through the pipeline."""
+
+from kaggle_discussion_extractor.checkpoint import CrawlCheckpoint
+from kaggle_discussion_extractor.discovery import ListingEntry
+from kaggle_discussion_extractor.pipeline import ExtractionPipeline
+
+from tests.test_pipeline import FakeExtractor, FakePool, URLS, links
+
+COMPETITION = "https://www.kaggle.com/competitions/x"
+
+
+class TestCrawlCheckpoint:
+    """Persistence of crawl state."""
+
+    def test_round_trip(self, tmp_path):
+        checkpoint = CrawlCheckpoint(tmp_path, COMPETITION)
+        checkpoint.add_link(ListingEntry(url=URLS[0], comment_count=3))
+        checkpoint.add_link(ListingEntry(url=URLS[0]))
+        checkpoint.add_link(ListingEntry(url=URLS[1]))
+        checkpoint.mark_failed(URLS[1], "timeout")
+        checkpoint.mark_completed("100", URLS[0])
+        checkpoint.discovery_complete = True
+        checkpoint.save()
+
+        loaded = CrawlCheckpoint(tmp_path, COMPETITION).load()
+        assert [link.url for link in loaded.links] == URLS[:2]
+        assert loaded.links[0].comment_count == 3
+        assert loaded.is_completed("100")
+        assert loaded.failures == {URLS[1]: "timeout"}
+        assert loaded.discovery_complete
+
+    def test_content_types_do_not_share_state(self, tmp_path):
+        assert CrawlCheckpoint(tmp_path, COMPETITION, "writeup").path != CrawlCheckpoint(tmp_path, COMPETITION).path
+
+
+class TestResume:
+    """Pipeline integration."""
+
+    async def test_clean_run_clears_checkpoint(self, tmp_path):
+        checkpoint = CrawlCheckpoint(tmp_path, COMPETITION)
+        pipeline = ExtractionPipeline(FakeExtractor(), FakePool(), tmp_path, checkpoint=checkpoint)
+        assert await pipeline.run(links(URLS)) == 6
+        assert not checkpoint.path.exists()
+
+    async def test_failures_are_kept_and_retried(self, tmp_path):
+        checkpoint = CrawlCheckpoint(tmp_path, COMPETITION)
+        first = ExtractionPipeline(FakeExtractor(fail={URLS[2]}), FakePool(), tmp_path,
+                                   checkpoint=checkpoint)
+        await first.run(links(URLS))
+        assert checkpoint.path.exists()
+
+        resumed = CrawlCheckpoint(tmp_path, COMPETITION).load()
+        assert list(resumed.failures) == [URLS[2]]
+        extractor = FakeExtractor()
+        second = ExtractionPipeline(extractor, FakePool(), tmp_path, checkpoint=resumed)
+        assert await second.run(resumed.entries()) == 1
+        assert second.resumed == 5
+        assert extractor.saved == ["102_Title 2.md"]
+        assert not resumed.path.exists()
+
+    async def test_stop_request_saves_progress(self, tmp_path):
+        checkpoint = CrawlCheckpoint(tmp_path, COMPETITION)
+
+        class StoppingExtractor(FakeExtractor):
+            def save_discussion_markdown(self, discussion, output_file):
+                super().save_discussion_markdown(discussion, output_file)
+                if len(self.saved) == 2:
+                    pipeline.request_stop()
+
+        extractor = StoppingExtractor()
+        pipeline = ExtractionPipeline(extractor, FakePool(), tmp_path, queue_size=1,
+                                      checkpoint=checkpoint)
+        await pipeline.run(links(URLS))
+
+        assert pipeline.interrupted
+        saved = CrawlCheckpoint(tmp_path, COMPETITION).load()
+        assert len(saved.completed) == len(extractor.saved) < len(URLS)
+        assert not saved.discovery_complete
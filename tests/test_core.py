@@ -0,0 +1,196 @@
+"""Tests for KaggleDiscussionExtractor helpers."""
+
+from kaggle_discussion_extractor.core import KaggleDiscussionExtractor, Discussion, Author
+
+
+def make_discussion(url, title="Some Title"):
+    return Discussion(
+        title=title,
+        url=url,
+        main_content="",
+        main_author=Author(name="Unknown", username="unknown"),
+        main_upvotes=0,
+        replies=[],
+        total_replies=0,
+        extraction_time="2025-01-01T00:00:00"
+    )
+
+
+class TestDiscussionFilenames:
+    """Output filenames must not depend on extraction order."""
+
+    def test_discussion_id_from_url(self):
+        url = "https://www.kaggle.com/competitions/neurips-2025/discussion/512345#comment-1"
+        assert KaggleDiscussionExtractor._discussion_id(url) == "512345"
+
+    def test_writeup_id_from_url(self):
+        url = "https://www.kaggle.com/competitions/neurips-2025/writeups/2nd-place-solution/"
+        assert KaggleDiscussionExtractor._discussion_id(url) == "2nd-place-solution"
+
+    def test_filename_keyed_by_id(self):
+        extractor = KaggleDiscussionExtractor()
+        discussion = make_discussion(
+            "https://www.kaggle.com/competitions/x/discussion/42", title='What is "CV"?'
+        )
+        assert extractor._discussion_filename(discussion) == "42_What is _CV__.md"
+
+    def test_long_titles_are_truncated(self):
+        extractor = KaggleDiscussionExtractor()
+        discussion = make_discussion("https://www.kaggle.com/competitions/x/discussion/7", title="a" * 150)
+        filename = extractor._discussion_filename(discussion)
+        assert filename == "7_" + "a" * 97 + "....md"
+
+
+class TestBatchedCommentTree:
+    """Raw records from the single-evaluate comment script."""
+
+    def raw(self, **overrides):
+        record = {
+            "username": "alice",
+            "displayName": "Alice",
+            "rankNumber": None,
+            "badges": [],
+            "upvotes": 0,
+            "timestamp": "",
+            "contentHtml": "<p>This is a sufficiently long comment.</p>",
+            "text": None,
+            "depth": 0,
+            "isNested": False,
+            "visualIndent": 0,
+            "parentIndex": None,
+        }
+        record.update(overrides)
+        return record
+
+    def test_records_become_reply_hierarchy(self):
+        extractor = KaggleDiscussionExtractor()
+        processed = extractor._process_raw_comments([
+            self.raw(rankNumber=21, badges=["Expert"], upvotes=4, timestamp="Jan 1"),
+            self.raw(username="bob", displayName="", depth=1, isNested=True, parentIndex=0),
+            self.raw(username=None),
+            self.raw(username="carol", contentHtml="<p>Second top-level reply text.</p>"),
+        ])
+
+        assert [c["parent_idx"] for c in processed] == [None, 0, None]
+        assert processed[0]["author"].rank == "21st in this Competition"
+        assert processed[0]["author"].badges == ["Expert"]
+        assert processed[1]["author"].name == "bob"
+
+        replies = extractor._build_reply_hierarchy(processed)
+        assert [r.reply_number for r in replies] == ["1", "2"]
+        assert replies[0].sub_replies[0].reply_number == "1.1"
+        assert replies[0].upvotes == 4
+
+    def test_parent_links_beat_depth(self):
+        extractor = KaggleDiscussionExtractor()
+        # Indentation-derived depth jumps (0, 2, 1, 3, 0) but the DOM parents form a clean tree
+        processed = extractor._process_raw_comments([
+            self.raw(),
+            self.raw(username="bob", depth=2, parentIndex=0),
+            self.raw(username="carol", depth=1, parentIndex=0),
+            self.raw(username="dave", depth=3, parentIndex=2),
+            self.raw(username="erin", depth=0, parentIndex=None),
+        ])
+
+        replies = extractor._build_reply_hierarchy(processed)
+        assert [r.reply_number for r in replies] == ["1", "2"]
+        first = replies[0]
+        assert [r.author.username for r in first.sub_replies] == ["bob", "carol"]
+        assert [r.reply_number for r in first.sub_replies] == ["1.1", "1.2"]
+        assert first.sub_replies[1].sub_replies[0].reply_number == "1.2.1"
+        assert first.sub_replies[1].sub_replies[0].depth == 2
+
+    def test_depth_fallback_without_usable_parent(self):
+        extractor = KaggleDiscussionExtractor()
+        processed = extractor._process_raw_comments([
+            self.raw(),
+            self.raw(username=None, depth=1, parentIndex=0),  # dropped: no author
+            self.raw(username="bob", depth=1, parentIndex=1),  # its parent was dropped
+            self.raw(username="carol", depth=1),  # indentation only
+        ])
+
+        replies = extractor._build_reply_hierarchy(processed)
+        assert [r.reply_number for r in replies[0].sub_replies] == ["1.1", "1.2"]
+
+    def test_text_fallback_when_no_paragraphs(self):
+        extractor = KaggleDiscussionExtractor()
+        text = "alice\nPosted 2 days ago\n\nThis line is the actual comment body text\n"
+        processed = extractor._process_raw_comments([self.raw(contentHtml=None, text=text)])
+        assert processed[0]["content"] == "This line is the actual comment body text"
+
+    def test_short_comments_are_dropped(self):
+        extractor = KaggleDiscussionExtractor()
+        assert extractor._process_raw_comments([self.raw(contentHtml="<p>hi</p>")]) == []
+
+
+async def run_competition(extractor, tmp_path, monkeypatch, **call_kwargs):
+    """_extract_competition() with a pipeline that records its arguments and extracts nothing"""
+    from kaggle_discussion_extractor import core
+    from tests.test_pipeline import FakePool
+
+    captured = {}
+    pool = FakePool()
+    pool.resource_policy = None
+
+    class CapturingPipeline:
+        discovered = written = unchanged = skipped = resumed = 0
+        interrupted = False
+
+        def __init__(self, *args, **pipeline_kwargs):
+            captured.update(pipeline_kwargs)
+
+        async def run(self, links):
+            return 0
+
+        def log_stats(self):
+            pass
+
+    monkeypatch.setattr(core, "ExtractionPipeline", CapturingPipeline)
+    await extractor._extract_competition("https://www.kaggle.com/competitions/x", None, "discussion",
+                                         output_dir=tmp_path, pool=pool, **call_kwargs)
+    return captured
+
+
+class TestManifestUse:
+    """Only incremental runs hand the manifest to the pipeline."""
+
+    async def run_with(self, tmp_path, monkeypatch, **kwargs):
+        captured = await run_competition(KaggleDiscussionExtractor(**kwargs), tmp_path, monkeypatch)
+        return captured["manifest"]
+
+    async def test_resume_alone_does_not_skip_unchanged(self, tmp_path, monkeypatch):
+        assert await self.run_with(tmp_path, monkeypatch, resume=True) is None
+
+    async def test_incremental_uses_manifest(self, tmp_path, monkeypatch):
+        assert await self.run_with(tmp_path, monkeypatch, incremental=True) is not None
+
+
+class TestSharedSummaries:
+    """Readiness and rate-limiter totals are logged per competition only outside batch mode."""
+
+    async def test_logged_only_for_single_competition(self, tmp_path, monkeypatch):
+        from kaggle_discussion_extractor.scheduler import FairScheduler
+
+        extractor = KaggleDiscussionExtractor()
+        logged = []
+        monkeypatch.setattr(extractor.readiness, "log_summary", lambda: logged.append("readiness"))
+        monkeypatch.setattr(extractor.rate_limiter, "log_summary", lambda: logged.append("rate_limiter"))
+
+        await run_competition(extractor, tmp_path / "batch", monkeypatch, scheduler=FairScheduler(2))
+        assert logged == []
+        await run_competition(extractor, tmp_path / "single", monkeypatch)
+        assert logged == ["readiness", "rate_limiter"]
+
+
+class TestDefaultRateLimiter:
+    """HAR replays are not throttled unless a limiter is passed in."""
+
+    def test_replay_is_unlimited(self, tmp_path):
+        assert not KaggleDiscussionExtractor(replay_har=str(tmp_path)).rate_limiter.enabled
+        assert KaggleDiscussionExtractor().rate_limiter.rate == 1.0
+
+    def test_explicit_limiter_is_kept(self, tmp_path):
+        from kaggle_discussion_extractor.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rate=5)
+        assert KaggleDiscussionExtractor(replay_har=str(tmp_path), rate_limiter=limiter).rate_limiter is limiter
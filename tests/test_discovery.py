@@ -0,0 +1,65 @@
+"""Tests for concurrent listing discovery."""
+
+import asyncio
+
+from kaggle_discussion_extractor.discovery import ListingDiscovery, ListingEntry
+
+
+class FakeDiscovery(ListingDiscovery):
+    """Serves synthetic listing pages instead of loading them in a browser."""
+
+    def __init__(self, pages, concurrency=4, **kwargs):
+        super().__init__(pool=None, readiness=None, concurrency=concurrency, **kwargs)
+        self.pages = pages
+        self.fetched = []
+
+    async def _fetch_listing_page(self, url, link_fragment, page_type):
+        page_num = int(url.split("?page=")[1]) if "?page=" in url else 1
+        self.fetched.append(page_num)
+        # Later pages finish first to exercise in-order yielding
+        await asyncio.sleep(0.01 / page_num)
+        links = self.pages.get(page_num, [])
+        return [ListingEntry(url=link) for link in links], page_num < len(self.pages)
+
+
+def make_pages(count, per_page=3):
+    return {
+        n: [f"https://www.kaggle.com/competitions/x/discussion/{n * 100 + i}" for i in range(per_page)]
+        for n in range(1, count + 1)
+    }
+
+
+LISTING = "https://www.kaggle.com/competitions/x/discussion"
+
+
+class TestListingDiscovery:
+    """Ordering, dedup, limits and termination."""
+
+    async def test_all_pages_in_order(self):
+        discovery = FakeDiscovery(make_pages(5))
+        links = await discovery.collect(LISTING)
+        assert links == [link for n in range(1, 6) for link in make_pages(5)[n]]
+
+    async def test_no_fifty_page_cap(self):
+        discovery = FakeDiscovery(make_pages(60, per_page=1), concurrency=8)
+        links = await discovery.collect(LISTING)
+        assert len(links) == 60
+
+    async def test_limit_only_loads_needed_pages(self):
+        discovery = FakeDiscovery(make_pages(20), concurrency=8)
+        links = await discovery.collect(LISTING, limit=5)
+        assert len(links) == 5
+        assert sorted(discovery.fetched) == [1, 2]
+
+    async def test_stops_when_page_has_no_new_links(self):
+        pages = make_pages(3)
+        pages[4] = pages[3]  # Listing repeats the last page
+        pages[5] = make_pages(5)[5]
+        discovery = FakeDiscovery(pages, concurrency=1)
+        links = await discovery.collect(LISTING)
+        assert len(links) == 9
+
+    def test_normalize_link(self):
+        assert ListingDiscovery.normalize_link("/competitions/x/discussion/12#c1", "/discussion/") == \
+            "https://www.kaggle.com/competitions/x/discussion/12"
+        assert ListingDiscovery.normalize_link("/competitions/x/code", "/discussion/") is None
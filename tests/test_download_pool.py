@@ -0,0 +1,86 @@
+"""Tests for the parallel notebook download pool, using a stand-in kaggle CLI."""
+
+import os
+import json
+import sys
+import time
+import asyncio
+
+from kaggle_discussion_extractor.download_pool import NotebookDownloadPool
+from kaggle_discussion_extractor.rate_limiter import RateLimiter
+
+# Mimics `kaggle kernels pull <owner>/<kernel> -p <dir>`
+FAKE_KAGGLE = r'''
+import json, sys, time
+slug, path = sys.argv[3], sys.argv[5]
+owner, kernel = slug.split("/")
+if owner == "missing":
+    sys.stderr.write("404 - Not Found")
+    sys.exit(1)
+time.sleep(30 if owner == "slow" else 0.3)
+with open(f"{path}/{kernel}.ipynb", "w") as f:
+    json.dump({"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}, f)
+'''
+
+
+def make_pool(tmp_path, workers=4, timeout=10.0):
+    script = tmp_path / "fake_kaggle.py"
+    script.write_text(FAKE_KAGGLE)
+    return NotebookDownloadPool(workers=workers, timeout=timeout, rate_limiter=RateLimiter(rate=None),
+                                command=(sys.executable, str(script)))
+
+
+class TestNotebookDownloadPool:
+    """Parallel pulls into explicit target paths."""
+
+    async def test_pulls_run_in_parallel(self, tmp_path):
+        pool = make_pool(tmp_path)
+        targets = [tmp_path / "out" / f"nb{i}.ipynb" for i in range(4)]
+        started = time.monotonic()
+        results = await asyncio.gather(*(pool.pull(f"user/nb{i}", target) for i, target in enumerate(targets)))
+        elapsed = time.monotonic() - started
+
+        assert results == [True] * 4
+        assert all(target.exists() for target in targets)
+        # Four 0.3s downloads side by side, not one after another
+        assert elapsed < 1.2
+        assert pool.stats.downloaded == 4
+
+    async def test_working_directory_unchanged(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        pool = make_pool(tmp_path)
+        assert await pool.pull("user/nb", tmp_path / "out" / "nb.ipynb")
+        assert os.getcwd() == str(tmp_path)
+        assert not list(tmp_path.glob("*.ipynb"))
+
+    async def test_cli_error_is_reported(self, tmp_path):
+        pool = make_pool(tmp_path)
+        assert not await pool.pull("missing/nb", tmp_path / "nb.ipynb")
+        assert pool.stats.failed == 1
+
+    async def test_hung_download_is_killed(self, tmp_path):
+        pool = make_pool(tmp_path, timeout=0.5)
+        started = time.monotonic()
+        assert not await pool.pull("slow/nb", tmp_path / "nb.ipynb")
+        assert time.monotonic() - started < 5
+        assert pool.stats.timed_out == 1
+
+    def test_created_outside_the_loop(self, tmp_path):
+        pool = make_pool(tmp_path, workers=1)
+        targets = [tmp_path / f"nb{i}.ipynb" for i in range(2)]
+
+        async def pull_both():
+            return await asyncio.gather(*(pool.pull(f"user/nb{i}", target) for i, target in enumerate(targets)))
+
+        assert asyncio.run(pull_both()) == [True, True]
+
+    async def test_large_pull_is_left_on_disk(self, tmp_path):
+        pool = make_pool(tmp_path)
+        spool_file = tmp_path / "spool.ipynb"
+        assert isinstance(await pool.fetch("user/small", spool_file), str)
+        assert not spool_file.exists()
+
+        pool.stream_threshold = 0
+        assert await pool.fetch("user/large", spool_file) == spool_file
+        assert json.loads(spool_file.read_text())["nbformat"] == 4
+        assert pool.stats.downloaded == 2
@@ -0,0 +1,63 @@
+"""Tests for the offline HTML parse engine."""
+
+import pytest
+
+pytest.importorskip("lxml")
+
+from kaggle_discussion_extractor.html_parser import OfflineDiscussionParser
+
+
+DISCUSSION_HTML = """
+<html><head><title>Great idea | Kaggle</title></head><body>
+<h1 class="topic-title">Feature engineering ideas</h1>
+<div data-testid="discussions-topic-header">
+  <a href="/alice">Alice Smith</a><span>Competition Host</span>
+  <button aria-label="12 votes">12</button>
+  <div class="sc-eTCgfj">Here is the main post body.</div>
+</div>
+<div data-testid="discussions-comment">
+  <a href="/bob">Bob</a><span>3rd in this Competition</span><span title="Jan 2, 2025">2 days ago</span>
+  <button aria-label="5 votes">5</button>
+  <div class="sc-jMpVQY"><p>Top level reply with enough text.</p></div>
+  <div data-testid="discussions-comment">
+    <a href="/carol">Carol</a><span>Expert</span>
+    <div class="sc-jMpVQY"><p>Nested reply with enough text too.</p></div>
+  </div>
+</div>
+<div data-testid="discussions-comment">
+  <a href="/dave">Dave</a>
+  <div class="sc-jMpVQY"><p>Second top level reply text.</p></div>
+</div>
+</body></html>
+"""
+
+
+class TestOfflineDiscussionParser:
+    """Parsing page.content() without a browser."""
+
+    def test_discussion_main_post(self):
+        discussion = OfflineDiscussionParser().parse(
+            DISCUSSION_HTML, "https://www.kaggle.com/competitions/x/discussion/123"
+        )
+        assert discussion.title == "Feature engineering ideas"
+        assert discussion.main_author.username == "alice"
+        assert discussion.main_author.name == "Alice Smith"
+        assert "Competition Host" in discussion.main_author.badges
+        assert discussion.main_upvotes == 12
+        assert discussion.main_content == "Here is the main post body."
+
+    def test_reply_hierarchy(self):
+        discussion = OfflineDiscussionParser().parse(
+            DISCUSSION_HTML, "https://www.kaggle.com/competitions/x/discussion/123"
+        )
+        assert discussion.total_replies == 3
+        assert [r.reply_number for r in discussion.replies] == ["1", "2"]
+
+        first = discussion.replies[0]
+        assert first.author.username == "bob"
+        assert first.author.rank == "3rd in this Competition"
+        assert first.upvotes == 5
+        assert first.timestamp == "Jan 2, 2025"
+        assert first.content == "Top level reply with enough text."
+        assert first.sub_replies[0].reply_number == "1.1"
+        assert first.sub_replies[0].author.badges == ["Expert"]
@@ -0,0 +1,136 @@
+"""Tests for the in-process Kaggle API client against a local stand-in server."""
+
+import json
+import base64
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from kaggle_discussion_extractor.download_pool import NotebookDownloadPool
+from kaggle_discussion_extractor.kaggle_client import (
+    KaggleApiClient, KaggleApiError, KaggleCredentialsError, load_credentials
+)
+from kaggle_discussion_extractor.rate_limiter import RateLimiter
+
+NOTEBOOK = {"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+AUTH = "Basic " + base64.b64encode(b"alice:secret").decode()
+
+
+class FakeKaggleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        url = urlsplit(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, params))
+
+        if self.headers.get("Authorization") != AUTH:
+            self.send_json(401, {"message": "Unauthenticated"})
+        elif url.path == "/api/v1/kernels/list":
+            # kernel_count notebooks, nb-0 has the most votes
+            page_size, page = int(params["pageSize"]), int(params.get("page", 1))
+            kernels = range(self.server.kernel_count)[(page - 1) * page_size:page * page_size]
+            self.send_json(200, [{"ref": f"alice/nb-{i}", "title": f"Notebook {i}", "author": "alice",
+                                  "totalVotes": self.server.kernel_count - i,
+                                  "currentVersionNumber": self.server.kernel_version} for i in kernels])
+        elif url.path == "/api/v1/kernels/pull" and params["userName"] != "missing":
+            self.send_json(200, {"metadata": {"ref": f"{params['userName']}/{params['kernelSlug']}"},
+                                 "blob": {"source": json.dumps(NOTEBOOK), "kernelType": "notebook"}})
+        else:
+            self.send_json(404, {"message": "Not found"})
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeKaggleHandler)
+    httpd.connections = set()
+    httpd.requests = []
+    httpd.kernel_count = 250
+    httpd.kernel_version = 1
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("username", "alice")
+    kwargs.setdefault("key", "secret")
+    return KaggleApiClient(base_url=f"http://127.0.0.1:{server.server_port}/api/v1",
+                           rate_limiter=RateLimiter(rate=None), **kwargs)
+
+
+class TestKaggleApiClient:
+    """Requests, connection reuse and errors."""
+
+    async def test_list_and_pull(self, server):
+        client = make_client(server)
+        kernels = await client.list_kernels("neurips-2025", page_size=3, sort_by="voteCount")
+        assert [kernel["ref"] for kernel in kernels] == ["alice/nb-0", "alice/nb-1", "alice/nb-2"]
+        assert server.requests[0][1] == {"competition": "neurips-2025", "pageSize": "3", "page": "1",
+                                         "sortBy": "voteCount"}
+
+        notebook = await client.pull_kernel("alice/nb-1")
+        assert json.loads(notebook["blob"]["source"]) == NOTEBOOK
+        client.close()
+
+    async def test_keep_alive_connection_is_reused(self, server):
+        client = make_client(server, pool_size=1)
+        for i in range(5):
+            await client.pull_kernel(f"alice/nb-{i}")
+        assert client.connections_opened == 1
+        assert len(server.connections) == 1
+        client.close()
+
+    async def test_error_status_raises(self, server):
+        client = make_client(server)
+        with pytest.raises(KaggleApiError) as error:
+            await client.pull_kernel("missing/nb")
+        assert error.value.status == 404
+
+        client = make_client(server, key="wrong")
+        with pytest.raises(KaggleApiError) as error:
+            await client.list_kernels("neurips-2025")
+        assert error.value.status == 401
+
+    def test_credentials_from_environment_and_file(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("KAGGLE_USERNAME", raising=False)
+        monkeypatch.delenv("KAGGLE_KEY", raising=False)
+        monkeypatch.setenv("KAGGLE_CONFIG_DIR", str(tmp_path))
+        with pytest.raises(KaggleCredentialsError):
+            load_credentials()
+
+        (tmp_path / "kaggle.json").write_text(json.dumps({"username": "bob", "key": "k1"}))
+        assert load_credentials() == ("bob", "k1")
+
+        monkeypatch.setenv("KAGGLE_USERNAME", "carol")
+        monkeypatch.setenv("KAGGLE_KEY", "k2")
+        assert load_credentials() == ("carol", "k2")
+
+    async def test_download_pool_uses_client(self, server, tmp_path):
+        client = make_client(server)
+        pool = NotebookDownloadPool(rate_limiter=RateLimiter(rate=None), client=client, command=("false",))
+        target = tmp_path / "nb.ipynb"
+        assert await pool.pull("alice/nb", target)
+        assert json.loads(target.read_text()) == NOTEBOOK
+        assert pool.stats.via_api == 1
+
+        # A 404 is final: the CLI would get the same answer
+        assert not await pool.pull("missing/nb", tmp_path / "missing.ipynb")
+        assert pool.stats.cli_fallbacks == 0
+        client.close()
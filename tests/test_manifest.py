@@ -0,0 +1,72 @@
+"""Tests for the incremental extraction manifest."""
+
+from kaggle_discussion_extractor.core import Discussion
+from kaggle_discussion_extractor.manifest import ExtractionManifest
+
+COMPETITION = "https://www.kaggle.com/competitions/neurips-2025"
+
+
+def make_discussion(content="Hello", extraction_time="2025-01-01T00:00:00"):
+    return Discussion(title="Title", url=f"{COMPETITION}/discussion/123", main_content=content,
+                      main_author=None, main_upvotes=0, replies=[], total_replies=2,
+                      extraction_time=extraction_time)
+
+
+class TestExtractionManifest:
+    """Change detection and persistence."""
+
+    def test_slug(self):
+        assert ExtractionManifest.competition_slug(f"{COMPETITION}/discussion?page=2") == "neurips-2025"
+
+    def test_hash_ignores_extraction_time(self):
+        assert ExtractionManifest.content_hash(make_discussion(extraction_time="a")) == \
+            ExtractionManifest.content_hash(make_discussion(extraction_time="b"))
+        assert ExtractionManifest.content_hash(make_discussion("a")) != \
+            ExtractionManifest.content_hash(make_discussion("b"))
+
+    def test_round_trip_and_skip(self, tmp_path):
+        manifest = ExtractionManifest(tmp_path, COMPETITION)
+        manifest.record("123", make_discussion(), "123_Title.md", listing_comments=2)
+        manifest.save()
+        (tmp_path / "123_Title.md").write_text("x")
+
+        reloaded = ExtractionManifest(tmp_path, COMPETITION).load()
+        assert reloaded.get("123").total_replies == 2
+        assert reloaded.is_unchanged("123", 2)
+        assert not reloaded.is_unchanged("123", 3)
+        assert not reloaded.is_unchanged("123", None)
+        assert not reloaded.needs_write("123", make_discussion(), "123_Title.md")
+        assert reloaded.needs_write("123", make_discussion("edited"), "123_Title.md")
+
+    def test_missing_file_forces_write(self, tmp_path):
+        manifest = ExtractionManifest(tmp_path, COMPETITION)
+        manifest.record("123", make_discussion(), "123_Title.md", listing_comments=2)
+        assert not manifest.is_unchanged("123", 2)
+        assert manifest.needs_write("123", make_discussion(), "123_Title.md")
+
+    def test_corrupt_manifest_is_ignored(self, tmp_path):
+        manifest = ExtractionManifest(tmp_path, COMPETITION)
+        manifest.path.write_text("{not json")
+        assert manifest.load().entries == {}
+
+    def test_last_activity_is_compared(self, tmp_path):
+        manifest = ExtractionManifest(tmp_path, COMPETITION)
+        manifest.record("123", make_discussion(), "123_Title.md", listing_comments=2,
+                        listing_activity="2025-01-02T10:00:00Z")
+        (tmp_path / "123_Title.md").write_text("x")
+
+        assert manifest.is_unchanged("123", 2, "2025-01-02T10:00:00Z")
+        # Edited post: same comment count, newer activity
+        assert not manifest.is_unchanged("123", 2, "2025-01-03T08:00:00Z")
+        # Only the timestamp is shown
+        assert manifest.is_unchanged("123", None, "2025-01-02T10:00:00Z")
+        assert not manifest.is_unchanged("123", None, None)
+
+    def test_activity_unknown_to_previous_run_counts_as_changed(self, tmp_path):
+        manifest = ExtractionManifest(tmp_path, COMPETITION)
+        manifest.record("123", make_discussion(), "123_Title.md", listing_comments=2)
+        (tmp_path / "123_Title.md").write_text("x")
+        assert manifest.is_unchanged("123", 2)
+        assert not manifest.is_unchanged("123", 2, "2025-01-02T10:00:00Z")
+        manifest.mark_seen("123", 2, "2025-01-02T10:00:00Z")
+        assert manifest.is_unchanged("123", 2, "2025-01-02T10:00:00Z")
@@ -0,0 +1,35 @@
+"""Tests for the version-aware notebook cache."""
+
+from kaggle_discussion_extractor.notebook_cache import CACHE_FILENAME, NotebookCache
+
+
+class TestNotebookCache:
+    """Versions, files on disk and persistence."""
+
+    def test_current_only_with_same_version_and_files(self, tmp_path):
+        cache = NotebookCache(tmp_path)
+        cache.record("alice/nb", "3", "alice_nb.py", has_ipynb=False)
+        assert not cache.is_current("alice/nb", "3")  # .py not written yet
+
+        (tmp_path / "alice_nb.py").write_text("print(1)\n")
+        assert cache.is_current("alice/nb", "3")
+        assert not cache.is_current("alice/nb", "4")
+        assert not cache.is_current("alice/nb", "")
+        assert not cache.is_current("bob/nb", "3")
+        assert not cache.is_current("alice/nb", "3", need_ipynb=True)
+
+    def test_round_trip(self, tmp_path):
+        cache = NotebookCache(tmp_path)
+        cache.record("alice/nb", "2024-09-18 10:00:00", "alice_nb.py")
+        cache.save()
+        assert (tmp_path / CACHE_FILENAME).exists()
+        assert not (tmp_path / (CACHE_FILENAME + ".tmp")).exists()
+
+        entry = NotebookCache(tmp_path).load().get("alice/nb")
+        assert entry.version == "2024-09-18 10:00:00"
+        assert entry.filename == "alice_nb.py"
+        assert entry.has_ipynb
+
+    def test_unreadable_cache_is_ignored(self, tmp_path):
+        (tmp_path / CACHE_FILENAME).write_text("{not json")
+        assert NotebookCache(tmp_path).load().entries == {}
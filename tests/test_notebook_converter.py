@@ -0,0 +1,118 @@
+"""Tests for process-pool notebook conversion."""
+
+import json
+import tracemalloc
+
+import nbformat
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+
+from kaggle_discussion_extractor import notebook_converter
+from kaggle_discussion_extractor.notebook_converter import (
+    NotebookConverter, convert_notebook_file, fast_convert_notebook_source, stream_convert_notebook_file
+)
+
+
+def write_notebooks(directory, count):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        nb = new_notebook(cells=[new_markdown_cell(f"# Notebook {i}"), new_code_cell(f"x = {i}\nprint(x)")])
+        nbformat.write(nb, str(directory / f"nb{i}.ipynb"))
+
+
+class TestNotebookConverter:
+    """Conversion in worker processes and in-thread."""
+
+    async def test_convert_directory_in_processes(self, tmp_path):
+        write_notebooks(tmp_path / "in" / "sub", 6)
+        (tmp_path / "in" / "broken.ipynb").write_text("{not json")
+
+        converter = NotebookConverter(workers=2)
+        try:
+            stats = await converter.convert_directory(tmp_path / "in", output_dir=tmp_path / "out")
+        finally:
+            converter.close()
+
+        assert stats.converted == 6
+        assert stats.failed == 1
+        assert stats.cells == 12
+        assert "x = 3" in (tmp_path / "out" / "sub" / "nb3.py").read_text()
+        assert "6 converted, 1 failed" in stats.summary()
+
+    async def test_in_thread_reuses_exporter(self, tmp_path):
+        write_notebooks(tmp_path, 2)
+        converter = NotebookConverter(workers=0)
+        assert await converter.convert(tmp_path / "nb0.ipynb", tmp_path / "nb0.py", header="# header\n")
+        exporter = notebook_converter._worker_exporter
+        assert await converter.convert(tmp_path / "nb1.ipynb", tmp_path / "nb1.py")
+        assert notebook_converter._worker_exporter is exporter
+        assert (tmp_path / "nb0.py").read_text().startswith("# header\n")
+
+    async def test_fast_mode_matches_nbconvert(self, tmp_path):
+        cells = [
+            new_markdown_cell("# Title\n\n- item\n"),
+            new_code_cell("%matplotlib inline\nimport numpy as np\n!pip install -q lightgbm", execution_count=1),
+            new_code_cell("%%time\nfor i in range(3):\n    pass"),
+            new_code_cell("files = !ls\nfor f in files:\n    %time print(f)"),
+        ]
+        nbformat.write(new_notebook(cells=cells), str(tmp_path / "magic.ipynb"))
+        nbformat.write(new_notebook(cells=[new_code_cell("df?")]), str(tmp_path / "help.ipynb"))
+
+        fast = NotebookConverter(workers=0, mode="fast")
+        stats = await fast.convert_directory(tmp_path, output_dir=tmp_path / "fast")
+        reference = NotebookConverter(workers=0, mode="nbconvert")
+        await reference.convert_directory(tmp_path, output_dir=tmp_path / "nbconvert", pattern="*.ipynb")
+
+        assert stats.converted == 2
+        assert stats.fallbacks == 1  # help syntax is left to nbconvert
+        for name in ("magic.py", "help.py"):
+            assert (tmp_path / "fast" / name).read_text() == (tmp_path / "nbconvert" / name).read_text()
+        assert "get_ipython().run_cell_magic('time', ''" in (tmp_path / "fast" / "magic.py").read_text()
+
+
+class TestStreamingConversion:
+    """Large notebook files are converted cell by cell."""
+
+    @pytest.fixture(autouse=True)
+    def needs_ijson(self):
+        pytest.importorskip("ijson")
+
+    def write_plot_notebook(self, path, cells, plot_bytes):
+        plot = {"image/png": "A" * plot_bytes, "text/plain": "<Figure>"}
+        nb = new_notebook(cells=[new_markdown_cell("# Plots")] + [
+            new_code_cell(f"%matplotlib inline\nplt.plot({i})", execution_count=i,
+                          outputs=[new_output("display_data", data=plot)])
+            for i in range(cells)
+        ])
+        path.write_text(json.dumps(nb))
+
+    def test_same_output_as_fast_converter(self, tmp_path):
+        self.write_plot_notebook(tmp_path / "nb.ipynb", 5, 1000)
+        assert stream_convert_notebook_file(str(tmp_path / "nb.ipynb"), str(tmp_path / "nb.py"), "# h\n") == 6
+        expected, _ = fast_convert_notebook_source((tmp_path / "nb.ipynb").read_text())
+        assert (tmp_path / "nb.py").read_text() == "# h\n" + expected
+
+    def test_memory_does_not_grow_with_outputs(self, tmp_path):
+        self.write_plot_notebook(tmp_path / "big.ipynb", 20, 1_000_000)  # ~20 MB of plots
+        tracemalloc.start()
+        try:
+            stream_convert_notebook_file(str(tmp_path / "big.ipynb"), str(tmp_path / "big.py"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 4 * 1024 * 1024
+
+    def test_large_files_stream_and_fall_back(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(notebook_converter, "STREAMING_THRESHOLD", 0)
+        calls = []
+        stream = notebook_converter.stream_convert_notebook_file
+        monkeypatch.setattr(notebook_converter, "stream_convert_notebook_file",
+                            lambda *args: calls.append(args) or stream(*args))
+
+        self.write_plot_notebook(tmp_path / "plots.ipynb", 2, 10)
+        nbformat.write(new_notebook(cells=[new_code_cell("df?")]), str(tmp_path / "help.ipynb"))
+        assert convert_notebook_file(str(tmp_path / "plots.ipynb"), str(tmp_path / "plots.py"))[0] == 3
+        # Help syntax is not streamable: converted from memory via nbconvert, no partial output left
+        assert convert_notebook_file(str(tmp_path / "help.ipynb"), str(tmp_path / "help.py"))[3]
+        assert len(calls) == 2
+        assert sorted(path.name for path in tmp_path.glob("*.py*")) == ["help.py", "plots.py"]
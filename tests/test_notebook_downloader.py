@@ -0,0 +1,283 @@
+"""Tests for paginated notebook listing through the in-process API backend."""
+
+import asyncio
+
+import pytest
+
+from kaggle_discussion_extractor import notebook_converter, notebook_downloader
+from kaggle_discussion_extractor.kaggle_client import KaggleApiError
+from kaggle_discussion_extractor.notebook_downloader import (
+    _COLLECT_NEW_LINKS_JS, KaggleNotebookDownloader, NotebookInfo, resolve_sort_option
+)
+from kaggle_discussion_extractor.cell_store import CellStore
+from kaggle_discussion_extractor.rate_limiter import RateLimiter
+
+from tests.test_kaggle_client import server  # noqa: F401 (fixture)
+
+COMPETITION = "https://www.kaggle.com/competitions/neurips-2025"
+
+
+@pytest.fixture
+def downloader(server, monkeypatch):  # noqa: F811
+    monkeypatch.setenv("KAGGLE_USERNAME", "alice")
+    monkeypatch.setenv("KAGGLE_KEY", "secret")
+    return KaggleNotebookDownloader(kaggle_backend="api", rate_limiter=RateLimiter(rate=None), convert_workers=0,
+                                    api_base_url=f"http://127.0.0.1:{server.server_port}/api/v1")
+
+
+class TestNotebookListing:
+    """Paging, limits and sort order."""
+
+    async def test_pages_until_short_page(self, downloader, server):  # noqa: F811
+        notebooks = [notebook async for notebook in downloader.iter_notebooks(COMPETITION)]
+        assert len(notebooks) == 250
+        assert len({notebook.url for notebook in notebooks}) == 250
+        assert [params["page"] for _, params in server.requests] == ["1", "2", "3"]
+
+    async def test_limit_stops_paging_early(self, downloader, server):  # noqa: F811
+        notebooks = await downloader.extract_notebook_list(COMPETITION, limit=120, sort_by="votes")
+        assert len(notebooks) == 120
+        assert notebooks[0].votes == 250
+        assert [params["page"] for _, params in server.requests] == ["1", "2"]
+        assert server.requests[0][1]["sortBy"] == "voteCount"
+
+    async def test_scrapes_only_when_api_fails(self, downloader, server, monkeypatch):  # noqa: F811
+        scraped = []
+
+        async def fake_scraper(competition_url, limit=None):
+            scraped.append(competition_url)
+            yield NotebookInfo(title="Scraped", url="https://www.kaggle.com/code/bob/scraped", author="bob",
+                               last_updated="", filename="bob_scraped.py", ref="bob/scraped")
+
+        monkeypatch.setattr(downloader, "_iter_via_web_scraping", fake_scraper)
+        server.kernel_count = 0
+        assert [notebook async for notebook in downloader.iter_notebooks(COMPETITION)] == []
+        assert scraped == []
+
+        downloader.api_client.base_path = "/broken"
+        notebooks = [notebook async for notebook in downloader.iter_notebooks(COMPETITION)]
+        assert [notebook.ref for notebook in notebooks] == ["bob/scraped"]
+        assert scraped == [COMPETITION]
+
+    def test_replay_is_not_throttled(self, tmp_path):
+        scraper = KaggleNotebookDownloader(kaggle_backend="cli", convert_workers=0, replay_har=str(tmp_path))
+        assert not scraper.rate_limiter.enabled
+        assert KaggleNotebookDownloader(kaggle_backend="cli", convert_workers=0).rate_limiter.enabled
+
+    def test_sort_options(self):
+        assert resolve_sort_option("recent") == "dateRun"
+        assert resolve_sort_option("voteCount") == "voteCount"
+        assert resolve_sort_option(None) is None
+        with pytest.raises(ValueError):
+            resolve_sort_option("alphabetical")
+
+
+class TestCliFallback:
+    """In auto mode only transport errors, 429 and 5xx are retried with the kaggle CLI."""
+
+    @pytest.fixture
+    def cli_calls(self, monkeypatch):
+        calls = []
+
+        async def fake_run_kaggle_command(cmd, timeout=None):
+            calls.append(cmd)
+            return 0, "ref,title,author\nbob/cli-nb,CLI notebook,bob\n", ""
+
+        monkeypatch.setattr(notebook_downloader, "run_kaggle_command", fake_run_kaggle_command)
+        return calls
+
+    @pytest.fixture
+    def failing_api(self, downloader, monkeypatch):
+        def fail_with(status):
+            async def list_kernels(*args, **kwargs):
+                raise KaggleApiError(status, "error")
+
+            monkeypatch.setattr(downloader.api_client, "list_kernels", list_kernels)
+
+        downloader.kaggle_backend = "auto"
+        return fail_with
+
+    @pytest.mark.parametrize("status", [401, 403, 404])
+    async def test_client_error_is_final(self, downloader, failing_api, cli_calls, status):
+        failing_api(status)
+        with pytest.raises(KaggleApiError):
+            await downloader._list_kernels_page("neurips-2025", 1, 10)
+        assert cli_calls == []
+
+    @pytest.mark.parametrize("status", [429, 503])
+    async def test_throttling_uses_cli(self, downloader, failing_api, cli_calls, status):
+        failing_api(status)
+        rows = await downloader._list_kernels_page("neurips-2025", 1, 10)
+        assert [row["ref"] for row in rows] == ["bob/cli-nb"]
+        assert len(cli_calls) == 1
+
+
+class TestDownloadAndConvert:
+    """Downloaded notebooks go straight to the converter."""
+
+    NOTEBOOK = NotebookInfo(title="Notebook 1", url="https://www.kaggle.com/code/alice/nb-1", author="alice",
+                            last_updated="240918", filename="Notebook 1_240918.py")
+
+    async def test_writes_py_and_ipynb(self, downloader, tmp_path):
+        assert await downloader.download_and_convert_notebook(self.NOTEBOOK, tmp_path)
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["Notebook 1_240918.ipynb", "Notebook 1_240918.py"]
+        assert "Source: https://www.kaggle.com/code/alice/nb-1" in (tmp_path / "Notebook 1_240918.py").read_text()
+
+    async def test_no_ipynb(self, downloader, tmp_path):
+        downloader.keep_ipynb = False
+        assert await downloader.download_and_convert_notebook(self.NOTEBOOK, tmp_path)
+        assert [path.name for path in tmp_path.iterdir()] == ["Notebook 1_240918.py"]
+
+
+class TestDownloadBackpressure:
+    """Listing waits while the download queue is full."""
+
+    async def test_queued_downloads_are_bounded(self, downloader, server, tmp_path, monkeypatch):  # noqa: F811
+        downloader.download_pool.workers = 2
+        in_flight = []
+
+        async def slow_download(notebook, output_dir):
+            in_flight.append(len(asyncio.all_tasks()) - 1)  # minus the test itself
+            await asyncio.sleep(0.01)
+            return True
+
+        monkeypatch.setattr(downloader, "download_and_convert_notebook", slow_download)
+        downloader.use_cache = False
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=30, output_dir=tmp_path)
+        assert len(in_flight) == 30
+        assert max(in_flight) == 4
+
+
+class TestStreamingDownloads:
+    """Notebooks above the streaming threshold are never loaded whole on the way to the .py file."""
+
+    async def test_large_download_is_streamed(self, downloader, tmp_path, monkeypatch):
+        notebook = TestDownloadAndConvert.NOTEBOOK
+        assert await downloader.download_and_convert_notebook(notebook, tmp_path / "memory")
+
+        streamed = []
+        stream = notebook_converter.stream_convert_notebook_file
+        monkeypatch.setattr(notebook_converter, "STREAMING_THRESHOLD", 0)
+        monkeypatch.setattr(notebook_converter, "stream_convert_notebook_file",
+                            lambda *args: streamed.append(args) or stream(*args))
+        monkeypatch.setattr(notebook_converter, "convert_notebook_text", None)  # the in-memory path would fail
+        downloader.download_pool.stream_threshold = 0
+        downloader.cell_store = CellStore(":memory:")
+
+        assert await downloader.download_and_convert_notebook(notebook, tmp_path / "streamed")
+        assert len(streamed) == 1
+        assert ((tmp_path / "streamed" / notebook.filename).read_text()
+                == (tmp_path / "memory" / notebook.filename).read_text())
+        assert sorted(path.name for path in (tmp_path / "streamed").iterdir()) == [
+            "Notebook 1_240918.ipynb", "Notebook 1_240918.py"]
+        assert downloader.cell_store.has_notebook("alice/nb-1")
+        downloader.cell_store.close()
+
+        # Without a kept .ipynb the spooled download is removed after conversion
+        downloader.keep_ipynb = False
+        assert await downloader.download_and_convert_notebook(notebook, tmp_path / "py-only")
+        assert [path.name for path in (tmp_path / "py-only").iterdir()] == ["Notebook 1_240918.py"]
+
+
+class TestNotebookCache:
+    """Reruns skip notebooks whose listed version was already downloaded."""
+
+    async def test_unchanged_notebooks_are_not_pulled(self, downloader, server, tmp_path):  # noqa: F811
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=3, output_dir=tmp_path)
+        comp_dir = tmp_path / "neurips-2025"
+        assert (comp_dir / "alice_nb-0.py").exists()
+        assert (comp_dir / ".notebook-cache.json").exists()
+
+        server.requests.clear()
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=3, output_dir=tmp_path)
+        assert [path for path, _ in server.requests if path.endswith("/pull")] == []
+
+        server.requests.clear()
+        server.kernel_version = 2
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=3, output_dir=tmp_path)
+        assert len([path for path, _ in server.requests if path.endswith("/pull")]) == 3
+
+    async def test_missing_file_is_downloaded_again(self, downloader, server, tmp_path):  # noqa: F811
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=2, output_dir=tmp_path)
+        (tmp_path / "neurips-2025" / "alice_nb-1.py").unlink()
+
+        server.requests.clear()
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=2, output_dir=tmp_path)
+        assert [params["kernelSlug"] for path, params in server.requests if path.endswith("/pull")] == ["nb-1"]
+
+
+class TestCellStoreIntegration:
+    """Downloaded notebooks are added to the cell store."""
+
+    async def test_store_rebuilds_written_python(self, downloader, tmp_path):
+        downloader.cell_store = CellStore(tmp_path / "cells.sqlite")
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=2, output_dir=tmp_path)
+        python_file = tmp_path / "neurips-2025" / "alice_nb-1.py"
+        assert downloader.cell_store.get_python("alice/nb-1") == python_file.read_text()
+        assert downloader.cell_store.stats().notebooks == 2
+        downloader.cell_store.close()
+
+    async def test_rerun_skips_stored_notebooks(self, downloader, server, tmp_path):  # noqa: F811
+        downloader.cell_store = CellStore(tmp_path / "cells.sqlite")
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=2, output_dir=tmp_path)
+        server.requests.clear()
+        assert await downloader.download_competition_notebooks(COMPETITION, limit=2, output_dir=tmp_path)
+        assert [path for path, _ in server.requests if path.endswith("/pull")] == []
+        downloader.cell_store.close()
+
+
+class FakeListingPage:
+    """Infinite-scroll listing: every scroll attaches the next batch of cards."""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.attached = list(batches[0]) if batches else []
+        self.read = 0
+        self.scrolls = 0
+
+    async def evaluate(self, script, arg=None):
+        if script == _COLLECT_NEW_LINKS_JS:
+            unread = self.attached[self.read:]
+            self.read = len(self.attached)
+            return unread
+        self.scrolls += 1
+        if self.scrolls < len(self.batches):
+            self.attached.extend(self.batches[self.scrolls])
+            return True
+        return False
+
+
+def card_links(start, count):
+    links = []
+    for i in range(start, start + count):
+        links.append({"href": f"/code/alice/nb-{i}", "text": f"Notebook {i}", "author": "alice "})
+        links.append({"href": f"/code/alice/nb-{i}/comments", "text": "3 comments", "author": None})
+    return links
+
+
+class TestScrollLoader:
+    """Cards are read once, yielded while scrolling, and scrolling stops at the limit."""
+
+    @pytest.fixture
+    def scraper(self):
+        return KaggleNotebookDownloader(kaggle_backend="cli", convert_workers=0)
+
+    async def test_stops_exactly_at_limit(self, scraper):
+        page = FakeListingPage([card_links(0, 20), card_links(20, 20), card_links(40, 20)])
+        notebooks = [notebook async for notebook in scraper._scroll_notebooks(page, limit=25)]
+        assert [notebook.ref for notebook in notebooks] == [f"alice/nb-{i}" for i in range(25)]
+        assert page.scrolls == 1
+        assert notebooks[0].author == "alice"
+        assert notebooks[0].filename == "alice_nb-0.py"
+
+    async def test_yields_before_next_scroll(self, scraper):
+        page = FakeListingPage([card_links(0, 2), card_links(2, 2)])
+        scrolls_seen = [page.scrolls async for _ in scraper._scroll_notebooks(page)]
+        assert scrolls_seen == [0, 0, 1, 1]
+        # Two scrolls without new cards end the listing
+        assert page.scrolls == 3
+
+    async def test_duplicates_are_skipped(self, scraper):
+        page = FakeListingPage([card_links(0, 3), card_links(1, 3)])
+        notebooks = [notebook async for notebook in scraper._scroll_notebooks(page)]
+        assert [notebook.ref for notebook in notebooks] == ["alice/nb-0", "alice/nb-1", "alice/nb-2", "alice/nb-3"]
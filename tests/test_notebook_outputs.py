@@ -0,0 +1,83 @@
+"""Tests for stripping heavy cell outputs."""
+
+import json
+
+import pytest
+from nbformat.v4 import new_code_cell, new_markdown_cell, new_notebook, new_output
+
+from kaggle_discussion_extractor.notebook_converter import NotebookConverter
+from kaggle_discussion_extractor.notebook_outputs import strip_notebook_outputs
+
+PNG = "iVBORw0KGgo" * 10000
+
+
+def heavy_notebook():
+    plot = new_output("display_data", data={"image/png": PNG, "text/plain": "<Figure size 640x480>"})
+    image_only = new_output("display_data", data={"image/png": PNG})
+    log = new_output("stream", name="stdout", text="epoch\n" * 5000)
+    table = new_output("execute_result", execution_count=2,
+                       data={"text/html": "<table>" + "<tr><td>1</td></tr>" * 500 + "</table>", "text/plain": "df"})
+    markdown = new_markdown_cell("![plot](attachment:plot.png)")
+    markdown["attachments"] = {"plot.png": {"image/png": PNG}}
+    return new_notebook(cells=[
+        markdown,
+        new_code_cell("plt.show()", execution_count=1, outputs=[plot, image_only, log]),
+        new_code_cell("df", execution_count=2, outputs=[table]),
+    ])
+
+
+class TestStripNotebookOutputs:
+    """Each mode keeps what it promises."""
+
+    def test_images(self):
+        nb = json.loads(json.dumps(heavy_notebook()))
+        assert strip_notebook_outputs(nb, "images")
+        outputs = nb["cells"][1]["outputs"]
+        assert [output["output_type"] for output in outputs] == ["display_data", "stream"]
+        assert outputs[0]["data"] == {"text/plain": "<Figure size 640x480>"}
+        assert outputs[1]["text"] == "epoch\n" * 5000
+        assert nb["cells"][0]["attachments"] == {}
+
+    def test_truncate(self):
+        nb = json.loads(json.dumps(heavy_notebook()))
+        assert strip_notebook_outputs(nb, "truncate", max_chars=100)
+        log = nb["cells"][1]["outputs"][1]["text"]
+        assert log.startswith("epoch\n") and log.endswith("[truncated 29900 characters]\n")
+        assert nb["cells"][2]["outputs"][0]["data"] == {"text/plain": "df"}
+
+    def test_all_and_keep(self):
+        nb = json.loads(json.dumps(heavy_notebook()))
+        assert not strip_notebook_outputs(nb, "keep")
+        assert strip_notebook_outputs(nb, "all")
+        assert all(cell.get("outputs", []) == [] for cell in nb["cells"])
+        assert not strip_notebook_outputs(nb, "all")
+        with pytest.raises(ValueError):
+            strip_notebook_outputs(nb, "some")
+
+
+class TestConverterStripping:
+    """Stripping happens before conversion and storage and is reported."""
+
+    async def test_stripped_ipynb_is_stored(self, tmp_path):
+        source = json.dumps(heavy_notebook())
+        keep = NotebookConverter(workers=0)
+        assert await keep.convert_source(source, tmp_path / "keep.py", ipynb_path=tmp_path / "keep.ipynb")
+        strip = NotebookConverter(workers=0, strip_outputs="truncate")
+        assert await strip.convert_source(source, tmp_path / "strip.py", ipynb_path=tmp_path / "strip.ipynb")
+
+        assert (tmp_path / "keep.py").read_text() == (tmp_path / "strip.py").read_text()
+        assert (tmp_path / "strip.ipynb").stat().st_size < (tmp_path / "keep.ipynb").stat().st_size / 10
+        assert strip.stats.bytes_read == len(source)
+        assert strip.stats.bytes_kept == len((tmp_path / "strip.ipynb").read_text())
+        assert keep.stats.size_summary() == ""
+        assert "MB -> " in strip.stats.size_summary()
+
+    async def test_sizes_are_utf8_bytes(self, tmp_path):
+        nb = new_notebook(cells=[new_markdown_cell("# Données — 数据 " * 200),
+                                 new_code_cell("x", execution_count=1, outputs=[
+                                     new_output("stream", name="stdout", text="é" * 5000)])])
+        source = json.dumps(nb, ensure_ascii=False)
+        converter = NotebookConverter(workers=0, strip_outputs="all")
+        assert await converter.convert_source(source, tmp_path / "nb.py", ipynb_path=tmp_path / "nb.ipynb")
+        assert converter.stats.bytes_read == len(source.encode("utf-8")) > len(source)
+        assert converter.stats.bytes_kept == (tmp_path / "nb.ipynb").stat().st_size
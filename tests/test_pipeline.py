@@ -0,0 +1,128 @@
+"""Tests for the streaming extraction pipeline."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from kaggle_discussion_extractor.core import Discussion, KaggleDiscussionExtractor
+from kaggle_discussion_extractor.pipeline import ExtractionPipeline
+from kaggle_discussion_extractor.retry import RetryPolicy
+
+
+class FakePool:
+    """Hands out placeholder pages without a browser."""
+
+    @asynccontextmanager
+    async def page(self):
+        yield object()
+
+
+class FakeExtractor(KaggleDiscussionExtractor):
+    """Builds discussions from the URL instead of loading pages."""
+
+    def __init__(self, fail=(), **kwargs):
+        kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=2, base_delay=0))
+        super().__init__(**kwargs)
+        self.fail = set(fail)
+        self.saved = []
+
+    def _discussion(self, url):
+        return Discussion(title=f"Title {url[-1]}", url=url, main_content="", main_author=None, main_upvotes=0,
+                          replies=[], total_replies=0, extraction_time="")
+
+    async def fetch_discussion(self, page, url):
+        await asyncio.sleep(0.001)
+        if url in self.fail:
+            raise RuntimeError("navigation failed")
+        return self._discussion(url)
+
+    async def fetch_page_html(self, page, url):
+        return f"<html>{url}</html>"
+
+    async def parse_discussion_html(self, html, url, executor=None):
+        return self._discussion(url)
+
+    def save_discussion_markdown(self, discussion, output_file):
+        self.saved.append(output_file.name)
+
+
+async def links(urls):
+    for url in urls:
+        yield url
+
+
+URLS = [f"https://www.kaggle.com/competitions/x/discussion/10{i}" for i in range(6)]
+
+
+class TestExtractionPipeline:
+    """Stage wiring, shutdown and stats."""
+
+    async def test_live_mode_writes_every_item(self, tmp_path):
+        extractor = FakeExtractor(concurrency=3)
+        pipeline = ExtractionPipeline(extractor, FakePool(), tmp_path)
+        written = await pipeline.run(links(URLS))
+        assert written == 6
+        assert pipeline.discovered == 6
+        assert sorted(extractor.saved) == sorted(f"10{i}_Title {i}.md" for i in range(6))
+
+    async def test_offline_mode_parses_fetched_html(self, tmp_path):
+        extractor = FakeExtractor(concurrency=2, parse_mode="offline")
+        pipeline = ExtractionPipeline(extractor, FakePool(), tmp_path)
+        assert await pipeline.run(links(URLS)) == 6
+        assert pipeline.stats['parse'].items == 6
+
+    async def test_failed_fetch_is_skipped(self, tmp_path):
+        extractor = FakeExtractor(fail={URLS[1]}, concurrency=2)
+        pipeline = ExtractionPipeline(extractor, FakePool(), tmp_path)
+        assert await pipeline.run(links(URLS)) == 5
+        assert pipeline.stats['fetch'].items == 6
+        assert pipeline.stats['write'].items == 5
+
+    async def test_empty_source_finishes(self, tmp_path):
+        pipeline = ExtractionPipeline(FakeExtractor(concurrency=4), FakePool(), tmp_path)
+        assert await pipeline.run(links([])) == 0
+        assert pipeline.discovered == 0
+
+    async def test_bounded_queues_apply_backpressure(self, tmp_path):
+        produced = []
+
+        async def source():
+            for url in URLS:
+                produced.append(url)
+                yield url
+
+        class SlowWriter(FakeExtractor):
+            def save_discussion_markdown(self, discussion, output_file):
+                # Discovery can only be a few queue slots ahead of the writer
+                assert len(produced) - len(self.saved) <= 8
+                super().save_discussion_markdown(discussion, output_file)
+
+        extractor = SlowWriter(concurrency=1)
+        pipeline = ExtractionPipeline(extractor, FakePool(), tmp_path, queue_size=1)
+        assert await pipeline.run(source()) == 6
+        assert pipeline.stats['write'].throughput > 0
+
+    async def test_incremental_run_skips_unchanged(self, tmp_path):
+        from kaggle_discussion_extractor.discovery import ListingEntry
+        from kaggle_discussion_extractor.manifest import ExtractionManifest
+
+        class DiskExtractor(FakeExtractor):
+            def save_discussion_markdown(self, discussion, output_file):
+                super().save_discussion_markdown(discussion, output_file)
+                output_file.write_text(discussion.title)
+
+        async def entries(counts):
+            for url, count in zip(URLS, counts):
+                yield ListingEntry(url=url, comment_count=count)
+
+        first = ExtractionPipeline(DiskExtractor(), FakePool(), tmp_path,
+                                   manifest=ExtractionManifest(tmp_path, "x").load())
+        assert await first.run(entries([1, 1, 1, None, 1, 1])) == 6
+
+        extractor = DiskExtractor()
+        second = ExtractionPipeline(extractor, FakePool(), tmp_path,
+                                    manifest=ExtractionManifest(tmp_path, "x").load())
+        await second.run(entries([1, 2, 1, None, 1, 1]))
+        # Count changed for one thread, unknown for another: both are fetched but neither differs
+        assert second.skipped == 4
+        assert second.unchanged == 2
+        assert extractor.saved == []
@@ -0,0 +1,126 @@
+"""Tests for the shared token-bucket rate limiter."""
+
+import time
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kaggle_discussion_extractor.rate_limiter import PageStatusError, RateLimiter
+
+
+class TestRateLimiter:
+    """Token bucket, adaptive backoff and CLI feedback."""
+
+    async def test_burst_then_rate(self):
+        limiter = RateLimiter(rate=20, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+        for _ in range(4):
+            await limiter.acquire()
+        # 4 more tokens at 20/s
+        assert time.monotonic() - start >= 0.15
+        assert limiter.stats.requests == 7
+
+    async def test_unlimited(self):
+        limiter = RateLimiter(rate=None)
+        for _ in range(100):
+            await limiter.acquire()
+        assert limiter.stats.requests == 0
+        assert not limiter.enabled
+
+    def test_created_outside_the_loop(self):
+        limiter = RateLimiter(rate=1000, burst=1)
+
+        async def acquire_concurrently():
+            await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+        asyncio.run(acquire_concurrently())
+        assert limiter.stats.requests == 3
+
+    async def test_throttle_pauses_and_halves_rate(self):
+        limiter = RateLimiter(rate=4, burst=1, base_backoff=0.1)
+        limiter.record_response(429)
+        assert limiter.current_rate == 2
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.1
+
+    def test_burst_of_failures_counts_once(self):
+        limiter = RateLimiter(rate=4, base_backoff=10)
+        for _ in range(5):
+            limiter.record_response(503)
+        assert limiter.stats.backoffs == 1
+        assert limiter.stats.throttled_by_status == {503: 5}
+        assert limiter.current_rate == 2
+
+    def test_success_recovers_rate(self):
+        limiter = RateLimiter(rate=1.0, base_backoff=0)
+        limiter.record_response(429)
+        for _ in range(20):
+            limiter.record_response(200)
+        assert limiter.current_rate == 1.0
+
+    def test_consecutive_backoffs_grow(self):
+        limiter = RateLimiter(rate=1.0, base_backoff=1, max_backoff=3)
+        delays = []
+        for _ in range(3):
+            limiter._blocked_until = 0
+            limiter.record_response(429)
+            delays.append(limiter._blocked_until - time.monotonic())
+        assert delays[0] < delays[1] < delays[2] <= 3
+
+    def test_cli_output(self):
+        limiter = RateLimiter(base_backoff=0)
+        assert limiter.report_cli_output("429 - Too Many Requests") == 429
+        assert limiter.report_cli_output("HTTP response body: (503)") == 503
+        assert limiter.report_cli_output("404 - Not Found") is None
+
+
+def kaggle_response(url, status):
+    return SimpleNamespace(url=url, status=status, headers={}, request=SimpleNamespace(resource_type="document"))
+
+
+class TestResponseFeedback:
+    """Only Kaggle's own documents and API calls feed the backoff."""
+
+    def test_lookalike_hosts_are_ignored(self):
+        limiter = RateLimiter(rate=4)
+        for url in ("https://notkaggle.com/x", "https://kaggle.com.evil.io/x", "https://cdn.example.com/x"):
+            limiter._on_response(kaggle_response(url, 429))
+        assert limiter.stats.backoffs == 0
+
+        limiter._on_response(kaggle_response("https://www.kaggle.com/x", 429))
+        limiter._on_response(kaggle_response("https://kaggle.com/y", 503))
+        assert limiter.stats.throttled_by_status == {429: 1, 503: 1}
+
+
+class FakeNavigationPage:
+    """page.goto() answering with a fixed status."""
+
+    def __init__(self, status):
+        self.status = status
+        self.context = SimpleNamespace(on=lambda event, handler: None)
+
+    async def goto(self, url, **kwargs):
+        return SimpleNamespace(status=self.status)
+
+
+class TestGotoStatus:
+    """Error documents fail the navigation when asked to."""
+
+    async def test_error_statuses_raise(self):
+        limiter = RateLimiter(rate=None)
+        for status, retryable in ((429, True), (503, True), (404, False), (403, False)):
+            with pytest.raises(PageStatusError) as error:
+                await limiter.goto(FakeNavigationPage(status), "https://www.kaggle.com/x", raise_for_status=True)
+            assert error.value.status == status
+            assert error.value.retryable == retryable
+
+    async def test_success_and_default_do_not_raise(self):
+        limiter = RateLimiter(rate=None)
+        assert (await limiter.goto(FakeNavigationPage(200), "u", raise_for_status=True)).status == 200
+        assert (await limiter.goto(FakeNavigationPage(429), "u")).status == 429
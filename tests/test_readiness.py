@@ -0,0 +1,94 @@
+"""Tests for the page readiness engine against a fake page."""
+
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from kaggle_discussion_extractor.readiness import DEFAULT_READINESS, PageReadiness, ReadinessEngine
+
+
+class FakeReadinessPage:
+    """Records the waits; anchor/stable waits can be delayed or made to time out."""
+
+    def __init__(self, url="https://www.kaggle.com/competitions/x/discussion/1", delay=0.0,
+                 anchor_times_out=False, stable_times_out=False):
+        self.url = url
+        self.delay = delay
+        self.anchor_times_out = anchor_times_out
+        self.stable_times_out = stable_times_out
+        self.selectors = []
+        self.functions = []
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        self.selectors.append((selector, state, timeout))
+        await asyncio.sleep(self.delay)
+        if self.anchor_times_out:
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+    async def wait_for_function(self, script, arg=None, polling=None, timeout=None):
+        self.functions.append((arg, timeout))
+        if self.stable_times_out:
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+class TestReadinessEngine:
+    """Predicates, timeout tolerance and recorded wait times."""
+
+    async def test_anchor_then_stable_count(self):
+        engine = ReadinessEngine()
+        page = FakeReadinessPage()
+        await engine.wait(page, 'discussion')
+
+        spec = DEFAULT_READINESS['discussion']
+        assert page.selectors == [(spec.anchor_selector, 'attached', spec.timeout_ms)]
+        (arg, timeout), = page.functions
+        assert arg == [spec.stable_selector, spec.stable_ms]
+        assert spec.stable_ms * 2 <= timeout <= spec.timeout_ms
+
+    async def test_anchor_only_predicate(self):
+        engine = ReadinessEngine(predicates={'profile': PageReadiness(anchor_selector='h1', timeout_ms=100)})
+        page = FakeReadinessPage()
+        await engine.wait(page, 'profile')
+        assert page.selectors == [('h1', 'attached', 100)]
+        assert page.functions == []
+
+    @pytest.mark.parametrize("anchor_times_out, stable_times_out", [(True, False), (False, True)])
+    async def test_timeout_uses_page_as_is(self, anchor_times_out, stable_times_out):
+        engine = ReadinessEngine()
+        page = FakeReadinessPage(anchor_times_out=anchor_times_out, stable_times_out=stable_times_out)
+        waited = await engine.wait(page, 'writeup')
+        assert waited >= 0
+        assert list(engine.wait_times) == [page.url]
+        # A missing anchor skips the stable-count wait
+        assert len(page.functions) == (0 if anchor_times_out else 1)
+
+    async def test_other_errors_propagate(self):
+        class ClosedPage(FakeReadinessPage):
+            async def wait_for_selector(self, selector, state=None, timeout=None):
+                raise RuntimeError("Target closed")
+
+        engine = ReadinessEngine()
+        with pytest.raises(RuntimeError):
+            await engine.wait(ClosedPage(), 'discussion')
+        assert engine.wait_times == {}
+
+    async def test_wait_times_and_summary(self):
+        engine = ReadinessEngine()
+        assert engine.summary() == {'pages': 0, 'total': 0.0, 'mean': 0.0, 'max': 0.0}
+
+        await engine.wait(FakeReadinessPage(url="https://a", delay=0.02), 'discussion_listing')
+        await engine.wait(FakeReadinessPage(url="https://b", delay=0.06), 'discussion', url="https://b/recorded")
+        assert sorted(engine.wait_times) == ["https://a", "https://b/recorded"]
+        assert engine.wait_times["https://b/recorded"] >= 0.06
+
+        stats = engine.summary()
+        assert stats['pages'] == 2
+        assert stats['max'] == engine.wait_times["https://b/recorded"]
+        assert stats['total'] == pytest.approx(sum(engine.wait_times.values()))
+        assert stats['mean'] == pytest.approx(stats['total'] / 2)
+
+    def test_unknown_page_type(self):
+        assert 'competition' not in DEFAULT_READINESS
+        with pytest.raises(KeyError):
+            asyncio.run(ReadinessEngine().wait(FakeReadinessPage(), 'competition'))
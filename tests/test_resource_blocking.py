@@ -0,0 +1,43 @@
+"""Tests for the resource blocking policy."""
+
+from kaggle_discussion_extractor.resource_blocking import ResourceBlockingPolicy, BlockingStats
+
+
+class TestShouldBlock:
+    """Allow/deny decisions by resource type and domain."""
+
+    def test_default_blocks_heavy_types(self):
+        policy = ResourceBlockingPolicy()
+        assert policy.should_block("image", "https://www.kaggle.com/avatar.png")
+        assert policy.should_block("font", "https://www.kaggle.com/static/font.woff2")
+        assert not policy.should_block("document", "https://www.kaggle.com/competitions/x/discussion/1")
+        assert not policy.should_block("stylesheet", "https://www.kaggle.com/static/app.css")
+
+    def test_tracker_domains_and_subdomains(self):
+        policy = ResourceBlockingPolicy()
+        assert policy.should_block("script", "https://www.google-analytics.com/analytics.js")
+        assert policy.should_block("xhr", "https://api.segment.io/v1/t")
+        assert not policy.should_block("script", "https://notgoogle-analytics.com/x.js")
+
+    def test_allow_lists_win(self):
+        policy = ResourceBlockingPolicy(allow_domains=["storage.googleapis.com"], allow_resource_types=["font"])
+        assert not policy.should_block("image", "https://storage.googleapis.com/img.png")
+        assert not policy.should_block("font", "https://www.kaggle.com/font.woff2")
+        assert policy.should_block("image", "https://www.kaggle.com/img.png")
+
+
+class TestBlockingStats:
+    """Per-run reporting from a shared policy."""
+
+    def test_since_snapshot(self):
+        stats = BlockingStats({"image": 3}, allowed_requests=5, estimated_bytes_saved=300)
+        snapshot = stats.copy()
+        stats.blocked_by_type["image"] += 2
+        stats.blocked_by_type["font"] = 1
+        stats.estimated_bytes_saved += 50
+
+        delta = stats.since(snapshot)
+        assert delta.blocked_by_type == {"image": 2, "font": 1}
+        assert delta.blocked_requests == 3
+        assert delta.allowed_requests == 0
+        assert delta.estimated_bytes_saved == 50
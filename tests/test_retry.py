@@ -0,0 +1,155 @@
+"""Tests for retries, the circuit breaker and the dead-letter list."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from kaggle_discussion_extractor.core import KaggleDiscussionExtractor
+from kaggle_discussion_extractor.pipeline import ExtractionPipeline
+from kaggle_discussion_extractor.rate_limiter import RateLimiter
+from kaggle_discussion_extractor.retry import CircuitBreaker, DeadLetterQueue, RetryPolicy
+
+from tests.test_pipeline import FakeExtractor, FakePool, URLS, links
+
+
+class TestRetryPolicy:
+    """Backoff growth and jitter bounds."""
+
+    def test_delays_grow_and_cap(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=0)
+        assert [policy.delay(n) for n in range(1, 5)] == [1, 2, 4, 5]
+
+    def test_jitter_stays_in_range(self):
+        policy = RetryPolicy(base_delay=2, jitter=0.5)
+        delays = [policy.delay(1) for _ in range(200)]
+        assert all(1 <= d <= 3 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestCircuitBreaker:
+    """State transitions."""
+
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker(error_threshold=0.5, window=4, min_requests=4, cooldown=60)
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    async def test_half_open_probe_closes(self):
+        breaker = CircuitBreaker(window=2, min_requests=2, cooldown=0.05)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        await breaker.wait()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # A second caller waits for the probe's outcome
+        second = asyncio.ensure_future(breaker.wait())
+        await asyncio.sleep(0.01)
+        assert not second.done()
+
+        breaker.record_success()
+        await asyncio.wait_for(second, 1)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    async def test_failed_probe_doubles_cooldown(self):
+        breaker = CircuitBreaker(window=1, min_requests=1, cooldown=0.01, max_cooldown=1)
+        breaker.record_failure()
+        await breaker.wait()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+        assert breaker._cooldown == 0.02
+
+    def test_opened_outside_the_loop(self):
+        breaker = CircuitBreaker(window=1, min_requests=1, cooldown=0.01)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        async def probe():
+            await breaker.wait()
+            breaker.record_success()
+
+        asyncio.run(probe())
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestDeadLetters:
+    """Dead-letter persistence and pipeline integration."""
+
+    def test_round_trip(self, tmp_path):
+        queue = DeadLetterQueue(tmp_path / "failed.json")
+        queue.add(URLS[0], "timeout", 3)
+        queue.save()
+        loaded = DeadLetterQueue(tmp_path / "failed.json").load()
+        assert loaded.entries[URLS[0]]["attempts"] == 3
+        loaded.remove(URLS[0])
+        loaded.save()
+        assert not loaded.path.exists()
+
+    async def test_transient_failure_is_retried(self, tmp_path):
+        class Flaky(FakeExtractor):
+            attempts = 0
+
+            async def fetch_discussion(self, page, url):
+                if url == URLS[0] and Flaky.attempts == 0:
+                    Flaky.attempts += 1
+                    raise TimeoutError("navigation timeout")
+                return await super().fetch_discussion(page, url)
+
+        queue = DeadLetterQueue(tmp_path / "failed.json")
+        pipeline = ExtractionPipeline(Flaky(), FakePool(), tmp_path, dead_letters=queue)
+        assert await pipeline.run(links(URLS)) == 6
+        assert pipeline.retries == 1
+        assert len(queue) == 0
+
+    async def test_permanent_failure_is_dead_lettered(self, tmp_path):
+        queue = DeadLetterQueue(tmp_path / "failed.json")
+        pipeline = ExtractionPipeline(FakeExtractor(fail={URLS[3]}), FakePool(), tmp_path, dead_letters=queue)
+        assert await pipeline.run(links(URLS)) == 5
+        saved = DeadLetterQueue(tmp_path / "failed.json").load()
+        assert saved.entries[URLS[3]]["attempts"] == 2
+        assert saved.entries[URLS[3]]["error"] == "navigation failed"
+
+    async def test_http_error_pages_are_dead_lettered(self, tmp_path):
+        class StatusPage:
+            """Answers every navigation with a fixed status, like a throttled Kaggle."""
+
+            def __init__(self, status):
+                self.status = status
+                self.context = SimpleNamespace(on=lambda event, handler: None)
+                self.navigations = 0
+
+            async def goto(self, url, **kwargs):
+                self.navigations += 1
+                return SimpleNamespace(status=self.status)
+
+        class ErrorPool:
+            def __init__(self, page):
+                self.error_page = page
+
+            @asynccontextmanager
+            async def page(self):
+                yield self.error_page
+
+        class ThrottledExtractor(FakeExtractor):
+            async def fetch_discussion(self, page, url):
+                # The real navigation path, up to the status check
+                return await KaggleDiscussionExtractor.fetch_discussion(self, page, url)
+
+        # Throttling is retried; a 404/403 will not change and fails at once without tripping the breaker
+        for status, navigations in ((429, 2), (503, 2), (404, 1), (403, 1)):
+            page = StatusPage(status)
+            extractor = ThrottledExtractor(rate_limiter=RateLimiter(rate=None))
+            queue = DeadLetterQueue(tmp_path / f"failed-{status}.json")
+            pipeline = ExtractionPipeline(extractor, ErrorPool(page), tmp_path, dead_letters=queue)
+
+            assert await pipeline.run(links(URLS[:1])) == 0
+            assert page.navigations == navigations
+            assert pipeline.retries == navigations - 1
+            assert extractor.circuit_breaker.error_rate == (1.0 if navigations == 2 else 0.0)
+            assert extractor.saved == []
+            assert queue.entries[URLS[0]]["error"] == f"HTTP {status} for {URLS[0]}"
@@ -0,0 +1,59 @@
+"""Tests for round-robin slot scheduling across competitions."""
+
+import asyncio
+
+from kaggle_discussion_extractor.pipeline import ExtractionPipeline
+from kaggle_discussion_extractor.scheduler import FairScheduler
+
+from tests.test_pipeline import FakeExtractor, FakePool, URLS, links
+
+
+class TestFairScheduler:
+    """Grant order, capacity and cancellation."""
+
+    async def test_grants_immediately_under_capacity(self):
+        scheduler = FairScheduler(capacity=2)
+        await asyncio.wait_for(scheduler.acquire("a"), 1)
+        await asyncio.wait_for(scheduler.acquire("b"), 1)
+        assert scheduler.granted == {"a": 1, "b": 1}
+
+    async def test_round_robin_between_tenants(self):
+        scheduler = FairScheduler(capacity=1)
+        await scheduler.acquire("big")
+        order = []
+
+        async def worker(tenant):
+            async with scheduler.slot(tenant):
+                order.append(tenant)
+
+        # The big competition queues far more work before the small one arrives
+        tasks = [asyncio.ensure_future(worker("big")) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(worker("small")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        assert order == ["big", "small", "big", "small", "big", "big"]
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = FairScheduler(capacity=1)
+        await scheduler.acquire("a")
+        waiter = asyncio.ensure_future(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        await asyncio.wait_for(scheduler.acquire("c"), 1)
+        assert "b" not in scheduler.granted
+
+    async def test_pipelines_share_scheduler(self, tmp_path):
+        scheduler = FairScheduler(capacity=2)
+        pipelines = [
+            ExtractionPipeline(FakeExtractor(), FakePool(), tmp_path / tenant, scheduler=scheduler, tenant=tenant)
+            for tenant in ("a", "b")
+        ]
+        results = await asyncio.gather(*(pipeline.run(links(URLS)) for pipeline in pipelines))
+        assert results == [6, 6]
+        assert scheduler.granted == {"a": 6, "b": 6}